@@ -3,12 +3,15 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional
 from app.services.factory import get_llm_service
+from app.core.services.chat_memory import build_context, record_turn
 
 router = APIRouter()
 
 class ChatRequest(BaseModel):
     user_input: str
     provider: Optional[str] = None 
+    session_id: Optional[str] = None  # feeds earlier turns back (token-budgeted)
+    user_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
@@ -16,9 +19,15 @@ class ChatResponse(BaseModel):
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     llm = get_llm_service(request.provider)
-    messages = [
-        {"role": "system", "content": "You are a helpful educational assistant."},
-        {"role": "user", "content": request.user_input}
-    ]
+    system_prompt = "You are a helpful educational assistant."
+    if request.session_id:
+        messages = await build_context(request.session_id, system_prompt, request.user_input)
+    else:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": request.user_input}
+        ]
     reply = await llm.chat(messages)
+    if request.session_id:
+        await record_turn(request.session_id, request.user_id or "anon", request.user_input, reply)
     return {"response": reply}
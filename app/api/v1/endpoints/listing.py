@@ -0,0 +1,109 @@
+# app/api/v1/endpoints/listing.py
+import json
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.crud import crud_block, crud_chat_history, crud_content_corpus, crud_general_logs, crud_outlines
+from app.crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter()
+
+OutputFormat = Literal["json", "ndjson"]
+
+# Listings leave out the heavy bodies; fetch a single document for the full content
+CORPUS_SUMMARY_PROJECTION = {"content.sourceChunks": 0, "pedagogicalAnalysis": 0}
+SESSION_SUMMARY_PROJECTION = {"messages": 0}
+
+
+def _dumps(doc: dict) -> str:
+    # default=str covers ObjectId / datetime, like the single-document endpoints
+    return json.dumps(doc, ensure_ascii=False, default=str)
+
+
+async def _ndjson_lines(docs: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for doc in docs:
+        yield _dumps(doc) + "\n"
+
+
+def _ndjson(docs: AsyncIterator[dict]) -> StreamingResponse:
+    """Every matching document, one JSON object per line; memory stays at one cursor batch."""
+    return StreamingResponse(_ndjson_lines(docs), media_type="application/x-ndjson")
+
+
+async def _page(coro):
+    """One keyset page: {"items": [...], "next_cursor": "..."} (null on the last page)."""
+    try:
+        page = await coro
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"status": "error", "detail": str(e)})
+    return JSONResponse(content=json.loads(_dumps(page)))
+
+
+@router.get("/blocks")
+async def list_blocks(
+    pageId: Optional[str] = None,
+    courseOutlineId: Optional[str] = None,
+    blockType: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: OutputFormat = "json",
+):
+    query = {k: v for k, v in {"pageId": pageId, "courseOutlineId": courseOutlineId,
+                               "blockType": blockType}.items() if v}
+    if format == "ndjson":
+        return _ndjson(crud_block.iter_blocks(query))
+    return await _page(crud_block.get_blocks_page(limit, cursor, query))
+
+
+@router.get("/outlines")
+async def list_outlines(
+    subject: Optional[str] = None,
+    grade: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: OutputFormat = "json",
+):
+    if format == "ndjson":
+        return _ndjson(crud_outlines.iter_outlines(subject, grade))
+    return await _page(crud_outlines.find_outlines_page(subject, grade, limit, cursor))
+
+
+@router.get("/content-corpus")
+async def list_content_corpus(
+    subject: Optional[str] = None,
+    grade: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: OutputFormat = "json",
+):
+    if format == "ndjson":
+        return _ndjson(crud_content_corpus.iter_documents(subject, grade, CORPUS_SUMMARY_PROJECTION))
+    return await _page(crud_content_corpus.find_documents_page(
+        subject, grade, limit, cursor, CORPUS_SUMMARY_PROJECTION))
+
+
+@router.get("/logs")
+async def list_logs(
+    level: Optional[str] = None,
+    source: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: OutputFormat = "json",
+):
+    if format == "ndjson":
+        return _ndjson(crud_general_logs.iter_logs(level, source))
+    return await _page(crud_general_logs.get_logs_page(level, source, limit, cursor))
+
+
+@router.get("/chat/sessions")
+async def list_chat_sessions(
+    userId: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: OutputFormat = "json",
+):
+    if format == "ndjson":
+        return _ndjson(crud_chat_history.iter_sessions_by_user(userId, SESSION_SUMMARY_PROJECTION))
+    return await _page(crud_chat_history.get_sessions_page(userId, limit, cursor, SESSION_SUMMARY_PROJECTION))
@@ -0,0 +1,128 @@
+# app/api/v1/endpoints/metrics.py
+import asyncio
+import time
+
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core import loop_monitor, mongo_log_handler, request_profiler
+from app.core.metrics import CONTENT_TYPE, REGISTRY
+from app.core.tracing import get_trace
+from app.core.verifiers.cascade import cascade_stats
+from app.services.model_router import get_router_stats
+
+router = APIRouter()          # mounted at the root: GET /metrics, GET /healthz
+traces_router = APIRouter()   # mounted under /api/v1: traces, loop blocks, profiles
+
+
+# 📊 Existing in-process stats, exported at scrape time
+def _router_families():
+    outcomes, calls = [], []
+    for agent, stats in get_router_stats().items():
+        for key, value in stats.items():
+            if key.startswith("calls:"):
+                calls.append(({"agent": agent, "model": key[len("calls:"):]}, value))
+            elif not key.startswith("seconds:"):
+                outcomes.append(({"agent": agent, "outcome": key}, value))
+    return [
+        ("eduflow_model_router_outcomes_total", "counter", "Model router decisions per agent.", outcomes),
+        ("eduflow_model_router_calls_total", "counter", "Model calls per agent and model.", calls),
+    ]
+
+
+def _cascade_families():
+    samples = []
+    for key, value in cascade_stats.items():
+        verifier, path = key.rsplit("_", 1)
+        samples.append(({"verifier": verifier, "path": path}, value))
+    return [("eduflow_verifier_cascade_total", "counter", "Verifier verdicts by path (heuristic / llm).", samples)]
+
+
+def _log_sink_families():
+    handler = mongo_log_handler._handler
+    if handler is None:
+        return []
+    samples = [({"state": state}, value) for state, value in handler.stats.items()]
+    return [
+        ("eduflow_log_sink_records_total", "counter", "Log sink records by state.", samples),
+        ("eduflow_log_sink_queue_size", "gauge", "Log records waiting to be flushed.", [({}, len(handler.queue))]),
+    ]
+
+
+for _collector in (_router_families, _cascade_families, _log_sink_families):
+    REGISTRY.register_collector(_collector)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz():
+    """
+    Liveness probe. loopLagMs is how long a yield to the event loop took: near zero on an idle
+    worker, large when callbacks block the loop (the load-test harness samples it over time).
+    """
+    started = time.perf_counter()
+    await asyncio.sleep(0)
+    return {"status": "ok", "loopLagMs": round((time.perf_counter() - started) * 1000, 3)}
+
+
+@traces_router.get("/traces/{pipeline_run_id}")
+async def read_trace(pipeline_run_id: str):
+    """Spans recorded in this process for one pipeline run (most recent runs only)."""
+    spans = get_trace(pipeline_run_id)
+    if not spans:
+        return JSONResponse(status_code=404, content={"status": "error", "detail": "Unknown or expired run id"})
+    return {"pipeline_run_id": pipeline_run_id, "spans": spans}
+
+
+@traces_router.get("/debug/loop-blocks")
+async def read_loop_blocks():
+    """Most recent event-loop blocking episodes (LOOP_MONITOR_ENABLED), newest last."""
+    monitor = loop_monitor._monitor
+    if monitor is None:
+        return JSONResponse(status_code=404, content={"status": "error", "detail": "Loop monitor is not enabled"})
+    return {"stats": monitor.stats, "blocks": monitor.recent_blocks()}
+
+
+def _profiles_forbidden(token: Optional[str]) -> Optional[JSONResponse]:
+    # 404 rather than 401/403 so an unconfigured or unauthenticated caller learns nothing
+    if request_profiler.is_authorized(token):
+        return None
+    return JSONResponse(status_code=404, content={"status": "error", "detail": "Profile not found"})
+
+
+@traces_router.get("/debug/profiles")
+async def read_profiles(
+    x_profile_token: Optional[str] = Header(None), profile: Optional[str] = Query(None),
+):
+    """Stored on-demand request profiles (PROFILING_TOKEN), newest first."""
+    return _profiles_forbidden(x_profile_token or profile) or {"profiles": request_profiler.list_profiles()}
+
+
+@traces_router.get("/debug/profiles/{profile_id}")
+async def read_profile(
+    profile_id: str, x_profile_token: Optional[str] = Header(None), profile: Optional[str] = Query(None),
+):
+    """One profile: request meta, sample counts and the top tracemalloc allocation diffs."""
+    denied = _profiles_forbidden(x_profile_token or profile)
+    found = request_profiler.get_profile(profile_id)
+    if denied or found is None:
+        return denied or JSONResponse(status_code=404, content={"status": "error", "detail": "Profile not found"})
+    return {k: v for k, v in found.items() if k != "folded"}
+
+
+@traces_router.get("/debug/profiles/{profile_id}/folded")
+async def read_profile_folded(
+    profile_id: str, x_profile_token: Optional[str] = Header(None), profile: Optional[str] = Query(None),
+):
+    """Collapsed stacks of the profile, for flamegraph.pl / speedscope."""
+    denied = _profiles_forbidden(x_profile_token or profile)
+    found = request_profiler.get_profile(profile_id)
+    if denied or found is None:
+        return denied or JSONResponse(status_code=404, content={"status": "error", "detail": "Profile not found"})
+    return PlainTextResponse(found["folded"])
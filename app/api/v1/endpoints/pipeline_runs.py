@@ -0,0 +1,48 @@
+# app/api/v1/endpoints/pipeline_runs.py
+import json
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from app.crud import crud_pipeline_runs
+
+router = APIRouter()
+
+GroupBy = Literal["topic", "grade", "question_type", "subject", "stage"]
+
+
+def _json(payload) -> JSONResponse:
+    # default=str covers datetimes, like the listing endpoints
+    return JSONResponse(content=json.loads(json.dumps(payload, ensure_ascii=False, default=str)))
+
+
+@router.get("/pipeline-runs/analytics/latency")
+async def pipeline_latency(
+    group_by: GroupBy = "topic",
+    stage: Optional[str] = "stage2",
+    since_hours: Optional[int] = Query(None, ge=1),
+    step: Optional[str] = Query(None, pattern=r"^[A-Za-z0-9_]+$"),
+):
+    """p50/p90/p95/p99 run (or step) latency in seconds per group."""
+    rows = await crud_pipeline_runs.get_latency_percentiles(group_by, stage, since_hours, step)
+    return _json({"group_by": group_by, "stage": stage, "step": step, "groups": rows})
+
+
+@router.get("/pipeline-runs/analytics/cost")
+async def pipeline_cost(
+    group_by: GroupBy = "topic",
+    stage: Optional[str] = "stage2",
+    since_hours: Optional[int] = Query(None, ge=1),
+):
+    """LLM token and USD totals per group, plus cost per accepted question."""
+    rows = await crud_pipeline_runs.get_cost_breakdown(group_by, stage, since_hours)
+    return _json({"group_by": group_by, "stage": stage, "groups": rows})
+
+
+@router.get("/pipeline-runs/{pipeline_run_id}")
+async def read_pipeline_run(pipeline_run_id: str):
+    run = await crud_pipeline_runs.get_pipeline_run(pipeline_run_id)
+    if not run:
+        return JSONResponse(status_code=404, content={"status": "error", "detail": "Pipeline run not found"})
+    return _json(run)
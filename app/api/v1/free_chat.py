@@ -1,25 +1,38 @@
 # app/api/v1/free_chat.py
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from app.core.config import settings
+from app.core.services.chat_memory import build_context, record_turn, to_langchain
+from app.services.model_router import get_chat_model
+
 router = APIRouter()
 
+SYSTEM_PROMPT = "You are a helpful assistant. Answer in Hebrew when the user writes Hebrew."
+
 class FreeChatRequest(BaseModel):
     text: str
+    # With a session, earlier turns are fed back within the chat-memory token budget
+    sessionId: Optional[str] = None
+    userId: Optional[str] = None
 
-# אפשר להגדיר פעם אחת ולהשתמש מחדש
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.7)
+# מוגדר פעם אחת (בקריאה הראשונה) ומשותף בין הבקשות
+def get_llm():
+    return get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.7)
 
 @router.post("/free-chat")
 async def free_chat(req: FreeChatRequest):
     try:
-        msgs = [
-            SystemMessage(content="You are a helpful assistant. Answer in Hebrew when the user writes Hebrew."),
-            HumanMessage(content=req.text),
-        ]
-        res = await llm.ainvoke(msgs)
+        if req.sessionId:
+            msgs = to_langchain(await build_context(req.sessionId, SYSTEM_PROMPT, req.text))
+        else:
+            msgs = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=req.text)]
+        res = await get_llm().ainvoke(msgs)
+        if req.sessionId:
+            await record_turn(req.sessionId, req.userId or "anon", req.text, res.content)
         return {"reply": res.content}
     except Exception as e:
         print(f"[free-chat] error: {e}")
@@ -1,9 +1,13 @@
 # app/api/main.py
 from fastapi import APIRouter
-from app.api.v1.endpoints import generate, content_corpus, stage2
+from app.api.v1.endpoints import generate, content_corpus, stage2, listing, metrics, pipeline_runs
 
 api_router = APIRouter()
 
 api_router.include_router(generate.router, prefix="/api/v1", tags=["Content Corpus"])
 api_router.include_router(content_corpus.router, prefix="/api/v1", tags=["Content Corpus"])
 api_router.include_router(stage2.router, prefix="/api/v1", tags=["Stage 2"])
+api_router.include_router(listing.router, prefix="/api/v1", tags=["Listing"])
+api_router.include_router(metrics.traces_router, prefix="/api/v1", tags=["Observability"])
+api_router.include_router(pipeline_runs.router, prefix="/api/v1", tags=["Observability"])
+api_router.include_router(metrics.router, tags=["Observability"])
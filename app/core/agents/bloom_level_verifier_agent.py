@@ -1,26 +1,24 @@
 #app/core/agents/grounding_verifier_agent.py
 # -*- coding: utf-8 -*-
-import json
 import logging
 from typing import TypedDict
 
 from dotenv import load_dotenv
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
 
-from app.services.prompt_manager import load_prompt, render_user_prompt
+from app.services.model_router import route_json
+from app.services.prompt_manager import get_prompt, render_prompt
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# ---- Load YAML prompt ----
-prompt_data = load_prompt("data_agents/cognitive_level_verifier_prompt.yaml")
-system_tpl = prompt_data["system"]
-user_tpl = prompt_data["user"]
+# ---- Prompt (YAML, loaded from the registry on first use) ----
+PROMPT_NAME = "data_agents/cognitive_level_verifier_prompt.yaml"
 
 # ---- LLM Config ----
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.3)
+# Model choice (cheap first, strong on escalation) lives in the router policy for this agent
+ROUTER_AGENT = "bloom_verifier"
 parser = StrOutputParser()
 
 # ---- Input type ----
@@ -40,33 +38,17 @@ async def run_bloom_level_verifier_agent(input: BloomLevelVerifierInput) -> dict
             "bloom_level": input["bloom_level"]
         }
 
-        rendered_user = render_user_prompt(user_tpl, context)
+        rendered_user = render_prompt(PROMPT_NAME, context)
 
         messages = [
-            SystemMessage(content=system_tpl),
+            SystemMessage(content=get_prompt(PROMPT_NAME).system),
             HumanMessage(content=rendered_user)
         ]
 
-        response = await llm.ainvoke(messages)
-        response_str = response.content
-
     except Exception as e:
-        logger.exception("LLM call failed in Bloom Level Verifier.")
-        return {"status": "error", "reason": "llm_call_failed", "exception": str(e)}
-
-    try:
-        parsed = json.loads(response_str)
-        if parsed.get("status") != "ok":
-            raise ValueError("LLM returned non-ok status.")
-        return parsed
+        logger.exception("Prompt rendering failed in Bloom Level Verifier.")
+        return {"status": "error", "reason": "prompt_render_failed", "exception": str(e)}
 
-    except Exception as e:
-        logger.warning("Invalid JSON or malformed response: %s", response_str)
-        return {
-            "status": "error",
-            "reason": "invalid_json_response",
-            "raw_output": response_str,
-            "exception": str(e)
-        }
+    return await route_json(ROUTER_AGENT, messages)
 
 __all__ = ["run_bloom_level_verifier_agent", "BloomLevelVerifierInput"]
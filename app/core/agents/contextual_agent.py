@@ -1,14 +1,16 @@
 #app/core/agents/contextual_agent.py
 # LangChain core imports: prompt templates and output parser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-# OpenAI chat model integration
-from langchain_openai import ChatOpenAI
+# Shared chat model clients (created on first use)
+from app.core.config import settings
+from app.core.tracing import span
+from app.services.model_router import get_chat_model
 # Input schema for Stage 1 agent
 from app.schemas.input_model import Stage1Input
 from app.services.prompt_manager import load_prompt
 import json
 import logging
+from functools import lru_cache
 # Load environment variables (e.g., OPENAI_API_KEY)
 
 from dotenv import load_dotenv
@@ -19,27 +21,21 @@ load_dotenv()
 # 1️⃣ Prompt Template
 # This defines the role of the agent and the format it expects to receive input in.
 # It includes a SYSTEM message with instructions and a USER message template that is dynamically filled.
-prompt_data = load_prompt("data_agents/contextual_course_agent.yaml")
+PROMPT_NAME = "data_agents/contextual_course_agent.yaml"
 
-prompt = ChatPromptTemplate.from_messages([
-    ("system", prompt_data["system"]),
-    ("user", prompt_data["user"])
-])
 
-
-# 2️⃣ Language Model Setup
-# This uses GPT-4.1 with a slightly lower temperature for more deterministic, structured results.
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.6)
-
-
-
-# 3️⃣ Chain Assembly
-# The prompt is passed to the model, and the model's output is parsed into a plain string.
-contextual_chain = (
-    prompt
-    | llm
-    | StrOutputParser()
-)
+# 2️⃣ + 3️⃣ Language Model + Chain Assembly
+# GPT-4.1 with a slightly lower temperature for more deterministic, structured results.
+# The prompt is passed to the model; the caller records token usage and reads the message text.
+# Built on first use so importing this module loads no prompt and creates no client.
+@lru_cache(maxsize=1)
+def get_contextual_chain():
+    prompt_data = load_prompt(PROMPT_NAME)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", prompt_data["system"]),
+        ("user", prompt_data["user"])
+    ])
+    return prompt | get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.6)
 
 
 # 4️⃣ Agent Runner Function
@@ -58,7 +54,10 @@ async def run_contextual_agent(inputs: Stage1Input) -> dict:
         "freePrompt": inputs.freePrompt or "None"
     }
 
-    raw_result = await contextual_chain.ainvoke(prompt_inputs)
+    async with span("llm_call", kind="llm", agent="contextual", model=settings.MODEL_ROUTER_STRONG_MODEL) as s:
+        message = await get_contextual_chain().ainvoke(prompt_inputs)
+        s.record_usage(message)
+    raw_result = message.content
     try:
         return json.loads(raw_result)
     except Exception as e:
@@ -3,31 +3,24 @@
 
 import logging
 import re
+from functools import lru_cache
 from typing import List, Optional, Union  
 
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_openai import ChatOpenAI
 
+from app.core.config import settings
+from app.core.tracing import span
 from app.schemas.input_model import Stage1Input
+from app.services.model_router import get_chat_model
 from app.services.prompt_manager import load_prompt
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# ---- Load prompt from YAML ----
-prompt_data = load_prompt("data_agents/course_scoping_agent.yaml")
-system_tpl = prompt_data["system"]
-user_tpl   = prompt_data["user"]
-
-prompt = ChatPromptTemplate.from_messages([
-    ("system", system_tpl),
-    ("user",   user_tpl),
-])
-
-# ---- LLM config ----
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.5)
+# ---- Prompt (YAML, loaded from the registry on first use) ----
+PROMPT_NAME = "data_agents/course_scoping_agent.yaml"
 
 # ---- Post-processing helpers ----
 _BULLET_PREFIX = r"^\s*(?:[-*•·]+|\d+[\.)]|[a-zA-Z]\)|\([a-zA-Z0-9]\))\s*"
@@ -108,8 +101,17 @@ def _fallback_titles(topic: str, grade: Union[str, int], k: int = 3) -> List[str
         ]
     return base[: max(1, k)]
 
-# ---- Chain: prompt → llm → string ----
-chain = prompt | llm | JsonOutputParser()
+# ---- Chain: prompt → llm (built on first use); JSON parsed after token usage is recorded ----
+_PARSER = JsonOutputParser()
+
+@lru_cache(maxsize=1)
+def get_chain():
+    prompt_data = load_prompt(PROMPT_NAME)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", prompt_data["system"]),
+        ("user",   prompt_data["user"]),
+    ])
+    return prompt | get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.5)
 
 async def run_course_scoping_agent(inputs: Stage1Input) -> List[str]:
     """
@@ -123,13 +125,16 @@ async def run_course_scoping_agent(inputs: Stage1Input) -> List[str]:
     pedagogy: str = getattr(inputs, "pedagogicalProfileJson", "") or ""
 
     try:
-        result = await chain.ainvoke({
-            "topicName": topic,
-            "gradeLevel": grade,
-            "bigIdea": big,
-            "numLessons": num,
-            "pedagogical_json_from_contextual_agent": pedagogy,
-        })
+        async with span("llm_call", kind="llm", agent="course_scoping", model=settings.MODEL_ROUTER_STRONG_MODEL) as s:
+            message = await get_chain().ainvoke({
+                "topicName": topic,
+                "gradeLevel": grade,
+                "bigIdea": big,
+                "numLessons": num,
+                "pedagogical_json_from_contextual_agent": pedagogy,
+            })
+            s.record_usage(message)
+        result = _PARSER.parse(message.content)
 
         raw_lessons = result.get("lessons", [])
 
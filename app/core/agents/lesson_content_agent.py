@@ -1,33 +1,33 @@
 # app/core/agents/lesson_content_agent.py
 # -*- coding: utf-8 -*-
 import logging
-import json
+from functools import lru_cache
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_openai import ChatOpenAI
 
+from app.core.config import settings
+from app.core.normalizers.llm_output_salvage import extract_json
+from app.core.tracing import span
+from app.services.model_router import get_chat_model
 from app.services.prompt_manager import load_prompt
 from app.schemas.input_model import LessonContentAgentInput
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# ---- Load prompt ----
-prompt_data = load_prompt("data_agents/lesson_content_agent.yaml")
-system_tpl = prompt_data["system"]
-user_tpl   = prompt_data["user"]
+# ---- Prompt (YAML, loaded from the registry on first use) ----
+PROMPT_NAME = "data_agents/lesson_content_agent.yaml"
 
-prompt = ChatPromptTemplate.from_messages([
-    ("system", system_tpl),
-    ("user",   user_tpl),
-])
-
-# ---- LLM Configuration ----
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.4)
-
-# ---- Chain ----
-chain = prompt | llm | JsonOutputParser()
+# ---- Chain (built on first use) ----
+# Raw message out; extract_json tolerates code fences / surrounding prose
+@lru_cache(maxsize=1)
+def get_chain():
+    prompt_data = load_prompt(PROMPT_NAME)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", prompt_data["system"]),
+        ("user",   prompt_data["user"]),
+    ])
+    return prompt | get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.4)
 
 # ---- Agent Entrypoint ----
 _ALLOWED_TAGS = {"concept", "theme", "misconception", "analysis"}
@@ -105,13 +105,14 @@ async def run_lesson_content_agent(inputs: LessonContentAgentInput) -> dict:
             "pedagogical_json": inputs.pedagogicalProfile,
         }
 
-        print("\n📤 Prompt Payload Sent to LLM:")
-        print(json.dumps(payload, indent=2, ensure_ascii=False))
+        logger.debug("📤 Lesson content prompt for lesson %s", inputs.lessonIndex, extra={"details": payload})
 
-        result = await chain.ainvoke(payload)
+        async with span("llm_call", kind="llm", agent="lesson_content", model=settings.MODEL_ROUTER_STRONG_MODEL) as s:
+            message = await get_chain().ainvoke(payload)
+            s.record_usage(message)
+        result = extract_json(message.content)
 
-        print("\n📥 Raw Result from LLM:")
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        logger.debug("📥 Lesson content result for lesson %s", inputs.lessonIndex, extra={"details": {"result": result}})
 
         if not isinstance(result, dict):
             result = {}
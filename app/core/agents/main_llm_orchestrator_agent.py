@@ -11,6 +11,7 @@ from app.core.pipeline.stage2_pipeline import run_stage2
 from app.schemas.stage2 import Stage2Request
 from app.services.factory import get_llm_service
 from app.crud.crud_chat_history import save_chat_message
+from app.core.services.chat_memory import build_context
 from typing import Union
 
 # Input to the main agent
@@ -44,8 +45,14 @@ async def run_main_orchestrator(input: OrchestratorInput) -> OrchestratorRespons
             )
         elif input.task == "chat":
             llm = get_llm_service() 
-            response_text = await llm.run(str(input.userInput))
-            await save_chat_message(input.courseId or "anon", str(input.userInput), response_text)
+            user_id = input.courseId or "anon"
+            messages = await build_context(
+                f"session_{user_id}",  # same session save_chat_message writes to
+                "You are a helpful assistant.",
+                str(input.userInput),
+            )
+            response_text = await llm.chat(messages)
+            await save_chat_message(user_id, str(input.userInput), response_text)
 
             return OrchestratorResponse(
                 success=True,
@@ -1,29 +1,31 @@
 # app/core/agents/question_generator_agent.py
 # -*- coding: utf-8 -*-
 import logging
-from typing import List, Optional, TypedDict, Literal, Union, Tuple
+from typing import Annotated, Any, List, Optional, TypedDict, Literal, Union, Tuple
 
 from dotenv import load_dotenv
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain.output_parsers import PydanticOutputParser
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field, TypeAdapter
 
+from app.core.config import settings
+from app.core.normalizers.llm_output_salvage import extract_json, repair_items, validate_items
+from app.core.tracing import span
 from app.schemas.input_model import Stage1Input
 from app.schemas.stage2 import Stage2Request
-from app.services.prompt_manager import load_prompt, render_user_prompt
-import json
+from app.services.model_router import get_chat_model, model_for
+from app.services.prompt_manager import get_prompt, render_prompt
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# ---- Load prompt from YAML ----
-prompt_data = load_prompt("data_agents/question_generator_prompt.yaml")
-system_tpl = prompt_data["system"]
-user_tpl = prompt_data["user"]
+# ---- Prompt (YAML, loaded from the registry on first use) ----
+PROMPT_NAME = "data_agents/question_generator_prompt.yaml"
 
 # ---- LLM config ----
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.8)
+def get_llm():
+    """Chat model for this agent, created on first use (importing the module needs no API key)."""
+    return get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.8)
 
 # ---- Pydantic Output Schema (discriminated union) ----
 class MCQQuestion(BaseModel):
@@ -45,12 +47,14 @@ class MatchingQuestion(BaseModel):
     pairs: List[Tuple[str, str]]
     distractors: List[str]
 
-QuestionUnion = Union[MCQQuestion, OpenQuestion, MatchingQuestion]
+QuestionUnion = Annotated[Union[MCQQuestion, OpenQuestion, MatchingQuestion], Field(discriminator="type")]
 
 class QuestionGenResponse(BaseModel):
     questions: List[QuestionUnion]
 
 parser = PydanticOutputParser(pydantic_object=QuestionGenResponse)
+# Per-question validation: one malformed item must not sink the whole response
+question_adapter = TypeAdapter(QuestionUnion)
 
 # ---- Data Types ----
 class Chunk(TypedDict):
@@ -64,26 +68,29 @@ class QuestionGenInput(TypedDict):
     chunks: List[Chunk]
     stage1: Stage1Input
 
-# ---- Optional: normalize legacy keys before parsing ----
-def _normalize_legacy(text: str) -> str:
-    try:
-        obj = json.loads(text)
-    except Exception:
-        return text
-    if isinstance(obj, dict) and "questions" in obj and isinstance(obj["questions"], list):
-        for q in obj["questions"]:
-            if isinstance(q, dict):
-                # open: prompt -> stem, ideal_answer -> expected_answer
-                if q.get("type") == "open":
-                    if "prompt" in q and "stem" not in q:
-                        q["stem"] = q.pop("prompt")
-                    if "ideal_answer" in q and "expected_answer" not in q:
-                        q["expected_answer"] = q.pop("ideal_answer")
-                # matching: if missing type but structure indicates matching
-                if "instructions" in q and "pairs" in q and "type" not in q:
-                    q["type"] = "matching"
-        return json.dumps(obj, ensure_ascii=False)
-    return text
+# ---- Optional: normalize legacy keys before validation ----
+def _normalize_legacy(obj: Any, default_type: Optional[str] = None) -> List[Any]:
+    """Return the list of raw question dicts, fixing legacy keys in place."""
+    if isinstance(obj, dict):
+        obj = obj.get("questions", [])
+    if not isinstance(obj, list):
+        return []
+    for q in obj:
+        if isinstance(q, dict):
+            if isinstance(q.get("type"), str):
+                q["type"] = q["type"].strip().lower()
+            # open: prompt -> stem, ideal_answer -> expected_answer
+            if q.get("type") == "open":
+                if "prompt" in q and "stem" not in q:
+                    q["stem"] = q.pop("prompt")
+                if "ideal_answer" in q and "expected_answer" not in q:
+                    q["expected_answer"] = q.pop("ideal_answer")
+            # matching: if missing type but structure indicates matching
+            if "instructions" in q and "pairs" in q and "type" not in q:
+                q["type"] = "matching"
+            if "type" not in q and default_type:
+                q["type"] = default_type
+    return obj
 
 
 def questions_to_blocks(questions: list) -> list:
@@ -141,7 +148,11 @@ def questions_to_blocks(questions: list) -> list:
     return blocks
 
 # ---- Agent Function ----
-async def run_question_generator_agent(input: Stage2Request) -> dict:
+async def run_question_generator_agent(input: Stage2Request, covered_stems: Optional[List[str]] = None) -> dict:
+    """
+    Generate questions for 'input'. 'covered_stems' (compact, see question_bank.compact_stems)
+    are listed in the prompt as already covered so the model does not propose them again.
+    """
     try:
         context = {
             "topicName": input.topicName,
@@ -157,29 +168,45 @@ async def run_question_generator_agent(input: Stage2Request) -> dict:
             "bloom_level": input.cognitive_target.value,
             "difficulty": input.target_difficulty.value,
             "chunks": input.chunks,
+            "covered_stems": covered_stems or [],
         }
 
-        rendered_user = render_user_prompt(user_tpl, context) + "\n\n" + parser.get_format_instructions()
+        rendered_user = render_prompt(PROMPT_NAME, context) + "\n\n" + parser.get_format_instructions()
 
         messages = [
-            SystemMessage(content=system_tpl),
+            SystemMessage(content=get_prompt(PROMPT_NAME).system),
             HumanMessage(content=rendered_user),
         ]
 
-        raw_response = await llm.ainvoke(messages)
-        print("🧠 Raw LLM Response:\n", raw_response)
+        async with span("llm_call", kind="llm", agent="question_generator", model=settings.MODEL_ROUTER_STRONG_MODEL) as s:
+            raw_response = await get_llm().ainvoke(messages)
+            s.record_usage(raw_response)
+        logger.debug("🧠 Raw LLM response: %s", raw_response.content)
+
+        default_type = context["question_type"]
+        items = _normalize_legacy(extract_json(raw_response.content), default_type)
+        parsed_questions, invalid = validate_items(items, question_adapter)
+
+        # Salvage: only the broken items go back for a small repair call
+        repaired_count = 0
+        if invalid:
+            logger.info("🩹 %d/%d question(s) failed validation – requesting repair", len(invalid), len(items))
+            repaired = await repair_items(invalid, question_adapter.json_schema(), model_for("json_repair"))
+            fixed, _ = validate_items(_normalize_legacy(repaired, default_type), question_adapter)
+            parsed_questions.extend(fixed)
+            repaired_count = len(fixed)
 
-        clean_text = _normalize_legacy(raw_response.content)
-        print("🧼 Cleaned Text:\n", clean_text)
-        parsed = parser.parse(clean_text)
-        parsed_questions = parsed.questions
         return {
             "success": True,
             "questions": parsed_questions,
-            "blocks": questions_to_blocks([q.dict() for q in parsed_questions])
+            "blocks": questions_to_blocks([q.model_dump() for q in parsed_questions]),
+            "salvage": {
+                "received": len(items),
+                "invalid": len(invalid),
+                "repaired": repaired_count,
+            },
         }
 
-
     except Exception as e:
         logger.exception("❌ Failed to parse LLM response into QuestionGenResponse.")
         return {
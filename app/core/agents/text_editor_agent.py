@@ -4,21 +4,22 @@ import logging
 from typing import Literal, Optional, TypedDict
 
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain.output_parsers import PydanticOutputParser
-from langchain_openai import ChatOpenAI
+from langchain_core.output_parsers import PydanticOutputParser
 
+from app.core.config import settings
+from app.core.normalizers.llm_output_salvage import extract_json, repair_items, validate_items
+from app.core.tracing import span
 from app.schemas.input_model import Stage1Input
-from app.services.prompt_manager import load_prompt, render_user_prompt
+from app.services.model_router import get_chat_model, model_for
+from app.services.prompt_manager import get_prompt, render_prompt
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-# ---- Load prompt from YAML ----
-prompt_data = load_prompt("data_agents/text_editor_prompt.yaml")
-system_tpl = prompt_data["system"]
-user_tpl = prompt_data["user"]
+# ---- Prompt (YAML, loaded from the registry on first use) ----
+PROMPT_NAME = "data_agents/text_editor_prompt.yaml"
 
 
 # ---- Pydantic schema ----
@@ -29,9 +30,14 @@ class TextEditResult(BaseModel):
 
 
 # ---- LLM config ----
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.7)
+def get_llm():
+    """Chat model for this agent, created on first use (importing the module needs no API key)."""
+    return get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.7)
+
+
 parser = PydanticOutputParser(pydantic_object=TextEditResult)
 format_instructions = parser.get_format_instructions()
+result_adapter = TypeAdapter(TextEditResult)
 
 # ---- Input format ----
 class TextEditorInput(TypedDict):
@@ -66,16 +72,25 @@ async def run_text_editor_agent(input: TextEditorInput) -> dict:
             "allowFormatting": str(input["allowFormatting"]).lower()
         }
 
-        rendered_user = render_user_prompt(user_tpl, context)
+        rendered_user = render_prompt(PROMPT_NAME, context)
         messages = [
-            SystemMessage(content=system_tpl),
+            SystemMessage(content=get_prompt(PROMPT_NAME).system),
             HumanMessage(content=f"{rendered_user}\n\n{format_instructions}")
         ]
 
-        response = await llm.ainvoke(messages)
-        print("🧠 Raw LLM response:", response.content) 
-        parsed = parser.parse(response.content)
-        return parsed.dict()
+        async with span("llm_call", kind="llm", agent="text_editor", model=settings.MODEL_ROUTER_STRONG_MODEL) as s:
+            response = await get_llm().ainvoke(messages)
+            s.record_usage(response)
+        logger.debug("🧠 Raw LLM response: %s", response.content)
+
+        # Tolerant parse (fences/prose); a schema miss gets one small repair call
+        valid, invalid = validate_items([extract_json(response.content)], result_adapter)
+        if invalid:
+            repaired = await repair_items(invalid, result_adapter.json_schema(), model_for("json_repair"))
+            valid, _ = validate_items(repaired[:1], result_adapter)
+        if not valid:
+            raise ValueError(f"Text editor output failed validation: {invalid[0]['error']}")
+        return valid[0].model_dump()
 
     except Exception as e:
         logger.exception("Text editing failed.")
@@ -15,9 +15,92 @@ class Settings:
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
     GRAQ_API_KEY = os.getenv("GRAQ_API_KEY", "")
     OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    # Fake LLM backend (LLM_PROVIDER=fake, app/services/fake_llm.py): offline canned outputs per agent.
+    # Latency in ms: "250", "uniform:100,400", "normal:300,80" or "lognormal:<median>,<sigma>"
+    FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "0")
+    FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    FAKE_LLM_REJECT_RATE = float(os.getenv("FAKE_LLM_REJECT_RATE", "0"))
+    FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+    FAKE_LLM_CHARS_PER_TOKEN = float(os.getenv("FAKE_LLM_CHARS_PER_TOKEN", "4"))
+    # OpenAI-compatible stand-in server (python -m app.services.openai_standin): 429 / 5xx injection rates
+    FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+    FAKE_LLM_SERVER_ERROR_RATE = float(os.getenv("FAKE_LLM_SERVER_ERROR_RATE", "0"))
+    # Send every provider (ChatOpenAI agents, factory services) to one OpenAI-compatible endpoint,
+    # e.g. http://localhost:8100/v1 for the stand-in server. Empty = each provider's real API.
+    LLM_BASE_URL = os.getenv("LLM_BASE_URL", "").rstrip("/")
+    # Serve a canned Wikipedia summary instead of calling the API (on by default with the fake LLM)
+    WIKIPEDIA_OFFLINE = os.getenv("WIKIPEDIA_OFFLINE", str(LLM_PROVIDER == "fake")).lower() == "true"
 
     DB_NAME = os.getenv("DB_NAME", "mongo_project_amit")
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    # Apply the index registry (app/core/indexes.py) on startup
+    MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
+    # Max operations per bulk_write batch in crud_block.bulk_upsert_blocks
+    BLOCK_BULK_CHUNK_SIZE = int(os.getenv("BLOCK_BULK_CHUNK_SIZE", "500"))
+    # Max age of the materialized question-count views (app/crud/crud_question_counts.py)
+    QUESTION_COUNTS_TTL_SECONDS = int(os.getenv("QUESTION_COUNTS_TTL_SECONDS", "300"))
+    # Messages per chat_message_buckets document (a batch may overflow the last bucket slightly)
+    CHAT_BUCKET_SIZE = int(os.getenv("CHAT_BUCKET_SIZE", "50"))
+    # Chat memory: total prompt budget per turn, share kept for the rolling summary,
+    # recent messages considered for the window, and max messages folded into the summary per turn
+    CHAT_MEMORY_TOKEN_BUDGET = int(os.getenv("CHAT_MEMORY_TOKEN_BUDGET", "3000"))
+    CHAT_MEMORY_SUMMARY_TOKENS = int(os.getenv("CHAT_MEMORY_SUMMARY_TOKENS", "400"))
+    CHAT_MEMORY_MAX_RECENT = int(os.getenv("CHAT_MEMORY_MAX_RECENT", "30"))
+    CHAT_MEMORY_MAX_FOLD = int(os.getenv("CHAT_MEMORY_MAX_FOLD", "60"))
+
+    # Stage 2: Jaccard similarity above which two question stems count as duplicates
+    NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.7"))
+    # Stage 2: per-outline question bank (existing question blocks) cache + prompt hints
+    QUESTION_BANK_TTL_SECONDS = int(os.getenv("QUESTION_BANK_TTL_SECONDS", "300"))
+    QUESTION_BANK_MAX_SCOPES = int(os.getenv("QUESTION_BANK_MAX_SCOPES", "256"))
+    QUESTION_BANK_PROMPT_STEMS = int(os.getenv("QUESTION_BANK_PROMPT_STEMS", "20"))
+
+    # Stage 2: lexical grounding pre-check in front of the LLM grounding verifier
+    GROUNDING_PRECHECK_REJECT_BELOW = float(os.getenv("GROUNDING_PRECHECK_REJECT_BELOW", "0.15"))
+    GROUNDING_PRECHECK_ACCEPT_ABOVE = float(os.getenv("GROUNDING_PRECHECK_ACCEPT_ABOVE", "0.85"))
+    GROUNDING_PRECHECK_MIN_SPAN = int(os.getenv("GROUNDING_PRECHECK_MIN_SPAN", "3"))
+    GROUNDING_PRECHECK_LOCAL_ACCEPT = os.getenv("GROUNDING_PRECHECK_LOCAL_ACCEPT", "true").lower() == "true"
+    GROUNDING_MIN_SCORE = float(os.getenv("GROUNDING_MIN_SCORE", "0.7"))
+
+    # Stage 2: heuristic Bloom/difficulty verdicts at or above these confidences skip the LLM
+    BLOOM_HEURISTIC_MIN_CONFIDENCE = float(os.getenv("BLOOM_HEURISTIC_MIN_CONFIDENCE", "0.85"))
+    DIFFICULTY_HEURISTIC_MIN_CONFIDENCE = float(os.getenv("DIFFICULTY_HEURISTIC_MIN_CONFIDENCE", "0.85"))
+
+    # Model routing: cheap model first for verifiers, escalate to the strong model when unsure
+    MODEL_ROUTER_ENABLED = os.getenv("MODEL_ROUTER_ENABLED", "true").lower() == "true"
+    MODEL_ROUTER_CHEAP_MODEL = os.getenv("MODEL_ROUTER_CHEAP_MODEL", "gpt-4.1-mini")
+    MODEL_ROUTER_STRONG_MODEL = os.getenv("MODEL_ROUTER_STRONG_MODEL", "gpt-4.1")
+    # Optional JSON overrides per agent, e.g. '{"grounding_verifier": {"uncertain_band": [0.5, 0.9]}}'
+    MODEL_ROUTER_POLICIES = os.getenv("MODEL_ROUTER_POLICIES", "")
+
+    # Buffered log sink (app/core/mongo_log_handler.py) → general_logs
+    LOG_SINK_ENABLED = os.getenv("LOG_SINK_ENABLED", "true").lower() == "true"
+    LOG_SINK_LEVEL = os.getenv("LOG_SINK_LEVEL", "INFO").upper()
+    LOG_SINK_BATCH_SIZE = int(os.getenv("LOG_SINK_BATCH_SIZE", "200"))
+    LOG_SINK_FLUSH_SECONDS = float(os.getenv("LOG_SINK_FLUSH_SECONDS", "2.0"))
+    LOG_SINK_MAX_QUEUE = int(os.getenv("LOG_SINK_MAX_QUEUE", "10000"))
+    LOG_SINK_DROP_POLICY = os.getenv("LOG_SINK_DROP_POLICY", "drop_oldest")  # or drop_newest
+
+    # Event-loop monitor (app/core/loop_monitor.py): lag heartbeat + reports of callbacks blocking the loop
+    LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+    LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+    LOOP_MONITOR_BLOCK_MS = float(os.getenv("LOOP_MONITOR_BLOCK_MS", "100"))
+    # Directory for sampled (collapsed-stack) profiles of blocking episodes; empty = no profiles
+    LOOP_MONITOR_PROFILE_DIR = os.getenv("LOOP_MONITOR_PROFILE_DIR", "")
+    LOOP_MONITOR_PROFILE_COOLDOWN_SECONDS = float(os.getenv("LOOP_MONITOR_PROFILE_COOLDOWN_SECONDS", "60"))
+
+    # On-demand request profiling (app/core/request_profiler.py): requests carrying this token in the
+    # X-Profile-Token header or ?profile=<token> run under a sampling profiler + tracemalloc. Empty = off.
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_MS = float(os.getenv("PROFILING_SAMPLE_MS", "5"))
+    PROFILING_TOP_ALLOCATIONS = int(os.getenv("PROFILING_TOP_ALLOCATIONS", "25"))
+    PROFILING_MAX_PROFILES = int(os.getenv("PROFILING_MAX_PROFILES", "50"))
+
+    # Pipeline run ledger (pipeline_runs): one document per Stage 1 / Stage 2 run, expired after N days
+    PIPELINE_RUNS_ENABLED = os.getenv("PIPELINE_RUNS_ENABLED", "true").lower() == "true"
+    PIPELINE_RUNS_TTL_DAYS = int(os.getenv("PIPELINE_RUNS_TTL_DAYS", "90"))
+    # Optional JSON price overrides in USD per 1M tokens, e.g. '{"gpt-4.1": {"in": 2.0, "out": 8.0}}'
+    LLM_PRICES_PER_MTOK = os.getenv("LLM_PRICES_PER_MTOK", "")
 
     COLLECTION_NAMES = [
         "content_corpus",
@@ -26,7 +109,11 @@ class Settings:
         "feedback_reports",
         "deployment_logs",
         "general_logs",
-        "chat_history"
+        "chat_history",
+        "chat_message_buckets",
+        "question_counts_by_outline",
+        "question_counts_by_corpus",
+        "pipeline_runs"
     ]
 
 settings = Settings()
@@ -43,9 +130,12 @@ from app.models.blocks import Block
 from app.models.feedback_reports import FeedbackReport
 from app.models.deployment_logs import DeploymentLog
 from app.models.general_logs import GeneralLog
-from app.models.chat_history import ChatHistory
+from app.models.chat_history import ChatHistory, ChatMessageBucket
 
 async def init_db():
+    # Imported here: the index registry reads settings (retention TTLs) from this module
+    from app.core.indexes import ensure_indexes
+
     db = get_db()
     try:
         await init_beanie(
@@ -57,13 +147,22 @@ async def init_db():
                 FeedbackReport,
                 DeploymentLog,
                 GeneralLog,
-                ChatHistory
+                ChatHistory,
+                ChatMessageBucket
             ]
         )
         print("✅ Beanie initialized successfully.")
     except Exception as e:
         print(f"❌ Beanie initialization failed: {e}")
 
+    if settings.MONGO_ENSURE_INDEXES:
+        try:
+            report = await ensure_indexes(db)
+            if report["drift"]:
+                print(f"⚠️ Index drift detected: {report['drift']}")
+        except Exception as e:
+            print(f"❌ Index setup failed: {e}")
+
 # === Test connection ===
 async def check_connection():
     db = get_db()
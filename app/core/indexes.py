@@ -0,0 +1,167 @@
+# app/core/indexes.py
+"""
+Declarative index registry: one entry per Mongo collection, applied idempotently by init_db().
+Each index is named explicitly so drift (missing / changed / unknown indexes) can be reported
+by comparing the registry with what the server actually has.
+"""
+import logging
+from typing import Any, Dict, List, TypedDict
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Options that define an index for drift purposes (name and key are compared separately)
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "blocks": [
+        IndexModel([("pageId", ASCENDING)], name="pageId_1"),
+        # Question blocks per outline, the corpus → blocks $lookup and find_question_stems scopes
+        IndexModel([("courseOutlineId", ASCENDING), ("blockType", ASCENDING), ("lessonId", ASCENDING)],
+                   name="courseOutlineId_1_blockType_1_lessonId_1"),
+        IndexModel([("blockType", ASCENDING), ("pageId", ASCENDING)], name="blockType_1_pageId_1"),
+        # bulk_upsert_blocks read-back; only Stage 2 blocks carry a run id
+        IndexModel([("pipeline_run_id", ASCENDING)], name="pipeline_run_id_1",
+                   partialFilterExpression={"pipeline_run_id": {"$exists": True}}),
+        IndexModel([("createdAt", DESCENDING)], name="createdAt_-1"),
+    ],
+    "general_logs": [
+        # Keyset pages sort by (timestamp, _id) newest first (crud_general_logs.get_logs_page)
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_-1__id_-1"),
+        IndexModel([("level", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                   name="level_1_timestamp_-1__id_-1"),
+        IndexModel([("source", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                   name="source_1_timestamp_-1__id_-1"),
+        IndexModel([("details.corpusId", ASCENDING)], name="details.corpusId_1",
+                   partialFilterExpression={"details.corpusId": {"$exists": True}}),
+    ],
+    "chat_history": [
+        IndexModel([("userId", ASCENDING), ("updatedAt", DESCENDING), ("_id", DESCENDING)],
+                   name="userId_1_updatedAt_-1__id_-1"),
+    ],
+    "chat_message_buckets": [
+        # Append target: the session's open bucket (messageCount below CHAT_BUCKET_SIZE)
+        IndexModel([("sessionId", ASCENDING), ("messageCount", ASCENDING)], name="sessionId_1_messageCount_1"),
+        # One bucket per (session, seq): concurrent appends cannot open two buckets (pre-seq buckets exempt)
+        IndexModel([("sessionId", ASCENDING), ("seq", ASCENDING)], name="sessionId_1_seq_1", unique=True,
+                   partialFilterExpression={"seq": {"$exists": True}}),
+        # Ordered reads (oldest first, or newest first for last-N) walk buckets by (seq, _id)
+        IndexModel([("sessionId", ASCENDING), ("seq", ASCENDING), ("_id", ASCENDING)],
+                   name="sessionId_1_seq_1__id_1"),
+    ],
+    "content_corpus": [
+        # Same spec as ContentCorpus.Settings.indexes (idempotent upserts by cacheKey)
+        IndexModel([("cacheKey", ASCENDING)], name="cacheKey_1", unique=True, sparse=True),
+        IndexModel([("subject", ASCENDING), ("gradeLevel", ASCENDING), ("_id", ASCENDING)],
+                   name="subject_1_gradeLevel_1__id_1"),
+        IndexModel([("createdAt", DESCENDING)], name="createdAt_-1"),
+    ],
+    "outlines": [
+        IndexModel([("lessons.corpusId", ASCENDING)], name="lessons.corpusId_1"),
+        IndexModel([("subject", ASCENDING), ("gradeLevel", ASCENDING), ("_id", ASCENDING)],
+                   name="subject_1_gradeLevel_1__id_1"),
+        IndexModel([("createdAt", DESCENDING)], name="createdAt_-1"),
+    ],
+    "feedback_reports": [
+        IndexModel([("outlineId", ASCENDING), ("overallStatus", ASCENDING)], name="outlineId_1_overallStatus_1"),
+        IndexModel([("blockId", ASCENDING)], name="blockId_1"),
+        # get_blocks_needing_revision() without an outline: only the revision queue is indexed
+        IndexModel([("overallStatus", ASCENDING)], name="overallStatus_needs_revision",
+                   partialFilterExpression={"overallStatus": "Needs_Revision"}),
+    ],
+    "deployment_logs": [
+        IndexModel([("outlineId", ASCENDING)], name="outlineId_1"),
+        IndexModel([("status", ASCENDING), ("timestamp", DESCENDING)], name="status_1_timestamp_-1"),
+    ],
+    "pipeline_runs": [
+        # Retention: the server deletes a run PIPELINE_RUNS_TTL_DAYS after it finished
+        IndexModel([("finishedAt", ASCENDING)], name="finishedAt_ttl",
+                   expireAfterSeconds=settings.PIPELINE_RUNS_TTL_DAYS * 86400),
+        # Analytics: $match on stage + time window, then group by topic / grade / question type
+        IndexModel([("stage", ASCENDING), ("finishedAt", DESCENDING)], name="stage_1_finishedAt_-1"),
+    ],
+}
+
+
+class IndexDrift(TypedDict):
+    missing: List[str]      # in the registry, not on the server
+    changed: List[str]      # same name, different key or options
+    unknown: List[str]      # on the server, not in the registry
+
+
+class IndexReport(TypedDict):
+    created: Dict[str, List[str]]
+    drift: Dict[str, IndexDrift]
+
+
+def _spec(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Comparable form of an index: key (ordered pairs) + the options that change its behaviour."""
+    key = document["key"]
+    spec = {"key": [(field, int(direction)) for field, direction in (key.items() if isinstance(key, dict) else key)]}
+    for option in _COMPARED_OPTIONS:
+        if document.get(option) not in (None, False):
+            spec[option] = document[option]
+    return spec
+
+
+def diff_indexes(expected: List[IndexModel], existing: Dict[str, Dict[str, Any]]) -> IndexDrift:
+    """
+    Compare registry entries with `collection.index_information()` output.
+    The default `_id_` index is ignored.
+    """
+    existing = {name: info for name, info in existing.items() if name != "_id_"}
+    drift: IndexDrift = {"missing": [], "changed": [], "unknown": []}
+    expected_names = set()
+    for model in expected:
+        doc = model.document
+        expected_names.add(doc["name"])
+        if doc["name"] not in existing:
+            drift["missing"].append(doc["name"])
+        elif _spec(doc) != _spec(existing[doc["name"]]):
+            drift["changed"].append(doc["name"])
+    drift["unknown"] = sorted(set(existing) - expected_names)
+    return drift
+
+
+async def index_drift(db) -> Dict[str, IndexDrift]:
+    """Drift per collection (collections without any drift are omitted)."""
+    report = {}
+    for collection, models in INDEX_REGISTRY.items():
+        drift = diff_indexes(models, await db[collection].index_information())
+        if any(drift.values()):
+            report[collection] = drift
+    return report
+
+
+async def ensure_indexes(db) -> IndexReport:
+    """
+    Create every missing registry index (existing ones are left untouched, so this is safe on
+    every startup) and report the remaining drift. Changed or unknown indexes are never dropped
+    automatically – they are logged for an operator to resolve.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection, models in INDEX_REGISTRY.items():
+        drift = diff_indexes(models, await db[collection].index_information())
+        todo = [m for m in models if m.document["name"] in drift["missing"]]
+        if not todo:
+            continue
+        try:
+            created[collection] = await db[collection].create_indexes(todo)
+        except OperationFailure as e:
+            # e.g. an equivalent index under another name (IndexOptionsConflict)
+            logger.warning("Could not create indexes on %s: %s", collection, e)
+
+    drift_report = await index_drift(db)
+    for collection, drift in drift_report.items():
+        logger.warning("Index drift on %s: %s", collection, drift)
+    if created:
+        print(f"🗂️ Created indexes: {created}")
+    return {"created": created, "drift": drift_report}
+
+
+__all__ = ["INDEX_REGISTRY", "diff_indexes", "index_drift", "ensure_indexes", "IndexDrift", "IndexReport"]
@@ -0,0 +1,249 @@
+# app/core/loop_monitor.py
+"""
+Opt-in event-loop monitor (LOOP_MONITOR_ENABLED): loop lag sampling and blocking-callback reports.
+
+A heartbeat scheduled on the loop every LOOP_MONITOR_INTERVAL_MS measures how late it runs
+(eduflow_event_loop_lag_seconds). A watchdog thread notices when the heartbeat is overdue by more
+than LOOP_MONITOR_BLOCK_MS. While the loop is still stuck, it captures the loop thread's stack
+and the route / pipeline_run_id of the task that is running. Once the loop recovers, the
+episode is logged with that stack and counted in eduflow_event_loop_blocks_total{route}.
+
+With LOOP_MONITOR_PROFILE_DIR set, the watchdog samples the blocked stack every few ms and writes
+a collapsed-stack profile. Files are named block-<time>-<route>.folded, for flamegraph.pl or
+speedscope. At most one profile is written per LOOP_MONITOR_PROFILE_COOLDOWN_SECONDS.
+"""
+import asyncio
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter as FrameCounter, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = REGISTRY.histogram(
+    "eduflow_event_loop_lag_seconds", "Delay of the event-loop heartbeat behind its schedule.",
+)
+LOOP_BLOCKS = REGISTRY.counter(
+    "eduflow_event_loop_blocks_total", "Episodes where one callback blocked the event loop.", ["route"],
+)
+LOOP_BLOCK_SECONDS = REGISTRY.histogram(
+    "eduflow_event_loop_block_seconds", "Duration of event-loop blocking episodes.", ["route"],
+)
+
+# Stack sampling period while a blocking episode is profiled; max samples per profile
+PROFILE_SAMPLE_SECONDS = 0.005
+PROFILE_MAX_SAMPLES = 20_000
+RECENT_BLOCKS = 50
+
+# Labels of the task handling each request / pipeline run, readable from the watchdog thread
+# (contextvars of another thread's task are not reachable on Python < 3.12)
+_task_labels: "weakref.WeakKeyDictionary[asyncio.Task, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def label_current_task(**labels: Any) -> None:
+    """Attach route / pipeline_run_id to the running task for blocking reports (no-op outside a task)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return
+    if task is not None:
+        _task_labels.setdefault(task, {}).update(labels)
+
+
+def get_task_labels(task: Optional["asyncio.Task"]) -> Dict[str, Any]:
+    return dict(_task_labels.get(task, {})) if task is not None else {}
+
+
+def _route_of(labels: Dict[str, Any]) -> str:
+    scope = labels.get("scope")
+    if scope is not None:
+        route = scope.get("route")
+        return getattr(route, "path", None) or scope.get("path") or "unknown"
+    return labels.get("route") or "background"
+
+
+class LoopMonitorMiddleware:
+    """Pure ASGI middleware: labels each request task with its (route template) path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            # The scope itself: FastAPI adds the matched route to it once routing happened
+            label_current_task(scope=scope)
+        await self.app(scope, receive, send)
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = None,
+        block_threshold: float = None,
+        profile_dir: str = None,
+        profile_cooldown: float = None,
+    ):
+        self.interval = interval or settings.LOOP_MONITOR_INTERVAL_MS / 1000
+        self.block_threshold = block_threshold or settings.LOOP_MONITOR_BLOCK_MS / 1000
+        self.profile_dir = settings.LOOP_MONITOR_PROFILE_DIR if profile_dir is None else profile_dir
+        self.profile_cooldown = (settings.LOOP_MONITOR_PROFILE_COOLDOWN_SECONDS
+                                 if profile_cooldown is None else profile_cooldown)
+        self.recent: deque = deque(maxlen=RECENT_BLOCKS)
+        self.stats: Dict[str, float] = {"beats": 0, "blocks": 0, "profiles": 0, "max_lag_seconds": 0.0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expected = 0.0
+        self._last_beat = 0.0
+        self._episode: Optional[Dict[str, Any]] = None
+        self._last_profile = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- Loop side ----
+    def _beat(self) -> None:
+        now = time.perf_counter()
+        lag = max(0.0, now - self._expected)
+        LOOP_LAG.observe(lag)
+        self.stats["beats"] += 1
+        self.stats["max_lag_seconds"] = max(self.stats["max_lag_seconds"], lag)
+        episode, self._episode = self._episode, None
+        # Ignore an episode the watchdog raced in for a beat that already ran on time
+        if episode is not None and episode.pop("beat") == self._last_beat:
+            self._report(episode, lag)
+        self._last_beat = now
+        self._expected = now + self.interval
+        self._handle = self._loop.call_later(self.interval, self._beat)
+
+    def _report(self, episode: Dict[str, Any], lag: float) -> None:
+        episode["seconds"] = round(lag, 4)
+        route = episode["route"]
+        LOOP_BLOCKS.inc(route=route)
+        LOOP_BLOCK_SECONDS.observe(lag, route=route)
+        self.stats["blocks"] += 1
+        self.recent.append(episode)
+        logger.warning(
+            "🐢 Event loop blocked for %.0f ms (route=%s, pipeline_run_id=%s)\n%s",
+            lag * 1000, route, episode.get("pipeline_run_id"), episode["stack"],
+            extra={"details": {k: v for k, v in episode.items() if k != "stack"}},
+        )
+
+    # ---- Watchdog thread ----
+    def _loop_frame(self):
+        return sys._current_frames().get(self._loop_thread_id)
+
+    def _watch(self) -> None:
+        poll = min(self.block_threshold / 4, 0.025)
+        while not self._stop.wait(poll):
+            overdue = time.perf_counter() - self._expected
+            if overdue < self.block_threshold or self._episode is not None:
+                continue
+            beat = self._last_beat
+            frame = self._loop_frame()
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            labels = get_task_labels(task)
+            episode = {
+                "at": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+                "route": _route_of(labels) if task is not None else "loop",
+                "pipeline_run_id": labels.get("pipeline_run_id"),
+                "task": task.get_name() if task is not None else None,
+                "stack": "".join(traceback.format_stack(frame)),
+                "beat": beat,
+            }
+            self._episode = episode
+            if self.profile_dir and time.monotonic() - self._last_profile >= self.profile_cooldown:
+                self._last_profile = time.monotonic()
+                self._profile(episode, beat)
+
+    def _profile(self, episode: Dict[str, Any], beat: float) -> None:
+        """Sample the blocked stack until the loop beats again; write collapsed stacks."""
+        samples: FrameCounter = FrameCounter()
+        taken = 0
+        while self._last_beat == beat and taken < PROFILE_MAX_SAMPLES and not self._stop.is_set():
+            frame = self._loop_frame()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            samples[";".join(reversed(stack))] += 1
+            taken += 1
+            time.sleep(PROFILE_SAMPLE_SECONDS)
+        if not samples:
+            return
+        route = re.sub(r"[^A-Za-z0-9]+", "_", episode["route"]).strip("_")
+        name = f"block-{datetime.utcnow():%Y%m%dT%H%M%S%f}-{route}.folded"
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in samples.most_common())
+            episode["profile"] = path
+            self.stats["profiles"] += 1
+        except OSError as e:
+            print(f"❌ Loop monitor could not write profile {name}: {e}", file=sys.stderr)
+
+    # ---- Lifecycle ----
+    def start(self) -> None:
+        """Start on the running event loop (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._expected = self._last_beat + self.interval
+        self._handle = self._loop.call_later(self.interval, self._beat)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def recent_blocks(self) -> List[Dict[str, Any]]:
+        return list(self.recent)
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def install_loop_monitor() -> Optional[LoopMonitor]:
+    """Start the monitor on the running loop when LOOP_MONITOR_ENABLED (idempotent)."""
+    global _monitor
+    if not settings.LOOP_MONITOR_ENABLED:
+        return None
+    if _monitor is None:
+        _monitor = LoopMonitor()
+    _monitor.start()
+    return _monitor
+
+
+def shutdown_loop_monitor() -> None:
+    if _monitor is not None:
+        _monitor.stop()
+
+
+__all__ = [
+    "LoopMonitor", "LoopMonitorMiddleware", "install_loop_monitor", "shutdown_loop_monitor",
+    "label_current_task", "get_task_labels", "LOOP_LAG", "LOOP_BLOCKS", "LOOP_BLOCK_SECONDS",
+]
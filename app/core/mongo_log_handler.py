@@ -0,0 +1,168 @@
+# app/core/mongo_log_handler.py
+"""
+Buffered logging handler that persists records to general_logs.
+
+emit() only appends a small dict to a bounded in-memory queue (no I/O on the caller's path).
+A background task flushes the queue with insert_many when it reaches LOG_SINK_BATCH_SIZE or
+every LOG_SINK_FLUSH_SECONDS, and once more on shutdown. When the queue is full the drop
+policy decides what is lost ("drop_oldest" keeps the newest records); drops are counted.
+"""
+import asyncio
+import logging
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+# LogRecord attributes that are not user-supplied `extra=` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class MongoLogHandler(logging.Handler):
+    def __init__(
+        self,
+        writer: Optional[Callable] = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+        max_queue: int = None,
+        drop_policy: str = None,
+        level: int = logging.NOTSET,
+    ):
+        super().__init__(level)
+        self.writer = writer  # async callable(list[dict]); defaults to crud_general_logs.insert_general_logs
+        self.batch_size = batch_size or settings.LOG_SINK_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.LOG_SINK_FLUSH_SECONDS
+        self.max_queue = max_queue or settings.LOG_SINK_MAX_QUEUE
+        self.drop_policy = drop_policy or settings.LOG_SINK_DROP_POLICY
+        self.queue: deque = deque()
+        self.stats: Dict[str, int] = {"queued": 0, "written": 0, "dropped": 0, "failed": 0}
+        self._queue_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- Producer side (any thread, never blocks on I/O) ----
+    def to_document(self, record: logging.LogRecord) -> dict:
+        extra = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+        details = extra.pop("details", None) or {}
+        details.update(extra)
+        if record.exc_info:
+            details["exception"] = logging.Formatter().formatException(record.exc_info)
+        return {
+            "level": record.levelname,
+            "source": getattr(record, "source", None) or record.name,
+            "message": record.getMessage(),
+            "details": details or None,
+            "timestamp": datetime.utcfromtimestamp(record.created),
+        }
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            doc = self.to_document(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._queue_lock:
+            if len(self.queue) >= self.max_queue:
+                self.stats["dropped"] += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return
+                self.queue.popleft()
+            self.queue.append(doc)
+            self.stats["queued"] += 1
+            full = len(self.queue) >= self.batch_size
+        if full and self._loop is not None and self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # loop already closed; the shutdown flush picks the records up
+
+    # ---- Consumer side (event loop) ----
+    def _take_batch(self) -> List[dict]:
+        with self._queue_lock:
+            n = min(self.batch_size, len(self.queue))
+            return [self.queue.popleft() for _ in range(n)]
+
+    async def flush_async(self) -> int:
+        """Write everything queued so far; returns the number of records written."""
+        if self.writer is None:
+            from app.crud.crud_general_logs import insert_general_logs
+
+            self.writer = insert_general_logs
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return written
+            try:
+                await self.writer(batch)
+                written += len(batch)
+                self.stats["written"] += len(batch)
+            except Exception as e:
+                # Never log from here (would re-enter this handler); the batch is dropped
+                self.stats["failed"] += len(batch)
+                print(f"❌ Log sink write failed ({len(batch)} records): {e}", file=sys.stderr)
+                return written
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush_async()
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+
+    async def aclose(self) -> None:
+        """Stop the flusher and write whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_async()
+        self._loop = None
+
+
+_handler: Optional[MongoLogHandler] = None
+
+
+def install_mongo_log_handler(logger_name: str = "app") -> Optional[MongoLogHandler]:
+    """Attach the handler to the app's logger tree (idempotent) and start flushing."""
+    global _handler
+    if not settings.LOG_SINK_ENABLED:
+        return None
+    if _handler is None:
+        _handler = MongoLogHandler(level=logging.getLevelName(settings.LOG_SINK_LEVEL))
+        app_logger = logging.getLogger(logger_name)
+        app_logger.addHandler(_handler)
+        if app_logger.getEffectiveLevel() > _handler.level:
+            app_logger.setLevel(_handler.level)
+    _handler.start()
+    return _handler
+
+
+async def shutdown_mongo_log_handler() -> None:
+    if _handler is not None:
+        await _handler.aclose()
+
+
+__all__ = [
+    "MongoLogHandler", "install_mongo_log_handler", "shutdown_mongo_log_handler",
+    "DROP_OLDEST", "DROP_NEWEST",
+]
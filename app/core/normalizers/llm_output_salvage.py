@@ -0,0 +1,113 @@
+# app/core/normalizers/llm_output_salvage.py
+import json
+import logging
+import re
+from typing import Any, Dict, List, Tuple, Type, TypedDict, TypeVar
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.core.tracing import span
+from app.services.prompt_manager import load_prompt, render_prompt
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)```", re.DOTALL)
+
+# Repair prompt is small and only ever sees the broken items
+REPAIR_PROMPT = "data_agents/json_repair_prompt.yaml"
+
+
+class InvalidItem(TypedDict):
+    index: int
+    item: Any
+    error: str
+
+
+def extract_json(text: str) -> Any:
+    """
+    Pull the JSON payload out of an LLM reply: plain JSON, a ```json fenced block, or the
+    first balanced object/array embedded in prose. Raises ValueError if nothing parses.
+    """
+    if not isinstance(text, str):
+        raise ValueError("LLM output is not text")
+    stripped = text.strip()
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        pass
+
+    for block in _FENCE_RE.findall(stripped):
+        try:
+            return json.loads(block.strip())
+        except ValueError:
+            continue
+
+    decoder = json.JSONDecoder()
+    for i, ch in enumerate(stripped):
+        if ch in "{[":
+            try:
+                obj, _ = decoder.raw_decode(stripped, i)
+                return obj
+            except ValueError:
+                continue
+    raise ValueError("No JSON object found in LLM output")
+
+
+def _error_summary(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc']) or '<root>'}: {e['msg']}" for e in err.errors()[:5]
+    )
+
+
+def validate_items(items: List[Any], adapter: TypeAdapter) -> Tuple[List[Any], List[InvalidItem]]:
+    """Validate each item on its own; returns (valid models, invalid items with errors)."""
+    valid, invalid = [], []
+    for i, item in enumerate(items):
+        try:
+            valid.append(adapter.validate_python(item))
+        except ValidationError as e:
+            invalid.append({"index": i, "item": item, "error": _error_summary(e)})
+    return valid, invalid
+
+
+def parse_model(text: str, model: Type[M]) -> M:
+    """extract_json + validation of a single object model (tolerates fences/prose)."""
+    return model.model_validate(extract_json(text))
+
+
+async def repair_items(invalid: List[InvalidItem], schema: Dict[str, Any], llm) -> List[Any]:
+    """
+    One small LLM call that fixes only the invalid items against 'schema'.
+    Returns the repaired items (possibly fewer); [] on any failure.
+    """
+    if not invalid:
+        return []
+
+    rendered_user = render_prompt(REPAIR_PROMPT, {
+        "schema": json.dumps(schema, ensure_ascii=False),
+        "items": [
+            {"item": json.dumps(inv["item"], ensure_ascii=False), "error": inv["error"]} for inv in invalid
+        ],
+    })
+    try:
+        model = str(getattr(llm, "model_name", "") or "")
+        async with span("llm_call", kind="llm", agent="json_repair", model=model, items=len(invalid)) as s:
+            response = await llm.ainvoke([
+                SystemMessage(content=load_prompt(REPAIR_PROMPT)["system"]),
+                HumanMessage(content=rendered_user),
+            ])
+            s.record_usage(response)
+        repaired = extract_json(response.content)
+    except Exception:
+        logger.warning("Repair call failed; dropping %d invalid item(s).", len(invalid), exc_info=True)
+        return []
+
+    if isinstance(repaired, dict):
+        repaired = repaired.get("items", [repaired])
+    return repaired if isinstance(repaired, list) else []
+
+
+__all__ = ["extract_json", "validate_items", "parse_model", "repair_items", "InvalidItem"]
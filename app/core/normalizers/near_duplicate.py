@@ -0,0 +1,165 @@
+# app/core/normalizers/near_duplicate.py
+import hashlib
+import unicodedata
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+_EMPTY_BIN = (1 << 64) - 1
+# Offset added per hop when densifying empty bins, keeps borrowed values distinguishable
+_DENSIFY_OFFSET = 1 << 40
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize Hebrew/English text for fuzzy comparison.
+
+    Steps:
+      - NFD-decompose and drop non-spacing marks (Hebrew niqqud/cantillation, Latin accents).
+      - Replace punctuation and symbols (incl. maqaf, geresh, gershayim) with spaces.
+      - Casefold and collapse whitespace.
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFD", text)
+    out = []
+    for ch in decomposed:
+        cat = unicodedata.category(ch)
+        if cat == "Mn":
+            continue
+        if cat[0] in ("P", "S") or ch.isspace():
+            out.append(" ")
+        else:
+            out.append(ch)
+    return " ".join("".join(out).casefold().split())
+
+
+def shingles(text: str, size: int = 4) -> FrozenSet[str]:
+    """
+    Character shingles (k-grams) of the normalized text.
+    Texts shorter than 'size' yield a single shingle so they still compare exactly.
+    """
+    norm = normalize_text(text)
+    if not norm:
+        return frozenset()
+    if len(norm) <= size:
+        return frozenset([norm])
+    return frozenset(norm[i:i + size] for i in range(len(norm) - size + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH banding index for near-duplicate question stems.
+
+    Signatures use one-permutation MinHash (each shingle is hashed once and binned,
+    empty bins are filled by rotation densification), so computing a signature is
+    O(|shingles| + num_perm) rather than O(|shingles| * num_perm).
+
+    - 'add' and 'query' cost is independent of index size (amortized O(1) in the
+      number of indexed stems).
+    - LSH buckets only propose candidates; each candidate is confirmed with exact
+      Jaccard similarity on the stored shingle sets against 'threshold'.
+
+    With the defaults (64 bins, 16 bands of 4 rows) pairs with Jaccard >= ~0.5 are very
+    likely to collide in at least one band, so thresholds in the 0.6–0.9 range are
+    recalled reliably.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 4,
+        seed: int = 1,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0.0, 1.0]")
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._salt = seed.to_bytes(8, "big", signed=False)
+
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+        self._shingles: Dict[Hashable, FrozenSet[str]] = {}
+
+    # ---- internals ----
+    def _hash_shingle(self, shingle: str) -> int:
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8, salt=self._salt).digest()
+        return int.from_bytes(digest, "big")
+
+    def _signature(self, sh: FrozenSet[str]) -> List[int]:
+        k = self.num_perm
+        sig = [_EMPTY_BIN] * k
+        for s in sh:
+            h = self._hash_shingle(s)
+            b, v = h % k, h // k
+            if v < sig[b]:
+                sig[b] = v
+
+        # Rotation densification: an empty bin borrows from the next non-empty bin
+        if _EMPTY_BIN in sig:
+            out = list(sig)
+            for i in range(k):
+                if sig[i] != _EMPTY_BIN:
+                    continue
+                hop = 1
+                while sig[(i + hop) % k] == _EMPTY_BIN:
+                    hop += 1
+                out[i] = sig[(i + hop) % k] + hop * _DENSIFY_OFFSET
+            sig = out
+        return sig
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        r = self.rows
+        return [tuple(signature[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    # ---- public API ----
+    def add(self, key: Hashable, text: str) -> None:
+        """Index 'text' under 'key'. Empty texts are ignored; re-adding a key is a no-op."""
+        if key in self._shingles:
+            return
+        sh = shingles(text, self.shingle_size)
+        if not sh:
+            return
+        self._shingles[key] = sh
+        for band, band_key in enumerate(self._band_keys(self._signature(sh))):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, text: str) -> List[Tuple[Hashable, float]]:
+        """Return (key, jaccard) for indexed entries at or above 'threshold', best match first."""
+        sh = shingles(text, self.shingle_size)
+        if not sh or not self._shingles:
+            return []
+
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(self._signature(sh))):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            sim = jaccard(sh, self._shingles[key])
+            if sim >= self.threshold:
+                matches.append((key, sim))
+        matches.sort(key=lambda kv: kv[1], reverse=True)
+        return matches
+
+    def find_duplicate(self, text: str) -> Optional[Hashable]:
+        """Key of the closest indexed near-duplicate of 'text', or None."""
+        matches = self.query(text)
+        return matches[0][0] if matches else None
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shingles
@@ -1,4 +1,5 @@
 # app/core/pipeline/stage2_pipeline.py
+import logging
 from typing import List
 from types import SimpleNamespace
 
@@ -12,16 +13,25 @@ from app.schemas.stage2 import (
 )
 from app.core.agents.text_editor_agent import run_text_editor_agent, TextEditorInput
 from app.core.agents.question_generator_agent import run_question_generator_agent, QuestionGenInput
-from app.core.agents.bloom_level_verifier_agent import run_bloom_level_verifier_agent
-from app.core.agents.difficulty_level_verifier_agent import run_difficulty_level_verifier_agent
 from app.core.agents.grounding_verifier_agent import run_grounding_verifier_agent
-from app.crud.crud_block import bulk_upsert_blocks  
+from app.crud.crud_block import bulk_upsert_blocks, bulk_upsert_blocks_report
+from app.core.config import settings
+from app.core.tracing import count_cache, count_outcome, run_context, span
 from app.utils.idempotency import new_pipeline_run_id
 from app.core.normalizers.question_normalizer import (
     normalize_mcq,
     shuffle_mcq_choices,
-    is_dup_by_stem,
 )
+from app.core.normalizers.near_duplicate import NearDuplicateIndex
+from app.core.services.question_bank import get_question_bank, compact_stems, remember_saved_stems
+from app.core.services.run_ledger import record_run
+from app.core.verifiers.cascade import verify_bloom_level, verify_difficulty_level
+from app.core.verifiers.grounding_precheck import ChunkIndex, precheck_grounding, reconcile_llm_grounding
+
+logger = logging.getLogger(__name__)
+
+# Pseudo-chunk used when only a freePrompt is given; lexical grounding is meaningless for it
+FREE_PROMPT_CHUNK_ID = "free_prompt_ctx"
 
 
 async def run_stage2(req: Stage2Request) -> Stage2Result:
@@ -31,12 +41,41 @@ async def run_stage2(req: Stage2Request) -> Stage2Result:
     if req.pipeline_run_id is None:
         req.pipeline_run_id = new_pipeline_run_id()
 
-    if req.mode == "edit_text":
-        return await _run_edit_text(req)
-    elif req.mode == "generate_questions":
-        return await _run_generate_questions(req)
-    else:
-        raise ValueError("Invalid mode")
+    meta = _run_meta(req)
+    with run_context(req.pipeline_run_id):
+        try:
+            async with span("stage2", kind="pipeline", mode=req.mode) as s:
+                if req.mode == "edit_text":
+                    return await _run_edit_text(req)
+                elif req.mode == "generate_questions":
+                    result = await _run_generate_questions(req)
+                    attempts = (result.summary or {}).get("attempts", 0)
+                    if attempts > 1:
+                        s.retry(attempts - 1)
+                    meta["attempts"] = attempts
+                    s.set(accepted=len(result.generated or []), requested=(result.summary or {}).get("requested"))
+                    return result
+                else:
+                    raise ValueError("Invalid mode")
+        finally:
+            # One pipeline_runs ledger document per run, success or failure
+            await record_run(req.pipeline_run_id, "stage2", meta)
+
+
+def _run_meta(req: Stage2Request) -> dict:
+    """Request dimensions the pipeline_runs analytics group by."""
+    question_type = req.question_types[0] if req.question_types else None
+    return {
+        "mode": req.mode,
+        "topicName": req.topicName,
+        "subject": req.subject,
+        "gradeLevel": req.gradeLevel,
+        "questionType": getattr(question_type, "value", question_type),
+        "bloomLevel": getattr(req.cognitive_target, "value", req.cognitive_target),
+        "difficulty": getattr(req.target_difficulty, "value", req.target_difficulty),
+        "requested": req.num_questions,
+        "courseOutlineId": req.courseOutlineId,
+    }
 
 
 async def _run_edit_text(req: Stage2Request) -> Stage2Result:
@@ -74,8 +113,8 @@ async def _run_edit_text(req: Stage2Request) -> Stage2Result:
             "pageId": req.pageId,
             "pipeline_run_id": req.pipeline_run_id,
         }
-        saved = await bulk_upsert_blocks([block_dict])
-        saved_blocks = [{"_id": b["_id"], "blockType": b["blockType"]} for b in saved]
+        async with span("save_blocks", kind="db", blocks=1):
+            saved_blocks = await bulk_upsert_blocks([block_dict])
 
     return Stage2Result(
         mode=req.mode,
@@ -276,7 +315,9 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
     Generate questions:
       - Ensure 'num_questions' are collected using iterative calls.
       - Validate/normalize MCQs, shuffle choices, and keep 'correct_index' accurate.
-      - De-duplicate by 'stem'.
+      - De-duplicate by 'stem' (near-duplicates via MinHash/LSH, before any verifier call),
+        both within this run and against questions already stored for the outline/lesson/page.
+      - Run a local lexical grounding pre-check; clear failures never reach the LLM.
       - Run multi-agent verification (Bloom, difficulty, grounding).
       - Only accept questions that pass validation; optionally save as blocks.
     """
@@ -284,7 +325,7 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
     chunks_iter = list(req.chunks) if req.chunks else []
     if (not chunks_iter) and req.freePrompt and req.freePrompt.strip():
         pseudo_text = f"Question topic: {req.freePrompt.strip()}"
-        pseudo = SimpleNamespace(chunk_id="free_prompt_ctx", text=pseudo_text)
+        pseudo = SimpleNamespace(chunk_id=FREE_PROMPT_CHUNK_ID, text=pseudo_text)
         chunks_iter = [pseudo]
         req.chunks = [{"chunk_id": pseudo.chunk_id, "text": pseudo.text}]
     if not chunks_iter:
@@ -307,8 +348,16 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
     attempts = 0
     MAX_ATTEMPTS = max(3, target_n * 2)  # safety cap to avoid endless loops
 
-    # Memory for rejected stems – avoid generating the same bad question again
-    bad_stems = set()
+    # Near-duplicate indexes: accepted stems, and stems rejected by validators
+    # (so a reworded copy of a bad question never reaches the verifiers again)
+    accepted_index = NearDuplicateIndex(threshold=settings.NEAR_DUP_THRESHOLD)
+    rejected_index = NearDuplicateIndex(threshold=settings.NEAR_DUP_THRESHOLD)
+
+    # Question bank: stems already stored in 'blocks' for this scope (lazy, cached)
+    bank = await get_question_bank(req.courseOutlineId, req.lessonId, req.pageId)
+
+    # Lexical index per chunk, built once and reused across attempts/candidates
+    chunk_indexes = {}
 
     # Outer loop: keep asking until we collect at least 'target_n' or hit attempt cap
     while len(collected) < target_n and attempts < MAX_ATTEMPTS:
@@ -323,7 +372,13 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
             try:
                 req.chunks = [{"chunk_id": getattr(chunk, "chunk_id"), "text": getattr(chunk, "text")}]
                 req.num_questions = remaining
-                response = await run_question_generator_agent(req)  # expected shape: {"questions": [...]}
+                covered = compact_stems(
+                    [gq.question.get("stem", "") for gq in reversed(collected)]
+                    + (bank.covered_stems() if bank else [])
+                )
+                async with span("generate_batch", kind="agent", agent="question_generator", attempt=attempts) as s:
+                    response = await run_question_generator_agent(req, covered_stems=covered)  # expected shape: {"questions": [...]}
+                    s.set(received=len(response.get("questions", [])))
             finally:
                 req.chunks = original_chunks
                 req.num_questions = original_num
@@ -334,15 +389,17 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
                     try:
                         q = q.dict()
                     except Exception:
-                        print("❌ Cannot convert to dict:", type(q))
+                        logger.debug("❌ Cannot convert to dict: %s", type(q))
+                        count_outcome("stage2", "rejected", "not_a_dict")
                         continue
 
                 q["type"] = q.get("type", qtype_value).lower()
-                print("🔍 Type detected:", q["type"])
+                logger.debug("🔍 Type detected: %s", q["type"])
 
                 # Support MCQ, open, matching
                 if q["type"] not in ["mcq", "open", "matching"]:
-                    print("⛔ Unsupported type:", q["type"])
+                    logger.debug("⛔ Unsupported type: %s", q["type"])
+                    count_outcome("stage2", "rejected", "unsupported_type")
                     continue
 
                 if q["type"] == "mcq":
@@ -350,42 +407,89 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
                         q = normalize_mcq(q)
                         shuffle_mcq_choices(q)
                     except Exception as e:
-                        print("⚠️ Malformed MCQ:", e)
+                        logger.debug("⚠️ Malformed MCQ: %s", e)
+                        count_outcome("stage2", "rejected", "malformed_mcq")
                         continue  # Skip malformed MCQ
 
                 stem = q.get("stem", "").strip()
                 if not stem:
-                    print("⚠️ Missing stem, skipping question")
+                    logger.debug("⚠️ Missing stem, skipping question")
+                    count_outcome("stage2", "rejected", "missing_stem")
                     continue
 
                 # Anti-dup by stem vs. already accepted questions
-                if any(is_dup_by_stem(q, gq.question) for gq in collected):
-                    print("🔁 Duplicate stem vs collected:", stem)
+                if accepted_index.find_duplicate(stem) is not None:
+                    logger.debug("🔁 Duplicate stem vs collected: %s", stem)
+                    count_outcome("stage2", "rejected", "duplicate")
                     continue
 
                 # Also avoid stems that were previously rejected by validators
-                if stem in bad_stems:
-                    print("♻️ Previously rejected stem, skipping:", stem)
+                if rejected_index.find_duplicate(stem) is not None:
+                    logger.debug("♻️ Previously rejected stem, skipping: %s", stem)
+                    count_outcome("stage2", "rejected", "previously_rejected")
+                    continue
+
+                # ...and stems already stored for this outline/lesson/page in earlier runs
+                if bank and bank.find_known(stem) is not None:
+                    logger.debug("📚 Stem already in question bank, skipping: %s", stem)
+                    count_outcome("stage2", "rejected", "in_question_bank")
                     continue
 
-                # Optional verifications
-                cog_out = await run_bloom_level_verifier_agent({
-                    "question": stem,
-                    "bloom_level": getattr(req.cognitive_target, "value", str(req.cognitive_target)),
-                }) if req.cognitive_target else {}
-
-                diff_out = await run_difficulty_level_verifier_agent({
-                    "question": stem,
-                    "text": getattr(chunk, "text"),
-                    "difficulty_level": getattr(req.target_difficulty, "value", str(req.target_difficulty)),
-                }) if req.target_difficulty else {}
-
-                grounding_out = await run_grounding_verifier_agent({
-                    "question": stem,
-                    "answer": q.get("choices", [None])[q.get("correct_index", 0)] if q["type"] == "mcq" else "",
-                    "explanation": q.get("explanation", ""),
-                    "chunk": getattr(chunk, "text"),
-                })
+                # Cheap lexical grounding pre-check (microseconds) before any LLM verifier
+                chunk_id = getattr(chunk, "chunk_id")
+                chunk_index = chunk_indexes.get(chunk_id)
+                count_cache("chunk_index", hit=chunk_index is not None)
+                if chunk_index is None:
+                    chunk_index = chunk_indexes[chunk_id] = ChunkIndex(getattr(chunk, "text"))
+
+                if q["type"] == "mcq":
+                    answer = q.get("choices", [None])[q.get("correct_index", 0)] or ""
+                else:
+                    answer = q.get("expected_answer", "") or ""
+
+                precheck = (
+                    precheck_grounding(chunk_index, answer, q.get("explanation", "") or "")
+                    if chunk_id != FREE_PROMPT_CHUNK_ID
+                    else None
+                )
+                if precheck and precheck["decision"] == "reject":
+                    rejected_index.add(len(rejected_index), stem)
+                    logger.debug("❌ Rejected by grounding pre-check: %s", stem, extra={"details": {"stem": stem, **precheck}})
+                    count_outcome("stage2", "rejected", "grounding_precheck")
+                    continue
+
+                # Optional verifications (heuristic first, LLM only when not confident)
+                cog_out = await verify_bloom_level(
+                    stem,
+                    getattr(req.cognitive_target, "value", str(req.cognitive_target)),
+                ) if req.cognitive_target else {}
+
+                diff_out = await verify_difficulty_level(
+                    stem,
+                    getattr(chunk, "text"),
+                    getattr(req.target_difficulty, "value", str(req.target_difficulty)),
+                    answer=answer,
+                    chunk_index=chunk_index if chunk_id != FREE_PROMPT_CHUNK_ID else None,
+                ) if req.target_difficulty else {}
+
+                if precheck:
+                    count_outcome("grounding_precheck", precheck["decision"])
+                if precheck and precheck["decision"] == "accept":
+                    grounding_out = {
+                        "status": "ok",
+                        "grounded": True,
+                        "grounding_score": precheck["overlap"],
+                        "evidence_spans": precheck["evidence_spans"],
+                        "justification": "lexical_precheck",
+                    }
+                else:
+                    grounding_out = await run_grounding_verifier_agent({
+                        "question": stem,
+                        "answer": answer if q["type"] == "mcq" else "",
+                        "explanation": q.get("explanation", ""),
+                        "chunk": getattr(chunk, "text"),
+                    })
+                    grounding_out = reconcile_llm_grounding(grounding_out, chunk_index)
 
                 # Decide if this question passes the validation stack
                 bloom_ok = True
@@ -404,20 +508,25 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
 
                 if not all_ok:
                     # This is where the reject-loop logic kicks in
-                    bad_stems.add(stem)
-                    print(
-                        "❌ Rejected by validators:",
-                        {
+                    rejected_index.add(len(rejected_index), stem)
+                    logger.debug(
+                        "❌ Rejected by validators: %s",
+                        stem,
+                        extra={"details": {
                             "stem": stem,
                             "bloom_ok": bloom_ok,
                             "difficulty_ok": difficulty_ok,
                             "grounding_ok": grounding_ok,
-                        },
+                        }},
                     )
+                    failed = [n for n, ok in (("bloom", bloom_ok), ("difficulty", difficulty_ok), ("grounding", grounding_ok)) if not ok]
+                    count_outcome("stage2", "rejected", "+".join(failed))
                     # Don't collect this question – let the loop request another one
                     continue
 
                 # If all checks passed → accept question
+                count_outcome("stage2", "accepted")
+                accepted_index.add(len(collected), stem)
                 collected.append(
                     GeneratedQuestion(
                         question=q,
@@ -447,6 +556,7 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
 
     # Optionally save collected questions as blocks
     saved_blocks: List[BlockRef] = []
+    write_stats = None
     if req.save_to_blocks and collected:
         blocks = []
         for gq in collected:
@@ -475,11 +585,14 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
             }
             blocks.append(block)
 
-        saved = await bulk_upsert_blocks(blocks)
-        saved_blocks = [
-            {"_id": saved[i]["_id"], "blockType": blocks[i]["blockType"]}
-            for i in range(len(blocks))
-        ]
+        async with span("save_blocks", kind="db", blocks=len(blocks)):
+            report = await bulk_upsert_blocks_report(blocks)
+        saved_blocks = report["refs"]
+        write_stats = {k: report[k] for k in ("inserted", "changed", "unchanged")}
+        remember_saved_stems(
+            [gq.question.get("stem", "") for gq in collected],
+            req.courseOutlineId, req.lessonId, req.pageId,
+        )
 
     return Stage2Result(
         mode=req.mode,
@@ -490,5 +603,6 @@ async def _run_generate_questions(req: Stage2Request) -> Stage2Result:
             "total_questions": len(collected),
             "requested": target_n,
             "attempts": attempts,
+            "saved": write_stats,
         },
     )
@@ -8,7 +8,10 @@ from urllib.parse import quote
 from pymongo.errors import DuplicateKeyError
 
 from app.schemas.input_model import Stage1Input
-from app.utils import generate_cache_key, current_timestamp
+from app.utils import generate_cache_key, current_timestamp, content_hash
+from app.utils.idempotency import new_pipeline_run_id
+from app.core.tracing import run_context, span
+from app.core.services.run_ledger import record_run
 from app.services.fetchers.wikipedia_fetcher import fetch_wikipedia_summary
 from app.services.fetchers.perplexity_fetcher import fetch_perplexity_summary
 from app.services.fetchers.file_processor import process_uploaded_file
@@ -93,6 +96,23 @@ def build_pedagogical_analysis(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 
 async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] = None) -> str:
+    # Every span below (agents, fetchers, save) is correlated under one stage1 run id
+    run_id = new_pipeline_run_id("stage1")
+    with run_context(run_id):
+        try:
+            async with span("stage1", kind="pipeline", topic=inputs.topicName):
+                return await _run_stage_1(inputs, uploaded_files)
+        finally:
+            await record_run(run_id, "stage1", {
+                "topicName": inputs.topicName,
+                "subject": inputs.subject,
+                "gradeLevel": inputs.gradeLevel,
+                "generationScope": inputs.generationScope,
+                "uploadedFiles": len(uploaded_files or []),
+            })
+
+
+async def _run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] = None) -> str:
     logger.info("🚀 Starting Stage 1: Initial Content Corpus Acquisition")
 
     # Step 1: Course Scoping (lesson titles)
@@ -101,7 +121,8 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
     if should_scope:
         try:
             logger.info("📚 [CourseScopingAgent] Proposing lesson titles...")
-            lesson_titles = await run_course_scoping_agent(inputs)
+            async with span("course_scoping", kind="agent", agent="course_scoping"):
+                lesson_titles = await run_course_scoping_agent(inputs)
             lesson_titles = [t.strip() for t in (lesson_titles or []) if t and t.strip()]
             logger.info(f"✅ Lesson titles ({len(lesson_titles)}): {lesson_titles}")
         except Exception:
@@ -114,7 +135,8 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
     wiki_url   = f"https://he.wikipedia.org/wiki/{wiki_slug}"
     try:
         logger.info("🌐 Fetching from Wikipedia...")
-        wiki_summary = fetch_wikipedia_summary(topic_clean) or "No Wikipedia summary found."
+        async with span("wikipedia", kind="fetch"):
+            wiki_summary = fetch_wikipedia_summary(topic_clean) or "No Wikipedia summary found."
         wiki_data = normalize_chunk({
             "sourceType": "Wikipedia",
             "sourceQuery": topic_clean,
@@ -137,7 +159,8 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
     if inputs.usePerplexity or not uploaded_files:
         try:
             logger.info("🔎 [PerplexityAgent] Generating summary via LLM...")
-            raw = await fetch_perplexity_summary(topic=inputs.topicName, subject=inputs.subject, lang="he")
+            async with span("perplexity", kind="fetch"):
+                raw = await fetch_perplexity_summary(topic=inputs.topicName, subject=inputs.subject, lang="he")
             if isinstance(raw, dict):
                 perplexity_data = normalize_chunk(raw, default_source_type="Perplexity_Search")
                 if perplexity_data.get("sourceType") in (None, "", "Perplexity"):
@@ -165,7 +188,8 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
         try:
             logger.info("📂 Processing uploaded files...")
             tasks = [asyncio.to_thread(process_uploaded_file, path) for path in uploaded_files]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            async with span("uploaded_files", kind="fetch", files=len(uploaded_files)):
+                results = await asyncio.gather(*tasks, return_exceptions=True)
             for r in results:
                 if isinstance(r, Exception):
                     logger.exception("❌ Failed processing file", exc_info=r)
@@ -180,7 +204,8 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
     context_result = ""
     try:
         logger.info("🧠 [ContextualAgent] Adapting content to context...")
-        context_result = await run_contextual_agent(inputs)
+        async with span("contextual", kind="agent", agent="contextual"):
+            context_result = await run_contextual_agent(inputs)
         contextual_data = normalize_chunk({
             "sourceType": "ContextualCourseAgent",
             "retrievedAt": current_timestamp(),
@@ -209,7 +234,8 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
                     lessonIndex=idx,
                     pedagogicalProfile=context_result or {}
                 )
-                result = await run_lesson_content_agent(lesson_input)
+                async with span("lesson_content", kind="agent", agent="lesson_content", lesson=idx):
+                    result = await run_lesson_content_agent(lesson_input)
                 if isinstance(result, dict):
                     lesson_contents.append(result)
                     logger.info(f"✅ Lesson {idx} generated: {title}")
@@ -296,26 +322,35 @@ async def run_stage_1(inputs: Stage1Input, uploaded_files: Optional[List[str]] =
 
     try:
         logger.info("💾 Upsert by cacheKey (idempotent)...")
-        existing = await ContentCorpus.find_one(
-            ContentCorpus.cacheKey == document.get("cacheKey", "")
-        )
-        doc = ContentCorpus(**document)
-
-        if existing:
-            doc.id = existing.id
-            await doc.replace()
-        else:
-            try:
-                await doc.insert()
-            except DuplicateKeyError:
-                existing = await ContentCorpus.find_one(
-                    ContentCorpus.cacheKey == document["cacheKey"]
-                )
-                if existing:
-                    doc.id = existing.id
-                    await doc.replace()
-                else:
-                    raise
+        async with span("save_corpus", kind="db") as save:
+            existing = await ContentCorpus.find_one(
+                ContentCorpus.cacheKey == document.get("cacheKey", "")
+            )
+            document["contentHash"] = content_hash(document)
+            doc = ContentCorpus(**document)
+
+            if existing and existing.contentHash == document["contentHash"]:
+                logger.info("📄 Corpus unchanged (same contentHash), write skipped.")
+                save.set(write="skipped")
+                return str(existing.id)
+            if existing:
+                doc.id = existing.id
+                await doc.replace()
+                save.set(write="replaced")
+            else:
+                try:
+                    await doc.insert()
+                    save.set(write="inserted")
+                except DuplicateKeyError:
+                    existing = await ContentCorpus.find_one(
+                        ContentCorpus.cacheKey == document["cacheKey"]
+                    )
+                    if existing:
+                        doc.id = existing.id
+                        await doc.replace()
+                        save.set(write="replaced")
+                    else:
+                        raise
 
         logger.info(f"✅ Document upserted with _id: {doc.id}")
         return str(doc.id)
@@ -5,23 +5,24 @@ from typing import Optional, Dict, Any
 
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
 
-from app.services.prompt_manager import load_prompt, render_user_prompt
+from app.core.config import settings
+from app.services.model_router import get_chat_model
+from app.services.prompt_manager import get_prompt, render_prompt
 from app.services.fetchers.wikipedia_fetcher import fetch_wikipedia_summary
 from dotenv import load_dotenv
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Load prompt once at module level
+# Prompt is loaded from the registry on first use
 PROMPT_PATH = "wiki/expand_article.yaml"
-prompt_data = load_prompt(PROMPT_PATH)
-system_tpl = prompt_data["system"]
-user_tpl = prompt_data["user"]
 
 # Setup LLM
-llm = ChatOpenAI(model="gpt-4.1", temperature=0.3)
+def get_llm():
+    """Chat model for this agent, created on first use (importing the module needs no API key)."""
+    return get_chat_model(settings.MODEL_ROUTER_STRONG_MODEL, 0.3)
+
 parser = StrOutputParser()
 
 
@@ -51,13 +52,13 @@ async def run_wiki_expand_pipeline(
     }
 
     messages = [
-        SystemMessage(content=system_tpl),
-        HumanMessage(content=render_user_prompt(user_tpl, context)),
+        SystemMessage(content=get_prompt(PROMPT_PATH).system),
+        HumanMessage(content=render_prompt(PROMPT_PATH, context)),
     ]
 
     try:
         # Step 3 – Call LLM
-        response = await llm.ainvoke(messages)
+        response = await get_llm().ainvoke(messages)
         response_str = response.content.strip()
 
         # Step 4 – Parse JSON response
@@ -0,0 +1,248 @@
+# app/core/request_profiler.py
+"""
+On-demand profiling of single requests (PROFILING_TOKEN).
+
+A request carrying the token runs under a sampling profiler plus a tracemalloc snapshot diff. The
+token is read from the X-Profile-Token header or ?profile=<token>. The profile is stored under the
+request's pipeline_run_id, or a generated req_* id when the request started no run, and returned in
+the X-Profile-Id response header. Fetch it from /api/v1/debug/profiles/{id}. The folded stacks
+suit flamegraph.pl and speedscope.
+
+The sampler thread looks at the request's own task every PROFILING_SAMPLE_MS:
+- running: the loop thread's stack, trimmed to the task's coroutine.
+- suspended: its await chain, ending in "[await] <awaitable>".
+That gives wall-clock attribution, including time spent waiting on the LLM or Mongo.
+
+The allocation report gives the traced peak and the top lines by memory still held at the end of
+the request (caches, leaks). tracemalloc traces the whole process, so concurrent requests show up too.
+
+Requests without the token pay one header scan. The middleware is only installed when a token is set.
+"""
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter as FrameCounter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+from app.core.loop_monitor import get_task_labels
+
+TOKEN_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+TRACEMALLOC_FRAMES = 10
+MAX_SAMPLES = 100_000
+
+_profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _await_stack(coro) -> List[str]:
+    """Frames of a suspended coroutine chain, outermost first, ending with what it waits on."""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        stack.append(_frame_name(frame))
+        awaited = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+        if awaited is None or not hasattr(awaited, "cr_frame") and not hasattr(awaited, "gi_frame"):
+            stack.append(f"[await] {type(awaited).__name__ if awaited is not None else 'scheduler'}")
+            break
+        coro = awaited
+    return stack
+
+
+class RequestSampler:
+    """Samples one task's stack from a background thread until stop()."""
+
+    def __init__(self, task: asyncio.Task, interval: float = None):
+        self.task = task
+        self.interval = interval or settings.PROFILING_SAMPLE_MS / 1000
+        self.loop = task.get_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.root_code = getattr(task.get_coro(), "cr_code", None)
+        self.samples: FrameCounter = FrameCounter()
+        self.counts = {"running": 0, "awaiting": 0}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _running_stack(self) -> Optional[List[str]]:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(frame)
+            if frame.f_code is self.root_code:
+                break  # drop the event-loop machinery above the task
+            frame = frame.f_back
+        return [_frame_name(f) for f in reversed(stack)] or None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval) and sum(self.counts.values()) < MAX_SAMPLES:
+            try:
+                if asyncio.current_task(self.loop) is self.task:
+                    stack, state = self._running_stack(), "running"
+                else:
+                    stack, state = _await_stack(self.task.get_coro()), "awaiting"
+            except (RuntimeError, ValueError):  # the loop thread moved on mid-walk
+                continue
+            if stack:
+                self.samples[";".join(stack)] += 1
+                self.counts[state] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+# ---- tracemalloc (shared by concurrent profiled requests) ----
+def _tracemalloc_begin() -> tracemalloc.Snapshot:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+    return tracemalloc.take_snapshot()
+
+
+def _tracemalloc_end(before: tracemalloc.Snapshot, top: int) -> Dict[str, Any]:
+    global _tracemalloc_users, _tracemalloc_owned
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    return {
+        "peakKiB": round(peak / 1024, 1),
+        "top": [{
+            "where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "sizeDiffKiB": round(stat.size_diff / 1024, 1),
+            "sizeKiB": round(stat.size / 1024, 1),
+            "countDiff": stat.count_diff,
+        } for stat in diff[:top]],
+    }
+
+
+# ---- Store ----
+def _store(profile: Dict[str, Any]) -> None:
+    _profiles.pop(profile["id"], None)
+    _profiles[profile["id"]] = profile
+    while len(_profiles) > settings.PROFILING_MAX_PROFILES:
+        _profiles.popitem(last=False)
+
+
+def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    return _profiles.get(profile_id)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    return [{k: v for k, v in p.items() if k not in ("folded", "allocations")} for p in reversed(_profiles.values())]
+
+
+def _utf8(value: str) -> bytes:
+    return value.encode("utf-8", "surrogatepass")  # lossless even for undecodable input
+
+
+def _token_matches(given: bytes, token: str) -> bool:
+    # Compare bytes: compare_digest raises TypeError on non-ASCII str input
+    return hmac.compare_digest(given, _utf8(token))
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    return bool(settings.PROFILING_TOKEN) and bool(token) and _token_matches(_utf8(token), settings.PROFILING_TOKEN)
+
+
+# ---- Middleware ----
+class ProfilingMiddleware:
+    """Pure ASGI middleware; profiles only requests that present PROFILING_TOKEN."""
+
+    def __init__(self, app, token: str = None):
+        self.app = app
+        self.token = token or settings.PROFILING_TOKEN
+
+    def _triggered(self, scope) -> bool:
+        if "/debug/profiles" in scope.get("path", ""):
+            return False  # reading profiles must not evict them with profiles of the read
+        for name, value in scope.get("headers") or ():
+            if name == TOKEN_HEADER:
+                return _token_matches(value, self.token)
+        query = scope.get("query_string") or b""
+        if b"profile=" in query:
+            values = parse_qs(query.decode("latin-1"), encoding="utf-8", errors="surrogateescape").get("profile") or [""]
+            return _token_matches(_utf8(values[0]), self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.token or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        sampler = RequestSampler(task)
+        before = _tracemalloc_begin()
+        started_at, started = datetime.utcnow(), time.perf_counter()
+        result: Dict[str, Any] = {"status": None, "id": None}
+
+        def profile_id() -> str:
+            if result["id"] is None:
+                result["id"] = get_task_labels(task).get("pipeline_run_id") or f"req_{uuid.uuid4().hex[:16]}"
+            return result["id"]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                result["status"] = message["status"]
+                message = dict(message, headers=list(message.get("headers") or []) + [
+                    (PROFILE_ID_HEADER, profile_id().encode("latin-1"))
+                ])
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            _store({
+                "id": profile_id(),
+                "pipeline_run_id": get_task_labels(task).get("pipeline_run_id"),
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "status": result["status"],
+                "startedAt": started_at.isoformat(timespec="milliseconds") + "Z",
+                "durationSeconds": round(duration, 4),
+                "sampleIntervalMs": sampler.interval * 1000,
+                "samples": dict(sampler.counts),
+                "allocations": _tracemalloc_end(before, settings.PROFILING_TOP_ALLOCATIONS),
+                "folded": sampler.folded(),
+            })
+
+
+__all__ = [
+    "ProfilingMiddleware", "RequestSampler", "get_profile", "list_profiles", "is_authorized",
+    "TOKEN_HEADER", "PROFILE_ID_HEADER",
+]
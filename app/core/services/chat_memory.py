@@ -0,0 +1,166 @@
+# app/core/services/chat_memory.py
+"""
+Token-budgeted conversational memory.
+
+Model context for a chat turn = system prompt + rolling summary of older turns + as many recent
+messages as fit the budget + the new user message. The summary is cached on the session header
+(summary / summarizedCount). The oldest unsummarized messages are folded into it, at most
+CHAT_MEMORY_MAX_FOLD per turn, so each turn costs at most one small summarization call. A long
+backlog (e.g. a migrated session) catches up over a few turns without skipping messages. The
+prompt never exceeds CHAT_MEMORY_TOKEN_BUDGET, however long the conversation is.
+"""
+import logging
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.core.config import settings
+from app.crud.crud_chat_history import (
+    append_messages, get_chat_session, get_messages_range, get_recent_messages, save_session_summary,
+)
+from app.services.model_router import model_for
+from app.services.prompt_manager import get_prompt, render_prompt
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = "chat/summarize_history.yaml"
+ROUTER_AGENT = "chat_summary"
+
+# Per-message framing overhead in chat formats (role, separators)
+_MESSAGE_OVERHEAD = 4
+# Fallback when no tokenizer is available: conservative for Hebrew, generous for English
+_CHARS_PER_TOKEN = 3
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logger.warning("tiktoken encoding unavailable; estimating tokens from text length.")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut 'text' to at most max_tokens (keeps the beginning)."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    return encoding.decode(encoding.encode(text)[:max_tokens])
+
+
+def to_chat_message(stored: dict) -> Dict[str, str]:
+    """Stored messages use {"sender", "text"} (save_chat_message) or {"role", "content"}."""
+    role = stored.get("role") or ("assistant" if stored.get("sender") in ("llm", "assistant") else "user")
+    return {"role": role, "content": stored.get("content") or stored.get("text") or ""}
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    return count_tokens(message["content"]) + _MESSAGE_OVERHEAD
+
+
+def fit_window(messages: List[Dict[str, str]], budget: int) -> List[Dict[str, str]]:
+    """Longest suffix of 'messages' (most recent turns) whose tokens fit 'budget'."""
+    used, start = 0, len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        cost = message_tokens(messages[i])
+        if used + cost > budget:
+            break
+        used += cost
+        start = i
+    return messages[start:]
+
+
+async def summarize(summary: str, messages: List[Dict[str, str]]) -> str:
+    """Fold 'messages' into the running summary with one cheap-model call."""
+    max_tokens = settings.CHAT_MEMORY_SUMMARY_TOKENS
+    rendered = render_prompt(SUMMARY_PROMPT, {
+        "summary": summary,
+        "messages": messages,
+        "max_words": max(20, int(max_tokens * 0.6)),
+    })
+    response = await model_for(ROUTER_AGENT).ainvoke([
+        SystemMessage(content=get_prompt(SUMMARY_PROMPT).system),
+        HumanMessage(content=rendered),
+    ])
+    return truncate_tokens((response.content or "").strip(), max_tokens)
+
+
+async def build_context(session_id: str, system_prompt: str, user_input: str,
+                        budget: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Chat messages ({"role", "content"}) for the next turn of 'session_id', within 'budget' tokens.
+    Updates the cached summary when older messages fell out of the window.
+    """
+    budget = budget or settings.CHAT_MEMORY_TOKEN_BUDGET
+    header = await get_chat_session(session_id) or {}
+    summary = header.get("summary") or ""
+    summarized = header.get("summarizedCount", 0)
+
+    # Sessions written before bucketed storage keep their embedded array; turns recorded since
+    # then live in buckets under the same session id. History = legacy array, then bucket messages.
+    legacy = header.get("messages") or []
+    bucketed = header.get("messageCount", 0)
+    total = len(legacy) + bucketed
+    max_recent = settings.CHAT_MEMORY_MAX_RECENT
+    recent = await get_recent_messages(session_id, max_recent) if bucketed else []
+    if len(recent) < max_recent:
+        recent = legacy[max(0, len(legacy) - (max_recent - len(recent))):] + recent
+
+    system = {"role": "system", "content": system_prompt}
+    user = {"role": "user", "content": user_input}
+    window_budget = budget - message_tokens(system) - message_tokens(user) - settings.CHAT_MEMORY_SUMMARY_TOKENS
+    window = fit_window([to_chat_message(m) for m in recent], max(0, window_budget))
+
+    window_start = total - len(window)
+    if summarized < window_start:
+        # Oldest unsummarized messages first; a long backlog catches up over several turns
+        fold_end = min(window_start, summarized + settings.CHAT_MEMORY_MAX_FOLD)
+        folded = legacy[summarized:fold_end]
+        if fold_end > len(legacy):
+            folded += await get_messages_range(
+                session_id, max(0, summarized - len(legacy)), fold_end - len(legacy)
+            )
+        try:
+            summary = await summarize(summary, [to_chat_message(m) for m in folded])
+            await save_session_summary(session_id, summary, fold_end)
+        except Exception:
+            logger.warning("Chat summary update failed for %s; keeping the previous one.", session_id, exc_info=True)
+
+    messages = [system]
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    return messages + window + [user]
+
+
+def to_langchain(messages: List[Dict[str, str]]) -> list:
+    cls = {"system": SystemMessage, "assistant": AIMessage, "user": HumanMessage}
+    return [cls[m["role"]](content=m["content"]) for m in messages]
+
+
+async def record_turn(session_id: str, user_id: str, user_input: str, reply: str) -> None:
+    await append_messages(session_id, user_id, [
+        {"sender": "user", "text": user_input},
+        {"sender": "llm", "text": reply},
+    ])
+
+
+__all__ = [
+    "build_context", "record_turn", "summarize", "fit_window", "count_tokens",
+    "truncate_tokens", "to_chat_message", "to_langchain",
+]
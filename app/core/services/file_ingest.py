@@ -5,8 +5,7 @@ import mimetypes
 from typing import Literal, TypedDict, Union
 from pathlib import Path
 
-from docx import Document
-import fitz  # PyMuPDF
+# python-docx / PyMuPDF are imported in the branch that needs them (keeps app import light)
 
 # 🧱 Structured return type
 class FileIngestResult(TypedDict):
@@ -45,6 +44,8 @@ async def ingest_upload(file_bytes: bytes, filename: str) -> FileIngestResult:
 
     elif file_type == "docx":
         try:
+            from docx import Document
+
             doc = Document()
             doc._part._blob = file_bytes  # dirty patch
             paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
@@ -54,6 +55,8 @@ async def ingest_upload(file_bytes: bytes, filename: str) -> FileIngestResult:
 
     elif file_type == "pdf":
         try:
+            import fitz  # PyMuPDF
+
             with fitz.open(stream=file_bytes, filetype="pdf") as doc:
                 text = ""
                 for page in doc:
@@ -0,0 +1,153 @@
+# core/services/question_bank.py
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.normalizers.near_duplicate import NearDuplicateIndex
+from app.core.tracing import count_cache, span
+from app.crud.crud_block import find_question_stems
+
+logger = logging.getLogger(__name__)
+
+# (courseOutlineId, lessonId, pageId) – None means "not filtered on"
+Scope = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class QuestionBank:
+    """
+    Near-duplicate index over the question stems already stored for one scope.
+    Lets Stage 2 reject known stems before they reach the verifiers.
+    """
+
+    def __init__(self, scope: Scope, stems: Iterable[str] = (), threshold: Optional[float] = None):
+        self.scope = scope
+        self.index = NearDuplicateIndex(threshold=threshold or settings.NEAR_DUP_THRESHOLD)
+        self.stems: List[str] = []
+        self.loaded_at = time.monotonic()
+        for stem in stems:
+            self.add(stem)
+
+    def add(self, stem: str) -> None:
+        stem = (stem or "").strip()
+        if not stem:
+            return
+        self.index.add(len(self.stems), stem)
+        self.stems.append(stem)
+
+    def find_known(self, stem: str) -> Optional[str]:
+        """The stored stem that 'stem' near-duplicates, or None."""
+        key = self.index.find_duplicate(stem)
+        return self.stems[key] if key is not None else None
+
+    def covered_stems(self, max_items: Optional[int] = None) -> List[str]:
+        """Most recently stored stems first, for the generator's 'already covered' hint."""
+        n = settings.QUESTION_BANK_PROMPT_STEMS if max_items is None else max_items
+        return list(reversed(self.stems[-n:])) if n > 0 else []
+
+    def __len__(self) -> int:
+        return len(self.stems)
+
+
+def compact_stems(stems: Iterable[str], max_items: int = None, max_chars: int = 80) -> List[str]:
+    """
+    Compact form of stems for prompt injection: de-duplicated, whitespace-collapsed,
+    truncated to 'max_chars' and capped at 'max_items'.
+    """
+    max_items = settings.QUESTION_BANK_PROMPT_STEMS if max_items is None else max_items
+    out: List[str] = []
+    seen = set()
+    for stem in stems:
+        s = " ".join((stem or "").split())
+        if not s or s in seen:
+            continue
+        seen.add(s)
+        out.append(s if len(s) <= max_chars else s[: max_chars - 1].rstrip() + "…")
+        if len(out) >= max_items:
+            break
+    return out
+
+
+def _scope_covers(bank_scope: Scope, block_scope: Scope) -> bool:
+    """True if a block saved under 'block_scope' belongs to a bank loaded for 'bank_scope'."""
+    return all(b is None or b == k for b, k in zip(bank_scope, block_scope))
+
+
+# ---- Lazy, bounded, TTL cache of banks keyed by scope ----
+_banks: "OrderedDict[Scope, QuestionBank]" = OrderedDict()
+_locks: Dict[Scope, asyncio.Lock] = {}
+
+
+async def get_question_bank(
+    outline_id: Optional[str] = None,
+    lesson_id: Optional[str] = None,
+    page_id: Optional[str] = None,
+) -> Optional[QuestionBank]:
+    """
+    Return the question bank for a scope, loading it from 'blocks' on first use.
+    Returns None when no scope is given or the bank cannot be loaded (generation continues).
+    """
+    scope: Scope = (outline_id, lesson_id, page_id)
+    if not any(scope):
+        return None
+
+    bank = _banks.get(scope)
+    if bank and time.monotonic() - bank.loaded_at < settings.QUESTION_BANK_TTL_SECONDS:
+        _banks.move_to_end(scope)
+        count_cache("question_bank", hit=True)
+        return bank
+
+    lock = _locks.setdefault(scope, asyncio.Lock())
+    async with lock:
+        bank = _banks.get(scope)
+        if bank and time.monotonic() - bank.loaded_at < settings.QUESTION_BANK_TTL_SECONDS:
+            count_cache("question_bank", hit=True)
+            return bank
+        count_cache("question_bank", hit=False)
+        try:
+            async with span("load_question_bank", kind="db"):
+                stems = await find_question_stems(outline_id, lesson_id, page_id)
+        except Exception:
+            logger.exception("Failed to load question bank for scope %s", scope)
+            return None
+
+        bank = QuestionBank(scope, stems)
+        _banks[scope] = bank
+        _banks.move_to_end(scope)
+        while len(_banks) > settings.QUESTION_BANK_MAX_SCOPES:
+            evicted, _ = _banks.popitem(last=False)
+            _locks.pop(evicted, None)
+        logger.info("📚 Loaded question bank for %s (%d stems)", scope, len(bank))
+        return bank
+
+
+def remember_saved_stems(
+    stems: Iterable[str],
+    outline_id: Optional[str] = None,
+    lesson_id: Optional[str] = None,
+    page_id: Optional[str] = None,
+) -> None:
+    """Add newly saved stems to every cached bank whose scope covers them."""
+    block_scope: Scope = (outline_id, lesson_id, page_id)
+    stems = list(stems)
+    for bank_scope, bank in _banks.items():
+        if _scope_covers(bank_scope, block_scope):
+            for stem in stems:
+                bank.add(stem)
+
+
+def invalidate_question_banks() -> None:
+    _banks.clear()
+    _locks.clear()
+
+
+__all__ = [
+    "QuestionBank",
+    "compact_stems",
+    "get_question_bank",
+    "remember_saved_stems",
+    "invalidate_question_banks",
+]
@@ -0,0 +1,157 @@
+# app/core/services/run_ledger.py
+"""
+Pipeline-run ledger: folds the span totals and outcomes traced for one run (app/core/tracing.py)
+into a single compact pipeline_runs document, written once when the run ends.
+
+    {_id: run id, stage, status, topicName, subject, gradeLevel, questionType, ...,
+     startedAt, finishedAt, durationSeconds,
+     steps: {span name: {count, seconds}},
+     llm: {agent: {calls, errors, seconds, tokensIn, tokensOut, costUsd, models}},
+     totals: {llmCalls, tokensIn, tokensOut, costUsd}, attempts, retries,
+     acceptance: {accepted, rejected: {reason: n}, groundingPrecheck: {...}},
+     truncatedSpans: spans past the per-run trace buffer (only when > 0)}
+
+Costs use DEFAULT_PRICES (USD per 1M tokens) merged with the LLM_PRICES_PER_MTOK override;
+models without a price are listed under unpricedModels instead of being counted as free.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.tracing import get_run_outcomes, get_run_summary
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (input / output)
+DEFAULT_PRICES: Dict[str, Dict[str, float]] = {
+    "gpt-4.1": {"in": 2.00, "out": 8.00},
+    "gpt-4.1-mini": {"in": 0.40, "out": 1.60},
+    "gpt-4.1-nano": {"in": 0.10, "out": 0.40},
+    "gpt-4o": {"in": 2.50, "out": 10.00},
+    "gpt-4o-mini": {"in": 0.15, "out": 0.60},
+}
+
+
+def get_prices() -> Dict[str, Dict[str, float]]:
+    prices = dict(DEFAULT_PRICES)
+    if settings.LLM_PRICES_PER_MTOK:
+        try:
+            prices.update(json.loads(settings.LLM_PRICES_PER_MTOK))
+        except (ValueError, TypeError):
+            logger.warning("Ignoring malformed LLM_PRICES_PER_MTOK")
+    return prices
+
+
+def price_for(model: str, prices: Dict[str, Dict[str, float]]) -> Optional[Dict[str, float]]:
+    """Exact match first, then the longest known prefix (dated snapshots such as gpt-4.1-2025-04-14)."""
+    if model in prices:
+        return prices[model]
+    matches = [name for name in prices if model.startswith(name)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def _acceptance(outcomes: Dict[str, Dict[str, int]], stage: str) -> Dict[str, Any]:
+    acceptance: Dict[str, Any] = {"accepted": 0, "rejected": {}}
+    for key, n in outcomes.get(stage, {}).items():
+        outcome, _, reason = key.partition(":")
+        if outcome == "accepted":
+            acceptance["accepted"] += n
+        elif outcome == "rejected":
+            acceptance["rejected"][reason or "unspecified"] = acceptance["rejected"].get(reason or "unspecified", 0) + n
+    if outcomes.get("grounding_precheck"):
+        acceptance["groundingPrecheck"] = dict(outcomes["grounding_precheck"])
+    return acceptance
+
+
+def build_run_document(
+    run_id: str,
+    stage: str,
+    summary: Dict[str, Any],
+    outcomes: Optional[Dict[str, Dict[str, int]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    prices: Optional[Dict[str, Dict[str, float]]] = None,
+) -> Dict[str, Any]:
+    """'summary' is the run's running totals (get_run_summary), so no span is ever missed."""
+    prices = prices if prices is not None else get_prices()
+    root = summary["roots"].get(stage)
+
+    steps = {name: dict(step) for name, step in summary["steps"].items()}
+    if root:  # the stage span itself is the run, not one of its steps
+        step = steps[stage]
+        step["count"] -= 1
+        step["seconds"] -= root["seconds"]
+        if not step["count"]:
+            del steps[stage]
+
+    llm: Dict[str, Dict[str, Any]] = {}
+    unpriced = set()
+    for name, totals in summary["llm"].items():
+        agent = llm[name] = {
+            "calls": totals["calls"], "errors": totals["errors"], "seconds": totals["seconds"],
+            "tokensIn": 0, "tokensOut": 0, "costUsd": 0.0, "models": [model for model in totals["models"] if model],
+        }
+        for model, usage in totals["models"].items():
+            agent["tokensIn"] += usage["tokensIn"]
+            agent["tokensOut"] += usage["tokensOut"]
+            price = price_for(model, prices)
+            if price:
+                agent["costUsd"] += (usage["tokensIn"] * price["in"] + usage["tokensOut"] * price["out"]) / 1_000_000
+            elif usage["tokensIn"] or usage["tokensOut"]:
+                unpriced.add(model or "unknown")
+
+    for entry in list(steps.values()) + list(llm.values()):
+        entry["seconds"] = round(entry["seconds"], 4)
+    for agent in llm.values():
+        agent["costUsd"] = round(agent["costUsd"], 6)
+
+    started = datetime.utcfromtimestamp(root["startedAt"]) if root else datetime.utcnow()
+    duration = root["seconds"] if root else sum(step["seconds"] for step in steps.values())
+    retries = (root or {}).get("attrs", {}).get("retries", 0)
+    meta = dict(meta or {})
+
+    doc: Dict[str, Any] = {
+        "_id": run_id,
+        "stage": stage,
+        "status": root["status"] if root else "unknown",
+        **meta,
+        "startedAt": started,
+        "finishedAt": started + timedelta(seconds=duration),
+        "durationSeconds": round(duration, 4),
+        "steps": steps,
+        "llm": llm,
+        "totals": {
+            "llmCalls": sum(a["calls"] for a in llm.values()),
+            "tokensIn": sum(a["tokensIn"] for a in llm.values()),
+            "tokensOut": sum(a["tokensOut"] for a in llm.values()),
+            "costUsd": round(sum(a["costUsd"] for a in llm.values()), 6),
+        },
+        "attempts": meta.get("attempts", retries + 1),
+        "retries": retries,
+        "acceptance": _acceptance(outcomes or {}, stage),
+    }
+    if unpriced:
+        doc["unpricedModels"] = sorted(unpriced)
+    if summary.get("droppedSpans"):
+        # Totals stay exact; only the in-memory timeline (get_trace) was cut short
+        doc["truncatedSpans"] = summary["droppedSpans"]
+    return doc
+
+
+async def record_run(run_id: str, stage: str, meta: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Persist the ledger document for a finished run; failures are logged, never raised."""
+    if not settings.PIPELINE_RUNS_ENABLED:
+        return None
+    from app.crud.crud_pipeline_runs import insert_pipeline_run
+
+    try:
+        doc = build_run_document(run_id, stage, get_run_summary(run_id), get_run_outcomes(run_id), meta)
+        await insert_pipeline_run(doc)
+        return doc
+    except Exception:
+        logger.warning("Failed to record pipeline run %s", run_id, exc_info=True)
+        return None
+
+
+__all__ = ["build_run_document", "record_run", "get_prices", "price_for", "DEFAULT_PRICES"]
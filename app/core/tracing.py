@@ -0,0 +1,219 @@
+# app/core/tracing.py
+"""
+Async spans around pipeline steps and agent / LLM calls.
+
+    async with span("grounding_verifier", kind="agent", agent="grounding_verifier") as s:
+        result = await ...
+        s.set(path="llm")
+
+Every span feeds eduflow_span_duration_seconds (labelled by span, kind, agent, model, status);
+LLM spans also feed token counters via s.record_usage(response). Spans opened inside
+run_context(pipeline_run_id) are kept per run (bounded) so one run's timeline can be inspected
+with get_trace(run_id), and their log records carry the run id in details.
+
+Independently of that bounded span list, every span closed in a run updates that run's totals:
+step count / seconds, LLM calls / errors / seconds and tokens per agent and model, and the
+root spans. get_run_summary(run_id) returns them, so the run ledger stays exact for runs with
+more than TRACE_MAX_SPANS_PER_RUN spans.
+"""
+import copy
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.core.metrics import REGISTRY
+from app.core.loop_monitor import label_current_task
+
+logger = logging.getLogger(__name__)
+
+TRACE_MAX_RUNS = 200
+TRACE_MAX_SPANS_PER_RUN = 1000
+
+SPAN_SECONDS = REGISTRY.histogram(
+    "eduflow_span_duration_seconds", "Duration of pipeline steps, agent and LLM calls.",
+    ("span", "kind", "agent", "model", "status"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "eduflow_llm_tokens_total", "LLM tokens by agent, model and direction (in/out).",
+    ("agent", "model", "direction"),
+)
+RETRIES = REGISTRY.counter("eduflow_retries_total", "Retries / extra attempts per step.", ("span", "agent"))
+CACHE_EVENTS = REGISTRY.counter("eduflow_cache_events_total", "Cache lookups by cache and result.", ("cache", "result"))
+OUTCOMES = REGISTRY.counter(
+    "eduflow_stage_outcomes_total", "Accept / reject decisions by stage and reason.", ("stage", "outcome", "reason"),
+)
+
+_current_run: ContextVar[Optional[str]] = ContextVar("pipeline_run_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+# Per run: {"spans": [...], "outcomes": {stage: {"rejected:duplicate": n}}, "summary": {...}},
+# oldest runs evicted first
+_traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+class Span:
+    def __init__(self, name: str, kind: str, agent: str, model: str, attrs: Dict[str, Any]):
+        self.name, self.kind, self.agent, self.model = name, kind, agent, model
+        self.attrs = dict(attrs)
+        self.run_id = _current_run.get()
+        parent = _current_span.get()
+        self.parent = parent.name if parent else None
+        self.status = "ok"
+        self.tokens_in = self.tokens_out = 0
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.duration = 0.0
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add_tokens(self, tokens_in: int = 0, tokens_out: int = 0) -> None:
+        self.tokens_in += int(tokens_in or 0)
+        self.tokens_out += int(tokens_out or 0)
+
+    def record_usage(self, response: Any) -> None:
+        """Token usage from a LangChain message (usage_metadata or OpenAI token_usage)."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage:
+            self.add_tokens(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+            return
+        token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        self.add_tokens(token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0))
+
+    def retry(self, n: int = 1) -> None:
+        self.attrs["retries"] = self.attrs.get("retries", 0) + n
+        RETRIES.inc(n, span=self.name, agent=self.agent)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span": self.name, "kind": self.kind, "agent": self.agent, "model": self.model,
+            "parent": self.parent, "status": self.status, "startedAt": self.started_at,
+            "seconds": round(self.duration, 6), "tokensIn": self.tokens_in, "tokensOut": self.tokens_out,
+            "attrs": self.attrs,
+        }
+
+
+def new_run_summary() -> Dict[str, Any]:
+    """
+    Running totals of one run's spans:
+    {steps: {span: {count, seconds}},
+     llm: {agent: {calls, errors, seconds, models: {model: {calls, tokensIn, tokensOut}}}},
+     roots: {span: record of the latest top-level span}, spans: n, droppedSpans: n}
+    """
+    return {"steps": {}, "llm": {}, "roots": {}, "spans": 0, "droppedSpans": 0}
+
+
+def _add_to_summary(summary: Dict[str, Any], record: Dict[str, Any]) -> None:
+    summary["spans"] += 1
+    if record["parent"] is None:
+        summary["roots"][record["span"]] = record
+    if record["kind"] == "llm":
+        agent = summary["llm"].setdefault(record["agent"] or record["span"], {
+            "calls": 0, "errors": 0, "seconds": 0.0, "models": {},
+        })
+        agent["calls"] += 1
+        agent["errors"] += record["status"] != "ok"
+        agent["seconds"] += record["seconds"]
+        model = agent["models"].setdefault(record["model"], {"calls": 0, "tokensIn": 0, "tokensOut": 0})
+        model["calls"] += 1
+        model["tokensIn"] += record["tokensIn"]
+        model["tokensOut"] += record["tokensOut"]
+        return
+    step = summary["steps"].setdefault(record["span"], {"count": 0, "seconds": 0.0})
+    step["count"] += 1
+    step["seconds"] += record["seconds"]
+
+
+def _run_entry(run_id: str) -> Dict[str, Any]:
+    entry = _traces.get(run_id)
+    if entry is None:
+        entry = _traces[run_id] = {"spans": [], "outcomes": {}, "summary": new_run_summary()}
+        while len(_traces) > TRACE_MAX_RUNS:
+            _traces.popitem(last=False)
+    return entry
+
+
+def _remember(run_id: str, record: Dict[str, Any]) -> None:
+    entry = _run_entry(run_id)
+    _add_to_summary(entry["summary"], record)
+    if len(entry["spans"]) < TRACE_MAX_SPANS_PER_RUN:
+        entry["spans"].append(record)
+    else:
+        entry["summary"]["droppedSpans"] += 1
+
+
+@asynccontextmanager
+async def span(name: str, kind: str = "step", agent: str = "", model: str = "", **attrs):
+    s = Span(name, kind, agent, model, attrs)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException:
+        s.status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        s.duration = time.perf_counter() - s.started
+        SPAN_SECONDS.observe(s.duration, span=name, kind=kind, agent=agent, model=s.model, status=s.status)
+        if s.tokens_in:
+            LLM_TOKENS.inc(s.tokens_in, agent=agent or name, model=s.model, direction="in")
+        if s.tokens_out:
+            LLM_TOKENS.inc(s.tokens_out, agent=agent or name, model=s.model, direction="out")
+        record = s.to_dict()
+        if s.run_id:
+            _remember(s.run_id, record)
+        logger.debug("⏱️ %s %.3fs", name, s.duration, extra={"details": {"pipeline_run_id": s.run_id, **record}})
+
+
+@contextmanager
+def run_context(pipeline_run_id: str):
+    """Correlate every span opened inside (including in awaited tasks) with 'pipeline_run_id'."""
+    token = _current_run.set(pipeline_run_id)
+    label_current_task(pipeline_run_id=pipeline_run_id)
+    try:
+        yield
+    finally:
+        _current_run.reset(token)
+
+
+def current_run_id() -> Optional[str]:
+    return _current_run.get()
+
+
+def get_trace(pipeline_run_id: str) -> List[Dict[str, Any]]:
+    entry = _traces.get(pipeline_run_id)
+    return list(entry["spans"]) if entry else []
+
+
+def get_run_summary(pipeline_run_id: str) -> Dict[str, Any]:
+    """Running totals of every span closed in the run (not bounded like get_trace)."""
+    entry = _traces.get(pipeline_run_id)
+    return copy.deepcopy(entry["summary"]) if entry else new_run_summary()
+
+
+def get_run_outcomes(pipeline_run_id: str) -> Dict[str, Dict[str, int]]:
+    """Outcome counts recorded inside run_context(pipeline_run_id): {stage: {"outcome[:reason]": n}}."""
+    entry = _traces.get(pipeline_run_id)
+    return {stage: dict(counts) for stage, counts in entry["outcomes"].items()} if entry else {}
+
+
+def count_cache(cache: str, hit: bool) -> None:
+    CACHE_EVENTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def count_outcome(stage: str, outcome: str, reason: str = "") -> None:
+    OUTCOMES.inc(stage=stage, outcome=outcome, reason=reason)
+    run_id = _current_run.get()
+    if run_id:
+        outcomes = _run_entry(run_id)["outcomes"].setdefault(stage, {})
+        key = f"{outcome}:{reason}" if reason else outcome
+        outcomes[key] = outcomes.get(key, 0) + 1
+
+
+__all__ = [
+    "span", "Span", "run_context", "current_run_id", "get_trace", "get_run_outcomes", "get_run_summary",
+    "count_cache", "count_outcome",
+    "SPAN_SECONDS", "LLM_TOKENS", "RETRIES", "CACHE_EVENTS", "OUTCOMES",
+]
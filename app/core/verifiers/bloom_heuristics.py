@@ -0,0 +1,158 @@
+# app/core/verifiers/bloom_heuristics.py
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from app.core.normalizers.near_duplicate import normalize_text
+from app.schemas.stage2 import CognitiveTarget
+
+BLOOM_LEVELS = ["remember", "understand", "apply", "analyze", "evaluate", "create"]
+
+# Bloom level → Stage 2 cognitive target (same grouping as the verifier prompt)
+BLOOM_TO_TARGET: Dict[str, CognitiveTarget] = {
+    "remember": CognitiveTarget.knowledge,
+    "understand": CognitiveTarget.comprehension_application,
+    "apply": CognitiveTarget.comprehension_application,
+    "analyze": CognitiveTarget.inference_evaluation,
+    "evaluate": CognitiveTarget.inference_evaluation,
+    "create": CognitiveTarget.inference_evaluation,
+}
+
+# Target labels as they reach the verifier (enum values or the Hebrew names used in prompts)
+TARGET_ALIASES: Dict[str, CognitiveTarget] = {
+    **{t.value: t for t in CognitiveTarget},
+    "ידע ואיתור מידע": CognitiveTarget.knowledge,
+    "הבנה ויישום": CognitiveTarget.comprehension_application,
+    "הסקת מסקנות והערכה": CognitiveTarget.inference_evaluation,
+}
+
+# (phrase, bloom level, weight). Phrases are matched as whole words on normalized text.
+# Weight 1.0 = unambiguous cue; generic openers ("מה", "what") are weak so they alone never
+# produce a confident verdict.
+LEXICON: List[Tuple[str, str, float]] = [
+    # remember
+    ("באיזו שנה", "remember", 1.0), ("באיזה שנה", "remember", 1.0), ("מתי", "remember", 1.0),
+    ("מי היה", "remember", 1.0), ("מי הייתה", "remember", 1.0), ("מי היו", "remember", 1.0),
+    ("ציין", "remember", 1.0), ("ציינו", "remember", 1.0), ("מנה", "remember", 1.0), ("מנו", "remember", 1.0),
+    ("הגדר", "remember", 1.0), ("הגדירו", "remember", 1.0), ("היכן", "remember", 0.9), ("איפה", "remember", 0.9),
+    ("כמה", "remember", 0.8), ("מהו", "remember", 0.6), ("מהי", "remember", 0.6), ("מה", "remember", 0.4),
+    ("what year", "remember", 1.0), ("in which year", "remember", 1.0), ("when did", "remember", 1.0),
+    ("when was", "remember", 1.0), ("who was", "remember", 1.0), ("who were", "remember", 1.0),
+    ("name", "remember", 0.9), ("list", "remember", 0.9), ("define", "remember", 1.0),
+    ("identify", "remember", 0.8), ("where", "remember", 0.8), ("how many", "remember", 0.8),
+    ("what is", "remember", 0.5), ("what was", "remember", 0.5), ("what", "remember", 0.3),
+    # understand
+    ("הסבר", "understand", 1.0), ("הסבירו", "understand", 1.0), ("תאר", "understand", 1.0),
+    ("תארו", "understand", 1.0), ("סכם", "understand", 1.0), ("סכמו", "understand", 1.0),
+    ("פרש", "understand", 0.9), ("כיצד", "understand", 0.7), ("מדוע", "understand", 0.7),
+    ("למה", "understand", 0.7), ("מה הסיבה", "understand", 0.8), ("מה הייתה הסיבה", "understand", 0.8),
+    ("explain", "understand", 1.0), ("describe", "understand", 1.0), ("summarize", "understand", 1.0),
+    ("paraphrase", "understand", 1.0), ("why", "understand", 0.7), ("how did", "understand", 0.7),
+    ("what caused", "understand", 0.8),
+    # apply
+    ("השתמש", "apply", 1.0), ("השתמשו", "apply", 1.0), ("פתור", "apply", 1.0), ("פתרו", "apply", 1.0),
+    ("חשב", "apply", 1.0), ("חשבו", "apply", 1.0), ("הדגם", "apply", 1.0), ("הדגימו", "apply", 1.0),
+    ("יישם", "apply", 1.0), ("יישמו", "apply", 1.0), ("סווג", "apply", 0.8),
+    ("apply", "apply", 1.0), ("use", "apply", 0.8), ("solve", "apply", 1.0), ("calculate", "apply", 1.0),
+    ("compute", "apply", 1.0), ("demonstrate", "apply", 1.0), ("classify", "apply", 0.8),
+    # analyze
+    ("השווה", "analyze", 1.0), ("השוו", "analyze", 1.0), ("נתח", "analyze", 1.0), ("נתחו", "analyze", 1.0),
+    ("הבחן", "analyze", 1.0), ("הבחינו", "analyze", 1.0), ("מה הקשר", "analyze", 1.0),
+    ("מה ההבדל", "analyze", 1.0), ("הבדל בין", "analyze", 1.0), ("זהה קשרים", "analyze", 1.0),
+    ("compare", "analyze", 1.0), ("contrast", "analyze", 1.0), ("analyze", "analyze", 1.0),
+    ("analyse", "analyze", 1.0), ("differentiate", "analyze", 1.0), ("distinguish", "analyze", 1.0),
+    ("relationship between", "analyze", 1.0), ("difference between", "analyze", 1.0), ("infer", "analyze", 0.9),
+    # evaluate
+    ("נמק", "evaluate", 1.0), ("נמקו", "evaluate", 1.0), ("האם אתה מסכים", "evaluate", 1.0),
+    ("האם את מסכימה", "evaluate", 1.0), ("האם אתם מסכימים", "evaluate", 1.0), ("הערך", "evaluate", 1.0),
+    ("העריכו", "evaluate", 1.0), ("שפוט", "evaluate", 1.0), ("הצדק", "evaluate", 1.0),
+    ("הצג שיקולים", "evaluate", 1.0), ("חוו דעתכם", "evaluate", 1.0),
+    ("evaluate", "evaluate", 1.0), ("assess", "evaluate", 1.0), ("justify", "evaluate", 1.0),
+    ("do you agree", "evaluate", 1.0), ("argue", "evaluate", 1.0), ("critique", "evaluate", 1.0),
+    ("defend", "evaluate", 1.0),
+    # create
+    ("הצע", "create", 1.0), ("הציעו", "create", 1.0), ("תכנן", "create", 1.0), ("תכננו", "create", 1.0),
+    ("עצב", "create", 1.0), ("עצבו", "create", 1.0), ("בנה מודל", "create", 1.0), ("חבר", "create", 0.8),
+    ("design", "create", 1.0), ("propose", "create", 1.0), ("create", "create", 1.0),
+    ("develop a plan", "create", 1.0), ("formulate", "create", 1.0), ("compose", "create", 1.0),
+]
+
+# Cue at the very start of the stem (imperative / question opener) is a stronger signal
+_ANCHOR_BONUS = 1.0
+_ANYWHERE_FACTOR = 0.6
+# Upper bound on confidence for a lexical verdict
+_MAX_CONFIDENCE = 0.95
+
+_NORMALIZED_LEXICON = [(normalize_text(p), level, w) for p, level, w in LEXICON]
+
+
+class BloomVerdict(TypedDict):
+    status: str
+    detected_level: str
+    detected_target: Optional[str]
+    matches_target: Optional[bool]
+    match_score: float
+    confidence: float
+    justification: str
+    source: str
+
+
+def _find_cues(stem: str) -> List[Tuple[str, str, float]]:
+    """(phrase, level, effective weight) for every lexicon phrase found in the stem."""
+    norm = normalize_text(stem)
+    padded = f" {norm} "
+    cues = []
+    for phrase, level, weight in _NORMALIZED_LEXICON:
+        if not phrase or f" {phrase} " not in padded:
+            continue
+        anchored = norm == phrase or norm.startswith(phrase + " ")
+        cues.append((phrase, level, weight * (_ANCHOR_BONUS if anchored else _ANYWHERE_FACTOR)))
+    # A longer phrase subsumes its own prefix (e.g. "מה הקשר" over "מה")
+    phrases = [c[0] for c in cues]
+    return [c for c in cues if not any(p != c[0] and f" {c[0]} " in f" {p} " for p in phrases)]
+
+
+def classify_bloom(stem: str, target: Optional[str] = None) -> BloomVerdict:
+    """
+    Lexicon-based Bloom classifier.
+
+    The detected level is the highest Bloom level cued in the stem (the verifier prompt's
+    "highest operation required" rule). Confidence is the cue strength of that level times
+    its share of all cue weight, so weak or conflicting cues yield low confidence.
+    """
+    cues = _find_cues(stem)
+    if not cues:
+        detected, confidence, justification = "remember", 0.0, "heuristic: no lexical cues"
+    else:
+        by_level: Dict[str, float] = {}
+        strength: Dict[str, float] = {}
+        for _, level, w in cues:
+            by_level[level] = by_level.get(level, 0.0) + w
+            strength[level] = max(strength.get(level, 0.0), w)
+
+        detected = max(by_level, key=BLOOM_LEVELS.index)
+        detected_target_group = BLOOM_TO_TARGET[detected]
+        group_weight = sum(w for lvl, w in by_level.items() if BLOOM_TO_TARGET[lvl] == detected_target_group)
+        share = group_weight / sum(by_level.values())
+        confidence = round(min(_MAX_CONFIDENCE, strength[detected] * share * _MAX_CONFIDENCE), 3)
+        justification = "heuristic: cues " + ", ".join(f"'{p}'→{lvl}" for p, lvl, _ in cues)
+
+    detected_target = BLOOM_TO_TARGET[detected].value
+    matches = None
+    match_score = confidence
+    if target:
+        target_enum = TARGET_ALIASES.get(getattr(target, "value", str(target)).strip())
+        matches = target_enum is not None and detected_target == target_enum.value
+        match_score = confidence if matches else round(1.0 - confidence, 3)
+
+    return {
+        "status": "ok",
+        "detected_level": detected,
+        "detected_target": detected_target,
+        "matches_target": matches,
+        "match_score": match_score,
+        "confidence": confidence,
+        "justification": justification,
+        "source": "heuristic",
+    }
+
+
+__all__ = ["classify_bloom", "BLOOM_LEVELS", "BLOOM_TO_TARGET", "BloomVerdict"]
@@ -0,0 +1,65 @@
+# app/core/verifiers/cascade.py
+from typing import Any, Dict, Optional
+
+from app.core.agents.bloom_level_verifier_agent import run_bloom_level_verifier_agent
+from app.core.agents.difficulty_level_verifier_agent import run_difficulty_level_verifier_agent
+from app.core.config import settings
+from app.core.tracing import span
+from app.core.verifiers.bloom_heuristics import classify_bloom
+from app.core.verifiers.difficulty_heuristics import classify_difficulty
+from app.core.verifiers.grounding_precheck import ChunkIndex
+
+# In-process counters: how many verdicts were settled locally vs. sent to the LLM
+cascade_stats: Dict[str, int] = {
+    "bloom_heuristic": 0,
+    "bloom_llm": 0,
+    "difficulty_heuristic": 0,
+    "difficulty_llm": 0,
+}
+
+
+async def verify_bloom_level(stem: str, target: str) -> Dict[str, Any]:
+    """
+    Bloom verification cascade: lexical classifier first, LLM verifier only when the
+    heuristic confidence is below BLOOM_HEURISTIC_MIN_CONFIDENCE.
+    """
+    async with span("bloom_cascade", kind="verifier", agent="bloom_verifier") as s:
+        verdict = classify_bloom(stem, target)
+        if verdict["confidence"] >= settings.BLOOM_HEURISTIC_MIN_CONFIDENCE:
+            cascade_stats["bloom_heuristic"] += 1
+            s.set(path="heuristic")
+            return dict(verdict)
+
+        cascade_stats["bloom_llm"] += 1
+        s.set(path="llm")
+        return await run_bloom_level_verifier_agent({"question": stem, "bloom_level": target})
+
+
+async def verify_difficulty_level(
+    stem: str,
+    text: str,
+    target: str,
+    answer: str = "",
+    chunk_index: Optional[ChunkIndex] = None,
+) -> Dict[str, Any]:
+    """
+    Difficulty verification cascade: feature-based estimate first, LLM verifier only when
+    the heuristic confidence is below DIFFICULTY_HEURISTIC_MIN_CONFIDENCE.
+    """
+    async with span("difficulty_cascade", kind="verifier", agent="difficulty_verifier") as s:
+        verdict = classify_difficulty(stem, target, answer=answer, chunk_index=chunk_index)
+        if verdict["confidence"] >= settings.DIFFICULTY_HEURISTIC_MIN_CONFIDENCE:
+            cascade_stats["difficulty_heuristic"] += 1
+            s.set(path="heuristic")
+            return dict(verdict)
+
+        cascade_stats["difficulty_llm"] += 1
+        s.set(path="llm")
+        return await run_difficulty_level_verifier_agent({
+            "question": stem,
+            "text": text,
+            "difficulty_level": target,
+        })
+
+
+__all__ = ["verify_bloom_level", "verify_difficulty_level", "cascade_stats"]
@@ -0,0 +1,136 @@
+# app/core/verifiers/difficulty_heuristics.py
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from app.core.verifiers.bloom_heuristics import classify_bloom
+from app.core.verifiers.grounding_precheck import ChunkIndex, content_tokens, tokenize
+
+DIFFICULTY_LEVELS = ["low", "medium", "high"]
+
+# Target labels as they reach the verifier (Difficulty enum values, prompt labels, Hebrew)
+TARGET_ALIASES: Dict[str, str] = {
+    "easy": "low", "low": "low", "נמוכה": "low", "קל": "low", "קלה": "low",
+    "medium": "medium", "בינונית": "medium", "בינוני": "medium",
+    "hard": "high", "high": "high", "גבוהה": "high", "קשה": "high",
+}
+
+_BLOOM_TO_DIFFICULTY = {
+    "remember": "low",
+    "understand": "medium",
+    "apply": "medium",
+    "analyze": "high",
+    "evaluate": "high",
+    "create": "high",
+}
+
+# Signal weights: Bloom cue (scaled by its own confidence), answer directness in the chunk,
+# surface readability. Readability is only a tie-breaker – long wording is not difficulty.
+_W_ANSWER = 1.0
+_W_READABILITY = 0.25
+_MAX_CONFIDENCE = 0.95
+
+
+class DifficultyVerdict(TypedDict):
+    status: str
+    detected_difficulty: str
+    matches_target: Optional[bool]
+    match_score: float
+    confidence: float
+    justification: str
+    source: str
+
+
+def readability(stem: str) -> Tuple[int, float]:
+    """(word count, LIX-style score: words per sentence + % long words)."""
+    words = tokenize(stem)
+    if not words:
+        return 0, 0.0
+    sentences = max(1, sum(stem.count(c) for c in ".?!;:"))
+    long_words = sum(1 for w in words if len(w) > 6)
+    return len(words), len(words) / sentences + 100.0 * long_words / len(words)
+
+
+def _readability_vote(stem: str) -> Tuple[str, str]:
+    n_words, lix = readability(stem)
+    if n_words <= 12 and lix < 40:
+        level = "low"
+    elif n_words <= 25 and lix < 55:
+        level = "medium"
+    else:
+        level = "high"
+    return level, f"readability(words={n_words}, lix={lix:.0f})→{level}"
+
+
+def _answer_vote(index: ChunkIndex, answer: str) -> Optional[Tuple[str, str]]:
+    """How directly the answer is stated in the chunk: explicit → low, partial → medium, absent → high."""
+    tokens = tokenize(answer)
+    ct = content_tokens(tokens)
+    if not ct or not index.words:
+        return None
+    overlap = index.overlap(tokens)
+    span, _ = index.longest_match(tokens)
+    if overlap >= 0.9 and span >= min(len(tokens), 3):
+        level = "low"
+    elif overlap >= 0.5:
+        level = "medium"
+    else:
+        level = "high"
+    return level, f"answer_directness(overlap={overlap:.2f}, span={span})→{level}"
+
+
+def classify_difficulty(
+    stem: str,
+    target: Optional[str] = None,
+    answer: str = "",
+    chunk_index: Optional[ChunkIndex] = None,
+) -> DifficultyVerdict:
+    """
+    Feature-based difficulty estimate (Bloom cue, answer directness, readability).
+
+    Signals vote with weights; confidence is the winning weight share, halved unless both
+    strong signals (Bloom cue and answer directness) are present, so only agreeing signals
+    give a confident verdict.
+    """
+    votes: List[Tuple[str, float, str]] = []
+
+    bloom = classify_bloom(stem)
+    if bloom["confidence"] > 0:
+        level = _BLOOM_TO_DIFFICULTY[bloom["detected_level"]]
+        votes.append((level, bloom["confidence"], f"bloom({bloom['detected_level']})→{level}"))
+
+    if chunk_index is not None and answer:
+        answer_vote = _answer_vote(chunk_index, answer)
+        if answer_vote:
+            votes.append((answer_vote[0], _W_ANSWER, answer_vote[1]))
+
+    level, reason = _readability_vote(stem)
+    votes.append((level, _W_READABILITY, reason))
+
+    totals: Dict[str, float] = {}
+    for lvl, w, _ in votes:
+        totals[lvl] = totals.get(lvl, 0.0) + w
+    # Ties go to the harder level (prompt tie-break prefers the higher level)
+    detected = max(totals, key=lambda lvl: (totals[lvl], DIFFICULTY_LEVELS.index(lvl)))
+    confidence = min(_MAX_CONFIDENCE, totals[detected] / sum(totals.values()))
+    if len(votes) < 3:
+        confidence /= 2
+    confidence = round(confidence, 3)
+
+    matches = None
+    match_score = confidence
+    if target:
+        target_level = TARGET_ALIASES.get(getattr(target, "value", str(target)).strip())
+        matches = target_level == detected
+        match_score = confidence if matches else round(1.0 - confidence, 3)
+
+    return {
+        "status": "ok",
+        "detected_difficulty": detected,
+        "matches_target": matches,
+        "match_score": match_score,
+        "confidence": confidence,
+        "justification": "heuristic: " + ", ".join(r for _, _, r in votes),
+        "source": "heuristic",
+    }
+
+
+__all__ = ["classify_difficulty", "readability", "DIFFICULTY_LEVELS", "DifficultyVerdict"]
@@ -0,0 +1,184 @@
+# app/core/verifiers/grounding_precheck.py
+from typing import Any, Dict, Iterable, List, Literal, Tuple, TypedDict
+
+from app.core.config import settings
+from app.core.normalizers.near_duplicate import normalize_text
+
+# Hebrew proclitic sequences (conjunction / relative / preposition / article), longest first.
+# "והמהפכה" and "המהפכה" both reduce to "מהפכה".
+_HEBREW_PREFIXES = sorted(
+    ["ו", "ה", "ב", "כ", "ל", "מ", "ש", "וה", "וב", "וכ", "ול", "ומ", "וש", "שה", "שב", "שכ",
+     "של", "שמ", "מה", "כש", "וכש", "ושה", "ושב", "ושל"],
+    key=len,
+    reverse=True,
+)
+
+_STOPWORDS = {
+    # Hebrew
+    "של", "את", "על", "עם", "זה", "זו", "זאת", "הוא", "היא", "הם", "הן", "אשר", "כי", "גם",
+    "או", "לא", "כל", "מה", "מי", "איך", "כיצד", "מדוע", "למה", "אם", "אך", "בין", "היה",
+    "הייתה", "היו", "יש", "אין", "עד", "אל", "כמו", "רק", "מן", "מאוד",
+    # English
+    "the", "a", "an", "of", "to", "in", "on", "and", "or", "is", "are", "was", "were", "be",
+    "by", "for", "with", "as", "at", "it", "this", "that", "which", "what", "who", "how",
+    "why", "from", "not", "did", "do", "does", "their", "its",
+}
+
+
+def _stem(token: str) -> str:
+    """Very light Hebrew stemming: drop one proclitic sequence, keeping at least 3 letters."""
+    if token and "א" <= token[0] <= "ת":
+        for prefix in _HEBREW_PREFIXES:
+            if token.startswith(prefix) and len(token) - len(prefix) >= 3:
+                return token[len(prefix):]
+    return token
+
+
+def _forms(token: str) -> Tuple[str, ...]:
+    """Surface and stemmed form – stemming is ambiguous, so a match on either counts."""
+    stem = _stem(token)
+    return (token,) if stem == token else (token, stem)
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized tokens (stopwords kept – needed for span contiguity)."""
+    return normalize_text(text).split()
+
+
+def content_tokens(tokens: Iterable[str]) -> List[str]:
+    return [t for t in tokens if len(t) > 1 and t not in _STOPWORDS and _stem(t) not in _STOPWORDS]
+
+
+class ChunkIndex:
+    """
+    Token index over one source chunk, built once per chunk and reused for every candidate.
+    Supports token overlap and longest matched (contiguous) span queries.
+    """
+
+    def __init__(self, text: str):
+        self.norm_text = normalize_text(text)
+        self.words = self.norm_text.split()
+        self.positions: Dict[str, List[int]] = {}
+        for i, word in enumerate(self.words):
+            for form in _forms(word):
+                self.positions.setdefault(form, []).append(i)
+
+    def _has(self, token: str) -> bool:
+        return any(form in self.positions for form in _forms(token))
+
+    def _positions_of(self, token: str) -> Iterable[int]:
+        forms = _forms(token)
+        if len(forms) == 1:
+            return self.positions.get(forms[0], ())
+        return set(self.positions.get(forms[0], ())) | set(self.positions.get(forms[1], ()))
+
+    def overlap(self, tokens: List[str]) -> float:
+        """Fraction of the candidate's content tokens that occur in the chunk."""
+        ct = content_tokens(tokens)
+        if not ct:
+            return 0.0
+        return sum(1 for t in ct if self._has(t)) / len(ct)
+
+    def longest_match(self, tokens: List[str]) -> Tuple[int, int]:
+        """
+        Longest run of consecutive candidate tokens that also appears contiguously in the chunk.
+        Returns (length, chunk_end_position) – length 0 when nothing matches.
+        """
+        best, best_end = 0, -1
+        prev: Dict[int, int] = {}
+        for tok in tokens:
+            cur: Dict[int, int] = {}
+            for p in self._positions_of(tok):
+                run = prev.get(p - 1, 0) + 1
+                cur[p] = run
+                if run > best:
+                    best, best_end = run, p
+            prev = cur
+        return best, best_end
+
+    def span_text(self, length: int, end: int) -> str:
+        return " ".join(self.words[end - length + 1:end + 1]) if length > 0 else ""
+
+    def contains(self, quote: str) -> bool:
+        """True if the normalized quote occurs verbatim in the normalized chunk."""
+        q = normalize_text(quote)
+        return bool(q) and q in self.norm_text
+
+
+class PrecheckResult(TypedDict):
+    decision: Literal["reject", "accept", "uncertain"]
+    overlap: float
+    answer_overlap: float
+    longest_span: int
+    evidence_spans: List[str]
+
+
+def precheck_grounding(index: ChunkIndex, answer: str, explanation: str) -> PrecheckResult:
+    """
+    Cheap lexical grounding screen for a candidate's answer + explanation.
+
+      - reject:    almost no shared vocabulary and no multi-token span with the chunk.
+      - accept:    high overlap, a long verbatim span, and the answer itself is in the chunk.
+      - uncertain: everything in between → send to the LLM grounding verifier.
+    """
+    answer_tokens = tokenize(answer or "")
+    claim_tokens = answer_tokens + tokenize(explanation or "")
+
+    overlap = index.overlap(claim_tokens)
+    answer_overlap = index.overlap(answer_tokens) if content_tokens(answer_tokens) else overlap
+    length, end = index.longest_match(claim_tokens)
+    spans = [index.span_text(length, end)] if length >= settings.GROUNDING_PRECHECK_MIN_SPAN else []
+
+    if not content_tokens(claim_tokens):
+        decision = "uncertain"
+    elif overlap < settings.GROUNDING_PRECHECK_REJECT_BELOW and length < settings.GROUNDING_PRECHECK_MIN_SPAN:
+        decision = "reject"
+    elif (
+        settings.GROUNDING_PRECHECK_LOCAL_ACCEPT
+        and overlap >= settings.GROUNDING_PRECHECK_ACCEPT_ABOVE
+        and answer_overlap >= settings.GROUNDING_PRECHECK_ACCEPT_ABOVE
+        and length >= 2 * settings.GROUNDING_PRECHECK_MIN_SPAN
+    ):
+        decision = "accept"
+    else:
+        decision = "uncertain"
+
+    return {
+        "decision": decision,
+        "overlap": round(overlap, 3),
+        "answer_overlap": round(answer_overlap, 3),
+        "longest_span": length,
+        "evidence_spans": spans,
+    }
+
+
+def reconcile_llm_grounding(result: Dict[str, Any], index: ChunkIndex) -> Dict[str, Any]:
+    """
+    Post-process an LLM grounding verdict against the chunk:
+      - keep only 'evidence_spans' that actually occur in the chunk (others → 'unverified_spans');
+      - derive 'grounded' from 'grounding_score' when the model did not set it;
+      - a verdict whose every cited span is fabricated is not grounded.
+    """
+    if not result or result.get("status") != "ok":
+        return result
+
+    spans = result.get("evidence_spans") or []
+    if isinstance(spans, str):
+        spans = [spans]
+    verified = [s for s in spans if isinstance(s, str) and index.contains(s)]
+    unverified = [s for s in spans if s not in verified]
+    result["evidence_spans"] = verified
+    if unverified:
+        result["unverified_spans"] = unverified
+
+    if "grounded" not in result:
+        try:
+            result["grounded"] = float(result.get("grounding_score", 0.0)) >= settings.GROUNDING_MIN_SCORE
+        except (TypeError, ValueError):
+            result["grounded"] = False
+    if spans and not verified:
+        result["grounded"] = False
+    return result
+
+
+__all__ = ["ChunkIndex", "precheck_grounding", "reconcile_llm_grounding", "tokenize"]
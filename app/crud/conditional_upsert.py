@@ -0,0 +1,51 @@
+# app/crud/conditional_upsert.py
+"""
+Fingerprinted upserts: a document is only rewritten when its contentHash changes.
+
+The update is an aggregation pipeline that keeps $$ROOT when the stored hash matches, so an
+unchanged document is a no-op on the server (nModified = 0, no oplog entry, updatedAt kept).
+"""
+from datetime import datetime
+from typing import Any, Dict, TypedDict
+
+from pymongo import UpdateOne
+
+from app.utils.hash import VOLATILE_FIELDS, content_hash
+
+
+# For out-of-band partial updates ({"$unset": STALE_HASH}): the stored contentHash no longer
+# describes the document, so the next fingerprinted upsert of the pipeline payload must write
+STALE_HASH = {"contentHash": ""}
+
+
+class UpsertStats(TypedDict):
+    inserted: int
+    changed: int
+    unchanged: int
+
+
+def fingerprint_update(doc: Dict[str, Any], merge: bool = False, now: str = None) -> list:
+    """
+    Update pipeline for 'doc' (its _id goes in the filter).
+    merge=False replaces the stored document (replace_one semantics);
+    merge=True overlays the fields onto it ($set semantics).
+    createdAt is kept from the stored document when present.
+    """
+    now = now or datetime.utcnow().isoformat()
+    digest = content_hash(doc)
+    new = {k: v for k, v in doc.items() if k not in VOLATILE_FIELDS}
+    new.update({"_id": doc["_id"], "contentHash": digest, "updatedAt": now})
+    created = {"createdAt": {"$ifNull": ["$createdAt", {"$literal": doc.get("createdAt", now)}]}}
+    target = {"$mergeObjects": (["$$ROOT"] if merge else []) + [created, {"$literal": new}]}
+    return [{"$replaceWith": {"$cond": [{"$ne": ["$contentHash", digest]}, target, "$$ROOT"]}}]
+
+
+def fingerprint_upsert_op(doc: Dict[str, Any], merge: bool = False, now: str = None) -> UpdateOne:
+    return UpdateOne({"_id": doc["_id"]}, fingerprint_update(doc, merge, now), upsert=True)
+
+
+def upsert_stats(total: int, inserted: int, changed: int, failed: int = 0) -> UpsertStats:
+    return {"inserted": inserted, "changed": changed, "unchanged": total - inserted - changed - failed}
+
+
+__all__ = ["fingerprint_update", "fingerprint_upsert_op", "upsert_stats", "UpsertStats", "STALE_HASH"]
@@ -1,7 +1,10 @@
 # app/crud/crud_block.py
-from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timedelta
-from app.core.config import get_db
+from app.core.config import get_db, settings
+from app.crud.pagination import DEFAULT_PAGE_SIZE, paginate, stream
+from app.utils.idempotency import deterministic_block_id
+from app.crud.conditional_upsert import STALE_HASH, fingerprint_upsert_op, upsert_stats
 
 # ➕ Insert / Upsert
 async def insert_block_if_not_exists(block_doc: dict):
@@ -48,12 +51,23 @@ async def find_recent_blocks(days_back: int = 7):
     cursor = db["blocks"].find({"createdAt": {"$gte": cutoff.isoformat()}})
     return [doc async for doc in cursor]
 
+# 📄 Paginated / streaming reads
+async def get_blocks_page(limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, query: dict = None,
+                          projection: dict = None):
+    db = get_db()
+    return await paginate(db["blocks"], query, limit=limit, cursor=cursor, projection=projection)
+
+async def iter_blocks(query: dict = None, projection: dict = None):
+    db = get_db()
+    async for doc in stream(db["blocks"], query, projection=projection):
+        yield doc
+
 # 🛠️ Update
 async def update_block_text(block_id: str, new_text: str):
     db = get_db()
     result = await db["blocks"].update_one(
         {"_id": block_id},
-        {"$set": {"content.text": new_text}}
+        {"$set": {"content.text": new_text}, "$unset": STALE_HASH}
     )
     return result.modified_count
 
@@ -61,7 +75,7 @@ async def add_evaluation_rubric(block_id: str, rubric: dict):
     db = get_db()
     result = await db["blocks"].update_one(
         {"_id": block_id},
-        {"$set": {"evaluationRubric": rubric}}
+        {"$set": {"evaluationRubric": rubric}, "$unset": STALE_HASH}
     )
     return result.modified_count
 
@@ -72,62 +86,121 @@ async def delete_block_by_id(block_id: str):
     return result.deleted_count
 
 # 📘 Question-type blocks
+# Stage 2 writes "question"; the others are legacy block types still present in older outlines
+QUESTION_BLOCK_TYPES = ["question", "Multiple_Choice_Question", "Open_Ended_Question", "True_False_Question"]
+
 async def get_question_blocks_by_outline(outline_id: str):
     db = get_db()
-    question_types = ["Multiple_Choice_Question", "Open_Ended_Question", "True_False_Question"]
     cursor = db["blocks"].find({
         "courseOutlineId": outline_id,
-        "blockType": {"$in": question_types}
+        "blockType": {"$in": QUESTION_BLOCK_TYPES}
     })
     return [doc async for doc in cursor]
 
-async def get_question_blocks_by_corpus(corpus_id: str):
+def question_blocks_by_corpus_pipeline(corpus_id: str) -> list:
+    """
+    outlines → blocks in one aggregation: outlines referencing the corpus (lessons.corpusId index),
+    joined to their question blocks (courseOutlineId_1_blockType_1_lessonId_1 index).
+    """
+    return [
+        {"$match": {"lessons.corpusId": corpus_id}},
+        {"$project": {"_id": 1}},
+        {"$lookup": {
+            "from": "blocks",
+            "localField": "_id",
+            "foreignField": "courseOutlineId",
+            "pipeline": [{"$match": {"blockType": {"$in": QUESTION_BLOCK_TYPES}}}],
+            "as": "block",
+        }},
+        {"$unwind": "$block"},
+        {"$replaceRoot": {"newRoot": "$block"}},
+    ]
+
+async def iter_question_blocks_by_corpus(corpus_id: str):
     db = get_db()
-    outlines_cursor = db["outlines"].find({
-        "lessons.corpusId": corpus_id
-    })
-    outline_ids = [outline["_id"] async for outline in outlines_cursor]
-
-    question_types = ["Multiple_Choice_Question", "Open_Ended_Question", "True_False_Question"]
-    cursor = db["blocks"].find({
-        "courseOutlineId": {"$in": outline_ids},
-        "blockType": {"$in": question_types}
-    })
-    return [doc async for doc in cursor]
+    async for doc in db["outlines"].aggregate(question_blocks_by_corpus_pipeline(corpus_id)):
+        yield doc
 
+async def get_question_blocks_by_corpus(corpus_id: str):
+    return [doc async for doc in iter_question_blocks_by_corpus(corpus_id)]
 
-async def bulk_upsert_blocks(blocks: list[dict]):
+async def find_question_stems(outline_id: str = None, lesson_id: str = None, page_id: str = None):
+    """
+    Stems of stored question blocks in a scope (outline / lesson / page).
+    Only the stem-bearing fields are projected; unset scope fields are not filtered on.
+    """
+    db = get_db()
+    query = {"blockType": "question"}
+    if outline_id:
+        query["courseOutlineId"] = outline_id
+    if lesson_id:
+        query["lessonId"] = lesson_id
+    if page_id:
+        query["pageId"] = page_id
+
+    projection = {
+        "_id": 0,
+        "content.question.stem": 1,
+        "content.question.instructions": 1,
+        "content.matching.instructions": 1,
+    }
+    stems = []
+    async for doc in db["blocks"].find(query, projection):
+        content = doc.get("content") or {}
+        q = content.get("question") or {}
+        stem = q.get("stem") or q.get("instructions") or (content.get("matching") or {}).get("instructions")
+        if isinstance(stem, str) and stem.strip():
+            stems.append(stem.strip())
+    return stems
+
+
+async def bulk_upsert_blocks_report(blocks: list[dict], ordered: bool = True, chunk_size: int = None):
     """
-    Efficiently upserts a list of blocks using bulk_write.
-    Assumes each block has a unique _id or deterministic key.
+    Upserts a list of blocks with bulk_write. Returns
+    {"refs": [...], "inserted": n, "changed": n, "unchanged": n, "failed": n}, where refs holds
+    one {"_id", "blockType"} per input in input order (+ "error" for rejected items).
+
+    Blocks without an _id get a deterministic one (see deterministic_block_id), so IDs are
+    known before the write and nothing is read back. Each block carries a contentHash and is
+    only rewritten when it changed (see conditional_upsert). Large inputs are sent in chunks.
+    ordered=True stops at the first failing write and raises BulkWriteError;
+    ordered=False writes every valid item and reports failures per ref.
     """
+    report = {"refs": [], "inserted": 0, "changed": 0, "unchanged": 0, "failed": 0}
+    if not blocks:
+        return report
     db = get_db()
+    chunk_size = chunk_size or settings.BLOCK_BULK_CHUNK_SIZE
 
-    ops = []
+    now = datetime.utcnow().isoformat()
+    refs, ops = [], []
     for block in blocks:
-        block["updatedAt"] = datetime.utcnow().isoformat()
-        if "createdAt" not in block:
-            block["createdAt"] = block["updatedAt"]
-
-        filter_key = {
-            "_id": block.get("_id")
-        } if "_id" in block else {
-            "pipeline_run_id": block["pipeline_run_id"],
-            "blockType": block["blockType"],
-            "content.questionText": block["content"].get("questionText", "")
-        }
-
-        ops.append(UpdateOne(
-            filter_key,
-            {"$set": block},
-            upsert=True
-        ))
-
-    if ops:
-        result = await db["blocks"].bulk_write(ops)
-        print(f"✅ Bulk upsert complete. Inserted: {result.upserted_count}, Modified: {result.modified_count}")
-
-    # Read back saved docs 
-    return [block async for block in db["blocks"].find({
-        "pipeline_run_id": blocks[0]["pipeline_run_id"]
-    })]
\ No newline at end of file
+        block.setdefault("_id", deterministic_block_id(block))
+        ops.append(fingerprint_upsert_op(block, merge=True, now=now))
+        refs.append({"_id": block["_id"], "blockType": block.get("blockType")})
+
+    inserted = changed = failed = 0
+    for start in range(0, len(ops), chunk_size):
+        try:
+            result = await db["blocks"].bulk_write(ops[start:start + chunk_size], ordered=ordered)
+            inserted += result.upserted_count
+            changed += result.modified_count
+        except BulkWriteError as e:
+            if ordered:
+                raise
+            details = e.details or {}
+            inserted += details.get("nUpserted", 0)
+            changed += details.get("nModified", 0)
+            for err in details.get("writeErrors", []):
+                refs[start + err["index"]]["error"] = err.get("errmsg", "write failed")
+                failed += 1
+
+    report.update(upsert_stats(len(ops), inserted, changed, failed), refs=refs, failed=failed)
+    print(f"✅ Bulk upsert complete. Inserted: {inserted}, Changed: {changed}, "
+          f"Unchanged: {report['unchanged']}, Failed: {failed}")
+    return report
+
+
+async def bulk_upsert_blocks(blocks: list[dict], ordered: bool = True, chunk_size: int = None):
+    """Same as bulk_upsert_blocks_report, returning only the per-input refs."""
+    return (await bulk_upsert_blocks_report(blocks, ordered, chunk_size))["refs"]
@@ -1,6 +1,8 @@
 # app/crud/crud_chat_history.py
 from datetime import datetime
-from app.core.config import get_db
+from pymongo.errors import DuplicateKeyError
+from app.core.config import get_db, settings
+from app.crud.pagination import ASCENDING, DEFAULT_PAGE_SIZE, DESCENDING, paginate, stream
 
 # 📝 Insert or Update a Full Chat Session
 async def upsert_chat_session(session_id: str, session_data: dict):
@@ -35,13 +37,153 @@ async def get_sessions_by_user(user_id: str):
     cursor = db["chat_history"].find({"userId": user_id})
     return [doc async for doc in cursor]
 
-# 🧼 Delete a Session
+# 📄 Sessions for a user, most recently updated first (pass projection={"messages": 0} for a listing)
+async def get_sessions_page(user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                            projection: dict = None):
+    db = get_db()
+    return await paginate(db["chat_history"], {"userId": user_id}, sort_field="updatedAt",
+                          direction=DESCENDING, limit=limit, cursor=cursor, projection=projection)
+
+async def iter_sessions_by_user(user_id: str, projection: dict = None):
+    db = get_db()
+    async for doc in stream(db["chat_history"], {"userId": user_id}, projection=projection,
+                            sort=[("updatedAt", DESCENDING)]):
+        yield doc
+
+# 🧼 Delete a Session (header + message buckets)
 async def delete_chat_session(session_id: str):
     db = get_db()
     result = await db["chat_history"].delete_one({"_id": session_id})
+    await db["chat_message_buckets"].delete_many({"sessionId": session_id})
     return result.deleted_count
 
 
+# 🪣 Bucketed messages
+# A session's messages live in chat_message_buckets documents of ~CHAT_BUCKET_SIZE messages;
+# the chat_history document is only the session header (userId, timestamps, messageCount).
+# Buckets are ordered by seq; buckets written before seq existed sort first, by _id.
+BUCKET_ORDER = [("seq", ASCENDING), ("_id", ASCENDING)]
+BUCKET_ORDER_DESC = [("seq", DESCENDING), ("_id", DESCENDING)]
+APPEND_MAX_ATTEMPTS = 10
+
+async def append_messages(session_id: str, user_id: str, messages: list):
+    """
+    Append messages in one atomic update on the session's open bucket (messageCount < CHAT_BUCKET_SIZE).
+    When every bucket is full a new one is inserted with the next seq; the unique (sessionId, seq)
+    index lets only one of two concurrent appenders create it, the other retries into it. The batch
+    always lands in a single bucket, so the last bucket may exceed the size by len(messages) - 1.
+    """
+    if not messages:
+        return
+    db = get_db()
+    buckets = db["chat_message_buckets"]
+    now = datetime.utcnow().isoformat()
+    for message in messages:
+        message.setdefault("timestamp", now)
+
+    for _ in range(APPEND_MAX_ATTEMPTS):
+        result = await buckets.update_one(
+            {"sessionId": session_id, "messageCount": {"$lt": settings.CHAT_BUCKET_SIZE}},
+            {
+                "$push": {"messages": {"$each": messages}},
+                "$inc": {"messageCount": len(messages)},
+                "$set": {"updatedAt": now},
+            },
+        )
+        if result.matched_count:
+            break
+        last = await buckets.find_one({"sessionId": session_id}, {"seq": 1}, sort=BUCKET_ORDER_DESC)
+        try:
+            await buckets.insert_one({
+                "sessionId": session_id,
+                "seq": (last or {}).get("seq", -1) + 1,
+                "userId": user_id,
+                "startedAt": now,
+                "updatedAt": now,
+                "messages": messages,
+                "messageCount": len(messages),
+            })
+            break
+        except DuplicateKeyError:
+            continue  # a concurrent append opened that bucket first
+    else:
+        raise RuntimeError(f"❌ Could not append to chat session {session_id}: bucket contention")
+
+    await db["chat_history"].update_one(
+        {"_id": session_id},
+        {
+            "$inc": {"messageCount": len(messages)},
+            "$set": {"updatedAt": now},
+            "$setOnInsert": {"userId": user_id, "createdAt": now},
+        },
+        upsert=True
+    )
+
+async def get_recent_messages(session_id: str, n: int = 20):
+    """Last n messages, oldest first; reads only the newest buckets, each sliced server-side."""
+    if n <= 0:
+        return []
+    db = get_db()
+    cursor = db["chat_message_buckets"].find(
+        {"sessionId": session_id},
+        {"messages": {"$slice": -n}, "_id": 1}
+    ).sort(BUCKET_ORDER_DESC)
+    newest_first = []
+    async for bucket in cursor:
+        newest_first.append(bucket["messages"])
+        if sum(len(m) for m in newest_first) >= n:
+            break
+    messages = [m for bucket in reversed(newest_first) for m in bucket]
+    return messages[-n:]
+
+async def get_messages_range(session_id: str, start: int, end: int):
+    """
+    Messages [start, end) of a session by position. Bucket sizes are read first (projected),
+    then only the buckets overlapping the range are fetched.
+    """
+    if end <= start:
+        return []
+    db = get_db()
+    wanted, offset = [], 0
+    async for bucket in db["chat_message_buckets"].find(
+        {"sessionId": session_id}, {"messageCount": 1}
+    ).sort(BUCKET_ORDER):
+        if offset < end and offset + bucket["messageCount"] > start:
+            wanted.append((bucket["_id"], offset))
+        offset += bucket["messageCount"]
+        if offset >= end:
+            break
+    if not wanted:
+        return []
+
+    offsets = dict(wanted)
+    messages = []
+    async for bucket in db["chat_message_buckets"].find(
+        {"_id": {"$in": list(offsets)}}, {"messages": 1}
+    ).sort(BUCKET_ORDER):
+        first = offsets[bucket["_id"]]
+        for i, message in enumerate(bucket["messages"]):
+            if start <= first + i < end:
+                messages.append(message)
+    return messages
+
+async def iter_session_messages(session_id: str):
+    """Every message of a session in order, one bucket in memory at a time."""
+    db = get_db()
+    async for bucket in db["chat_message_buckets"].find({"sessionId": session_id}).sort(BUCKET_ORDER):
+        for message in bucket["messages"]:
+            yield message
+
+
+# 🧠 Rolling summary cached on the session header (see app/core/services/chat_memory.py)
+async def save_session_summary(session_id: str, summary: str, summarized_count: int):
+    db = get_db()
+    await db["chat_history"].update_one(
+        {"_id": session_id},
+        {"$set": {"summary": summary, "summarizedCount": summarized_count}}
+    )
+
+
 # ✅ Simple helper to add a single message as a standalone chat (for free-form LLM chat)
 async def save_chat_message(user_id: str, user_input: str, llm_response: str):
     session_id = f"session_{user_id}"  # Or create unique session IDs if needed
@@ -53,15 +195,4 @@ async def save_chat_message(user_id: str, user_input: str, llm_response: str):
         "sender": "llm",
         "text": llm_response
     }
-    existing = await get_chat_session(session_id)
-    if not existing:
-        session_data = {
-            "_id": session_id,
-            "userId": user_id,
-            "createdAt": datetime.utcnow().isoformat(),
-            "messages": [message, response]
-        }
-        await upsert_chat_session(session_id, session_data)
-    else:
-        await append_message_to_session(session_id, message)
-        await append_message_to_session(session_id, response)
+    await append_messages(session_id, user_id, [message, response])
@@ -2,6 +2,7 @@
 from datetime import datetime, timedelta
 from app.core.config import get_db
 from bson import ObjectId
+from app.crud.pagination import DEFAULT_PAGE_SIZE, paginate, stream
 
 # ➕ Upsert
 async def upsert_document(doc: dict):
@@ -37,6 +38,26 @@ async def get_all_documents():
     cursor = db["content_corpus"].find()
     return [doc async for doc in cursor]
 
+# 📄 Paginated / streaming reads
+def _corpus_filters(subject: str = None, grade: str = None):
+    query = {}
+    if subject:
+        query["subject"] = subject
+    if grade:
+        query["gradeLevel"] = grade
+    return query
+
+async def find_documents_page(subject: str = None, grade: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                              cursor: str = None, projection: dict = None):
+    db = get_db()
+    return await paginate(db["content_corpus"], _corpus_filters(subject, grade),
+                          limit=limit, cursor=cursor, projection=projection)
+
+async def iter_documents(subject: str = None, grade: str = None, projection: dict = None):
+    db = get_db()
+    async for doc in stream(db["content_corpus"], _corpus_filters(subject, grade), projection=projection):
+        yield doc
+
 # ❌ Delete
 async def delete_document_by_id(doc_id: str):
     db = get_db()
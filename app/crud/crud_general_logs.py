@@ -1,4 +1,5 @@
 from app.core.config import get_db
+from app.crud.pagination import DEFAULT_PAGE_SIZE, DESCENDING, paginate, stream
 
 # ✅ Always pull the collection from the inside
 def get_collection():
@@ -11,6 +12,14 @@ async def insert_general_log(log_doc: dict):
     await collection.insert_one(log_doc)
     print(f"📥 Inserted log entry {log_doc['_id']}")
 
+async def insert_general_logs(log_docs: list):
+    """Batch insert used by the buffered log sink; unordered so one bad record does not stop the rest."""
+    if not log_docs:
+        return 0
+    collection = get_collection()
+    result = await collection.insert_many(log_docs, ordered=False)
+    return len(result.inserted_ids)
+
 # 🔍 Read
 async def get_all_logs():
     collection = get_collection()
@@ -32,6 +41,25 @@ async def get_logs_by_corpus_id(corpus_id: str):
     cursor = collection.find({"details.corpusId": corpus_id})
     return [doc async for doc in cursor]
 
+# 📄 Paginated / streaming reads (newest first)
+def _log_filters(level: str = None, source: str = None):
+    query = {}
+    if level:
+        query["level"] = level
+    if source:
+        query["source"] = source
+    return query
+
+async def get_logs_page(level: str = None, source: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                        cursor: str = None, projection: dict = None):
+    return await paginate(get_collection(), _log_filters(level, source), sort_field="timestamp",
+                          direction=DESCENDING, limit=limit, cursor=cursor, projection=projection)
+
+async def iter_logs(level: str = None, source: str = None, projection: dict = None):
+    async for doc in stream(get_collection(), _log_filters(level, source), projection=projection,
+                            sort=[("timestamp", DESCENDING)]):
+        yield doc
+
 # ❌ Delete
 async def delete_log_by_id(log_id: str):
     collection = get_collection()
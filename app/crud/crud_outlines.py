@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 from app.core.config import get_db
+from app.crud.conditional_upsert import STALE_HASH, fingerprint_update
+from app.crud.pagination import DEFAULT_PAGE_SIZE, paginate, stream
 
 # === Utility
 def get_collection():
@@ -18,12 +20,15 @@ async def insert_outline_if_not_exists(outline_doc: dict):
         print("📄 Outline document already exists.")
 
 async def upsert_outline(outline_doc: dict):
+    """Replace-upsert that skips the write when the outline's contentHash is unchanged."""
     db = get_db()
-    result = await db["outlines"].replace_one(
+    result = await db["outlines"].update_one(
         {"_id": outline_doc["_id"]},
-        outline_doc,
+        fingerprint_update(outline_doc),
         upsert=True
     )
+    if not result.upserted_id and not result.modified_count:
+        print("📄 Outline unchanged, write skipped.")
     return result.upserted_id or outline_doc["_id"]
 
 # 🔍 Reads
@@ -53,13 +58,31 @@ async def find_recent_outlines(days_back: int = 7):
     cursor = db["outlines"].find({"createdAt": {"$gte": cutoff.isoformat()}})
     return [doc async for doc in cursor]
 
+# 📄 Paginated / streaming reads
+def _outline_filters(subject: str = None, grade: str = None):
+    query = {}
+    if subject:
+        query["subject"] = subject
+    if grade:
+        query["gradeLevel"] = grade
+    return query
+
+async def find_outlines_page(subject: str = None, grade: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                             cursor: str = None, projection: dict = None):
+    return await paginate(get_collection(), _outline_filters(subject, grade),
+                          limit=limit, cursor=cursor, projection=projection)
+
+async def iter_outlines(subject: str = None, grade: str = None, projection: dict = None):
+    async for doc in stream(get_collection(), _outline_filters(subject, grade), projection=projection):
+        yield doc
+
 # 🛠️ Updates
 
 async def update_outline_status(outline_id: str, new_status: str):
     db = get_db()
     result = await db["outlines"].update_one(
         {"_id": outline_id},
-        {"$set": {"status": new_status}}
+        {"$set": {"status": new_status}, "$unset": STALE_HASH}
     )
     return result.modified_count
 
@@ -73,7 +96,8 @@ async def append_block_to_page(outline_id: str, page_id: str, block_id: str):
         {
             "$push": {
                 "lessons.$[].sections.$[].pages.$[page].blocks": block_id
-            }
+            },
+            "$unset": STALE_HASH,
         },
         array_filters=[{"page.pageId": page_id}]
     )
@@ -81,33 +105,57 @@ async def append_block_to_page(outline_id: str, page_id: str, block_id: str):
 
 # 🔗 Relations
 
-async def get_corpus_for_outline(outline_id: str):
-    db = get_db()
-    outline = await db["outlines"].find_one({"_id": outline_id})
-    if not outline:
-        return None
-    corpus_id = outline["lessons"][0]["corpusId"]
-    return await db["content_corpus"].find_one({"_id": corpus_id})
+def corpus_for_outline_pipeline(outline_id: str) -> list:
+    """The outline's (first lesson's) corpus, joined server-side."""
+    return [
+        {"$match": {"_id": outline_id}},
+        {"$project": {"corpusId": {"$arrayElemAt": ["$lessons.corpusId", 0]}}},
+        {"$lookup": {
+            "from": "content_corpus",
+            "localField": "corpusId",
+            "foreignField": "_id",
+            "as": "corpus",
+        }},
+        {"$unwind": "$corpus"},
+        {"$replaceRoot": {"newRoot": "$corpus"}},
+    ]
 
-async def validate_outline_dependencies(outline_doc: dict):
+async def get_corpus_for_outline(outline_id: str):
     db = get_db()
-    missing_corpus = []
-    missing_blocks = []
+    async for corpus in db["outlines"].aggregate(corpus_for_outline_pipeline(outline_id)):
+        return corpus
+    return None
 
+def collect_outline_references(outline_doc: dict):
+    """One traversal of the outline: (corpus IDs per lesson, block IDs per page), in document order."""
+    corpus_ids, block_ids = [], []
     for lesson in outline_doc.get("lessons", []):
-        corpus_id = lesson.get("corpusId")
-        if not await db["content_corpus"].find_one({"_id": corpus_id}):
-            missing_corpus.append(corpus_id)
-
+        corpus_ids.append(lesson.get("corpusId"))
         for section in lesson.get("sections", []):
             for page in section.get("pages", []):
-                for block_id in page.get("blocks", []):
-                    if not await db["blocks"].find_one({"_id": block_id}):
-                        missing_blocks.append(block_id)
+                block_ids.extend(page.get("blocks", []))
+    return corpus_ids, block_ids
+
+async def _existing_ids(collection, ids: list) -> set:
+    unique = list({i for i in ids if i is not None})
+    if not unique:
+        return set()
+    return {doc["_id"] async for doc in collection.find({"_id": {"$in": unique}}, {"_id": 1})}
+
+async def validate_outline_dependencies(outline_doc: dict):
+    """
+    Report referenced corpora / blocks that do not exist.
+    One $in query per collection (projected to _id), whatever the outline size.
+    """
+    db = get_db()
+    corpus_ids, block_ids = collect_outline_references(outline_doc)
+
+    existing_corpus = await _existing_ids(db["content_corpus"], corpus_ids)
+    existing_blocks = await _existing_ids(db["blocks"], block_ids)
 
     return {
-        "missingCorpus": missing_corpus,
-        "missingBlocks": missing_blocks
+        "missingCorpus": [c for c in corpus_ids if c not in existing_corpus],
+        "missingBlocks": [b for b in block_ids if b not in existing_blocks]
     }
 
 # ❌ Delete
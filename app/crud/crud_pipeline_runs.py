@@ -0,0 +1,108 @@
+# app/crud/crud_pipeline_runs.py
+"""
+pipeline_runs: one compact ledger document per Stage 1 / Stage 2 run (see app/core/services/run_ledger.py).
+
+Analytics group runs by topic / grade / question type / subject / stage. Latency percentiles use the
+$percentile accumulator (MongoDB 7.0+); documents expire through the finishedAt TTL index.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.core.config import get_db
+
+# API group-by names → ledger fields
+GROUP_FIELDS: Dict[str, str] = {
+    "topic": "topicName",
+    "grade": "gradeLevel",
+    "question_type": "questionType",
+    "subject": "subject",
+    "stage": "stage",
+}
+
+PERCENTILES = [0.5, 0.9, 0.95, 0.99]
+
+
+# ✅ Insert (once, at the end of the run)
+async def insert_pipeline_run(run_doc: dict):
+    db = get_db()
+    await db["pipeline_runs"].replace_one({"_id": run_doc["_id"]}, run_doc, upsert=True)
+
+
+# 🔍 Read
+async def get_pipeline_run(run_id: str) -> Optional[dict]:
+    db = get_db()
+    return await db["pipeline_runs"].find_one({"_id": run_id})
+
+
+# 📊 Analytics
+def _match(stage: Optional[str], since_hours: Optional[int], now: Optional[datetime] = None) -> dict:
+    match: dict = {}
+    if stage:
+        match["stage"] = stage
+    if since_hours:
+        match["finishedAt"] = {"$gte": (now or datetime.utcnow()) - timedelta(hours=since_hours)}
+    return match
+
+
+def _group_key(group_by: str) -> str:
+    if group_by not in GROUP_FIELDS:
+        raise ValueError(f"group_by must be one of {sorted(GROUP_FIELDS)}")
+    return "$" + GROUP_FIELDS[group_by]
+
+
+def latency_percentiles_pipeline(group_by: str, stage: Optional[str] = None, since_hours: Optional[int] = None,
+                                 step: Optional[str] = None, now: Optional[datetime] = None) -> List[dict]:
+    """Run duration (or one step's total seconds per run) percentiles per group."""
+    value = f"$steps.{step}.seconds" if step else "$durationSeconds"
+    match = _match(stage, since_hours, now)
+    if step:
+        match[f"steps.{step}"] = {"$exists": True}
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": _group_key(group_by),
+            "runs": {"$sum": 1},
+            "avgSeconds": {"$avg": value},
+            "maxSeconds": {"$max": value},
+            "percentiles": {"$percentile": {"input": value, "p": PERCENTILES, "method": "approximate"}},
+        }},
+        {"$sort": {"runs": -1}},
+    ]
+
+
+def cost_pipeline(group_by: str, stage: Optional[str] = None, since_hours: Optional[int] = None,
+                  now: Optional[datetime] = None) -> List[dict]:
+    return [
+        {"$match": _match(stage, since_hours, now)},
+        {"$group": {
+            "_id": _group_key(group_by),
+            "runs": {"$sum": 1},
+            "costUsd": {"$sum": "$totals.costUsd"},
+            "avgCostUsd": {"$avg": "$totals.costUsd"},
+            "tokensIn": {"$sum": "$totals.tokensIn"},
+            "tokensOut": {"$sum": "$totals.tokensOut"},
+            "llmCalls": {"$sum": "$totals.llmCalls"},
+            "accepted": {"$sum": "$acceptance.accepted"},
+        }},
+        # Cost per accepted question: the number capacity planning actually needs
+        {"$set": {"costPerAcceptedUsd": {
+            "$cond": [{"$gt": ["$accepted", 0]}, {"$divide": ["$costUsd", "$accepted"]}, None]
+        }}},
+        {"$sort": {"costUsd": -1}},
+    ]
+
+
+async def get_latency_percentiles(group_by: str, stage: Optional[str] = None, since_hours: Optional[int] = None,
+                                  step: Optional[str] = None) -> List[dict]:
+    db = get_db()
+    rows = await db["pipeline_runs"].aggregate(
+        latency_percentiles_pipeline(group_by, stage, since_hours, step)
+    ).to_list(length=None)
+    for row in rows:
+        row.update({f"p{int(p * 100)}": v for p, v in zip(PERCENTILES, row.pop("percentiles") or [])})
+    return rows
+
+
+async def get_cost_breakdown(group_by: str, stage: Optional[str] = None, since_hours: Optional[int] = None) -> List[dict]:
+    db = get_db()
+    return await db["pipeline_runs"].aggregate(cost_pipeline(group_by, stage, since_hours)).to_list(length=None)
@@ -0,0 +1,86 @@
+# app/crud/crud_question_counts.py
+"""
+Materialized dashboard counts: question blocks per outline and per corpus.
+
+Both views are rebuilt server-side with $group + $merge (no documents travel to the app) and
+read by _id. A refresh older than QUESTION_COUNTS_TTL_SECONDS is redone on the next read;
+rows that a refresh did not touch (e.g. an outline whose questions were all deleted) are removed.
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from app.core.config import get_db, settings
+from app.crud.crud_block import QUESTION_BLOCK_TYPES
+
+OUTLINE_COUNTS = "question_counts_by_outline"
+CORPUS_COUNTS = "question_counts_by_corpus"
+
+_last_refresh = 0.0
+_refresh_lock = asyncio.Lock()
+
+
+def outline_counts_pipeline(refreshed_at: datetime) -> list:
+    return [
+        {"$match": {"blockType": {"$in": QUESTION_BLOCK_TYPES}}},
+        {"$group": {"_id": "$courseOutlineId", "questionCount": {"$sum": 1}}},
+        {"$set": {"refreshedAt": refreshed_at}},
+        {"$merge": {"into": OUTLINE_COUNTS, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+def corpus_counts_pipeline(refreshed_at: datetime) -> list:
+    """Runs on outlines after the per-outline view is fresh; an outline counts once per corpus."""
+    return [
+        {"$project": {"corpusId": {"$setUnion": ["$lessons.corpusId", []]}}},
+        {"$unwind": "$corpusId"},
+        {"$lookup": {"from": OUTLINE_COUNTS, "localField": "_id", "foreignField": "_id", "as": "counts"}},
+        {"$group": {
+            "_id": "$corpusId",
+            "outlineCount": {"$sum": 1},
+            "questionCount": {"$sum": {"$ifNull": [{"$first": "$counts.questionCount"}, 0]}},
+        }},
+        {"$set": {"refreshedAt": refreshed_at}},
+        {"$merge": {"into": CORPUS_COUNTS, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def refresh_question_counts():
+    """Rebuild both views now."""
+    global _last_refresh
+    db = get_db()
+    refreshed_at = datetime.utcnow().replace(microsecond=0)
+    await db["blocks"].aggregate(outline_counts_pipeline(refreshed_at)).to_list(length=None)
+    await db[OUTLINE_COUNTS].delete_many({"refreshedAt": {"$lt": refreshed_at}})
+    await db["outlines"].aggregate(corpus_counts_pipeline(refreshed_at)).to_list(length=None)
+    await db[CORPUS_COUNTS].delete_many({"refreshedAt": {"$lt": refreshed_at}})
+    _last_refresh = time.monotonic()
+    print(f"📊 Question counts refreshed at {refreshed_at.isoformat()}")
+
+
+async def ensure_fresh_question_counts(max_age_seconds: int = None):
+    """Refresh when the views are older than max_age_seconds; concurrent callers share one refresh."""
+    max_age = settings.QUESTION_COUNTS_TTL_SECONDS if max_age_seconds is None else max_age_seconds
+    if time.monotonic() - _last_refresh < max_age:
+        return
+    async with _refresh_lock:
+        if time.monotonic() - _last_refresh >= max_age:
+            await refresh_question_counts()
+
+
+async def get_question_count_for_outline(outline_id: str) -> int:
+    await ensure_fresh_question_counts()
+    db = get_db()
+    doc = await db[OUTLINE_COUNTS].find_one({"_id": outline_id}, {"questionCount": 1})
+    return doc["questionCount"] if doc else 0
+
+
+async def get_question_count_for_corpus(corpus_id: str) -> dict:
+    """{"questionCount": n, "outlineCount": m} for the corpus (zeros if it is unused)."""
+    await ensure_fresh_question_counts()
+    db = get_db()
+    doc = await db[CORPUS_COUNTS].find_one({"_id": corpus_id}, {"questionCount": 1, "outlineCount": 1})
+    return {
+        "questionCount": doc["questionCount"] if doc else 0,
+        "outlineCount": doc["outlineCount"] if doc else 0,
+    }
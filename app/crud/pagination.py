@@ -0,0 +1,151 @@
+# app/crud/pagination.py
+"""
+Keyset (cursor) pagination and streaming readers shared by the CRUD modules.
+
+Pages are ordered by (sort_field, _id) and continue from the last returned key, so each page
+costs one indexed range scan regardless of how deep the client is – no skip(). The cursor is
+an opaque token carrying that last key (bson extended JSON keeps ObjectId/datetime types).
+"""
+import base64
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, TypedDict
+
+from bson import Binary, Decimal128, Int64, ObjectId, Timestamp, json_util
+from pymongo import ASCENDING, DESCENDING
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+
+class Page(TypedDict):
+    items: List[dict]
+    next_cursor: Optional[str]   # None → last page
+
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    payload = {"v": doc.get(sort_field) if sort_field != "_id" else None, "id": doc["_id"]}
+    return base64.urlsafe_b64encode(json_util.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    try:
+        return json_util.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+# BSON comparison order (https://www.mongodb.com/docs/manual/reference/bson-type-comparison-order/).
+# $gt / $lt only match values of the cursor's own type, so a page boundary must also take every
+# value of a type that sorts after (ascending) or before (descending) it. Blocks for instance
+# mix ObjectId _ids with deterministic "block_<hex>" string _ids.
+_TYPE_ORDER = ["null", "number", "string", "object", "array", "binData", "objectId", "bool", "date",
+               "timestamp", "regex"]
+
+
+def _bson_type(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return _TYPE_ORDER.index("bool")
+    if isinstance(value, (int, float, Int64, Decimal128)):
+        return _TYPE_ORDER.index("number")
+    if isinstance(value, str):
+        return _TYPE_ORDER.index("string")
+    if isinstance(value, dict):
+        return _TYPE_ORDER.index("object")
+    if isinstance(value, (list, tuple)):
+        return _TYPE_ORDER.index("array")
+    if isinstance(value, (bytes, Binary)):
+        return _TYPE_ORDER.index("binData")
+    if isinstance(value, ObjectId):
+        return _TYPE_ORDER.index("objectId")
+    if isinstance(value, datetime):
+        return _TYPE_ORDER.index("date")
+    if isinstance(value, Timestamp):
+        return _TYPE_ORDER.index("timestamp")
+    return _TYPE_ORDER.index("regex")
+
+
+def _beyond(field: str, value: Any, op: str) -> List[dict]:
+    """Clauses matching every 'field' value strictly after 'value' in BSON sort order."""
+    rank = _bson_type(value)
+    clauses = [{field: {op: value}}] if value is not None else []
+    other_types = _TYPE_ORDER[rank + 1:] if op == "$gt" else _TYPE_ORDER[:rank]
+    if "null" in other_types:
+        clauses.append({field: None})  # null and missing sort together; $type "null" misses the latter
+    other_types = [t for t in other_types if t != "null"]
+    if other_types:
+        clauses.append({field: {"$type": other_types}})
+    return clauses
+
+
+def _any(clauses: List[dict]) -> dict:
+    if not clauses:
+        return {"_id": {"$in": []}}  # nothing sorts past this key
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def _after(cursor: Dict[str, Any], sort_field: str, direction: int) -> dict:
+    op = "$gt" if direction == ASCENDING else "$lt"
+    if sort_field == "_id":
+        return _any(_beyond("_id", cursor["id"], op))
+    return {"$or": _beyond(sort_field, cursor["v"], op) + [
+        {"$and": [{sort_field: cursor["v"]}, _any(_beyond("_id", cursor["id"], op))]},
+    ]}
+
+
+async def paginate(
+    collection,
+    query: Optional[dict] = None,
+    *,
+    sort_field: str = "_id",
+    direction: int = ASCENDING,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    projection: Optional[dict] = None,
+) -> Page:
+    """
+    One page of 'query' results plus the cursor for the next one.
+    'projection' may drop fields but the sort field and _id are always returned.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = dict(query or {})
+    if cursor:
+        after = _after(decode_cursor(cursor), sort_field, direction)
+        query = {"$and": [query, after]} if query else after
+    if projection:
+        projection = {k: v for k, v in projection.items() if k != "_id"}  # _id is the tie-breaker
+        if any(projection.values()):
+            projection[sort_field] = 1
+
+    sort = [(sort_field, direction)] if sort_field == "_id" else [(sort_field, direction), ("_id", direction)]
+    docs = await collection.find(query, projection or None).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+    has_more = len(docs) > limit
+    items = docs[:limit]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(items[-1], sort_field) if has_more and items else None,
+    }
+
+
+async def stream(
+    collection,
+    query: Optional[dict] = None,
+    *,
+    projection: Optional[dict] = None,
+    sort: Optional[list] = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    """Yield matching documents one by one; memory stays at one server batch."""
+    cursor = collection.find(query or {}, projection, batch_size=batch_size)
+    if sort:
+        cursor = cursor.sort(sort)
+    async for doc in cursor:
+        yield doc
+
+
+__all__ = [
+    "paginate", "stream", "encode_cursor", "decode_cursor", "Page",
+    "DEFAULT_PAGE_SIZE", "MAX_PAGE_SIZE", "ASCENDING", "DESCENDING",
+]
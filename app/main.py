@@ -6,11 +6,14 @@ from fastapi.responses import FileResponse, JSONResponse
 from fastapi.exceptions import RequestValidationError
 
 # 🧠 Database + Models
-from app.core.config import init_db
+from app.core.config import init_db, settings
+from app.core.mongo_log_handler import install_mongo_log_handler, shutdown_mongo_log_handler
+from app.core.loop_monitor import LoopMonitorMiddleware, install_loop_monitor, shutdown_loop_monitor
+from app.core.request_profiler import ProfilingMiddleware
 from app.models.content_corpus import ContentCorpus
 
 # 🔗 API Routers
-from app.api.v1.endpoints import generate, content_corpus, stage2
+from app.api.v1.endpoints import generate, content_corpus, stage2, listing, metrics, pipeline_runs
 from app.api.v1.endpoints import chatbot
 from app.api.v1.endpoints import llm_orchestrator
 from app.api.v1 import free_chat
@@ -38,11 +41,23 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.on_event("startup")
 async def on_startup():
     await init_db()
+    install_mongo_log_handler()
+    install_loop_monitor()
+
+# 🛑 Shutdown hook: flush buffered logs
+@app.on_event("shutdown")
+async def on_shutdown():
+    shutdown_loop_monitor()
+    await shutdown_mongo_log_handler()
 
 # 🔌 Include API routers
 app.include_router(generate.router, prefix="/api/v1", tags=["Content Corpus"])
 app.include_router(content_corpus.router, prefix="/api/v1", tags=["Content Corpus"])
 app.include_router(stage2.router, prefix="/api/v1", tags=["Stage 2"])
+app.include_router(listing.router, prefix="/api/v1", tags=["Listing"])
+app.include_router(metrics.traces_router, prefix="/api/v1", tags=["Observability"])
+app.include_router(pipeline_runs.router, prefix="/api/v1", tags=["Observability"])
+app.include_router(metrics.router, tags=["Observability"])
 
 # 📁 Static files (HTML, CSS, JS)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -56,6 +71,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 🐢 Opt-in event-loop monitor: tags request tasks with their route for blocking reports
+if settings.LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopMonitorMiddleware)
+
+# 🔬 On-demand request profiling (only installed when a token is configured)
+if settings.PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
 # 🧾 HTML endpoints (for forms)
 @app.get("/generate-corpus", tags=["Content Corpus"])
 async def serve_generate_html():
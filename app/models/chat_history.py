@@ -19,3 +19,16 @@ class ChatHistory(Document):
 
     class Settings:
         name = "chat_history"
+
+
+class ChatMessageBucket(Document):
+    """Fixed-size slice of a session's messages (see crud_chat_history.append_messages)."""
+    sessionId: str
+    userId: str
+    messageCount: int = 0
+    messages: List[dict] = Field(default_factory=list)
+    startedAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "chat_message_buckets"
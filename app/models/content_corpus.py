@@ -87,6 +87,8 @@ class ContentCorpus(Document):
     content: Content
     pedagogicalAnalysis: Optional[PedagogicalAnalysis] = None
     pipelineMeta: Optional[Dict[str, Any]] = None
+    # app.utils.hash.content_hash of the saved payload; unchanged re-runs skip the write
+    contentHash: Optional[str] = None
 
     class Settings:
         name = "content_corpus"
@@ -2,6 +2,11 @@
 from abc import ABC, abstractmethod
 
 class BaseLLMService(ABC):
+    # Model label and token usage ({"input_tokens", "output_tokens"}) of the latest chat() call,
+    # for callers that trace the call (services return plain text)
+    model_name: str = ""
+    last_usage: dict = {}
+
     @abstractmethod
     async def chat(self, messages: list[dict]) -> str:
         pass
\ No newline at end of file
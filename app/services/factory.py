@@ -8,9 +8,21 @@ from app.services.gemini_service import GeminiService
 from app.services.graq_service import GraqService
 from app.services.local_service import LocalService
 
+# Default model of each provider whose API is not OpenAI-compatible
+NON_OPENAI_MODELS = {
+    "anthropic": "claude-3-opus-20240229",
+    "gemini": "gemini-pro",
+    "local": "mistral",
+}
+
 def get_llm_service(provider: str = None) -> BaseLLMService:
     provider = (provider or settings.LLM_PROVIDER).lower()
-    
+
+    # LLM_BASE_URL (e.g. the stand-in server) only speaks OpenAI chat completions: providers with
+    # another wire format go through the OpenAI client, keeping their model name for the logs
+    if settings.LLM_BASE_URL and provider in NON_OPENAI_MODELS:
+        return OpenAIService(model=NON_OPENAI_MODELS[provider])
+
     if provider == "openai":
         return OpenAIService()
     elif provider == "anthropic":
@@ -23,5 +35,9 @@ def get_llm_service(provider: str = None) -> BaseLLMService:
         return GraqService()
     elif provider == "local":
         return LocalService()
+    elif provider == "fake":
+        from app.services.fake_service import FakeService
+
+        return FakeService()
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
\ No newline at end of file
@@ -0,0 +1,307 @@
+# app/services/fake_llm.py
+"""
+Offline, deterministic stand-in for the chat model (LLM_PROVIDER=fake).
+
+FakeChatModel is a LangChain chat model, so it drops into every agent through
+model_router.get_chat_model (chains, route_json, direct ainvoke). It recognises each agent prompt
+by a phrase of its system message and answers with schema-valid JSON built from the request
+itself (the chunk text, the requested question type, the lesson title, ...), so Stage 1 and
+Stage 2 run end to end without network access or spend.
+
+Everything random (latency, injected errors, verifier rejections, question wording) is drawn from
+an RNG seeded with FAKE_LLM_SEED + the prompt digest + how often that prompt was seen, so a run is
+reproducible regardless of how concurrent calls interleave.
+
+    FAKE_LLM_LATENCY      "0" | "250" | "uniform:100,400" | "normal:300,80" | "lognormal:300,0.5"  (ms)
+    FAKE_LLM_ERROR_RATE   share of calls that raise FakeLLMError (simulated 5xx / rate limit)
+    FAKE_LLM_REJECT_RATE  share of verifier verdicts that do not match the target
+    FAKE_LLM_CHARS_PER_TOKEN  usage_metadata token estimate
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from app.core.config import settings
+
+
+class FakeLLMError(RuntimeError):
+    """Injected failure (FAKE_LLM_ERROR_RATE)."""
+
+
+# ---- Latency ----
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency spec (milliseconds) → sampler returning seconds."""
+    spec = (spec or "0").strip().lower()
+    kind, _, args = spec.partition(":")
+    if not args:
+        fixed = float(kind) / 1000
+        return lambda rng: fixed
+    a, _, b = args.partition(",")
+    a, b = float(a), float(b or 0)
+    if kind == "uniform":
+        return lambda rng: rng.uniform(a, b) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(a, b)) / 1000
+    if kind == "lognormal":
+        # a = median in ms, b = sigma of the underlying normal (long right tail, like real APIs)
+        return lambda rng: rng.lognormvariate(0.0, b) * a / 1000
+    raise ValueError(f"Unsupported FAKE_LLM_LATENCY: {spec!r}")
+
+
+# ---- Request parsing helpers ----
+_VARIATION_RE = re.compile(r"^.*Request ID:.*$", re.MULTILINE)
+_WORD_RE = re.compile(r"[^\W\d_]{4,}", re.UNICODE)
+
+STEM_OPENERS = [
+    "Which statement from the text best explains",
+    "What does the passage say about",
+    "According to the source, why is it important to consider",
+    "Which detail in the text supports the idea of",
+    "How does the reading describe the connection between",
+    "What can a student conclude from the text regarding",
+]
+
+
+def _field(text: str, label: str, default: str = "") -> str:
+    match = re.search(rf"{re.escape(label)}\s*:\s*(.+)", text)
+    return match.group(1).split("#")[0].strip() if match else default
+
+
+def _chunks(text: str) -> List[str]:
+    parts = re.split(r"^### Chunk \d+ \(id=[^)]*\):\s*$", text, flags=re.MULTILINE)[1:]
+    return [re.split(r"^##", part, maxsplit=1, flags=re.MULTILINE)[0].strip() for part in parts]
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if len(s.split()) >= 4]
+
+
+def _between(text: str, start: str, end: str) -> str:
+    _, _, rest = text.partition(start)
+    return rest.split(end, 1)[0].strip()
+
+
+# ---- Canned responders, keyed by a phrase of the agent's system prompt ----
+def _question(user: str, rng: random.Random) -> dict:
+    qtype = _field(user, "- Question Type", "mcq").lower()
+    text = " ".join(_chunks(user)) or _field(user, "- Topic", "the topic")
+    sentences = _sentences(text) or [text]
+    sentence = rng.choice(sentences)
+    words = list(dict.fromkeys(w.lower() for w in _WORD_RE.findall(text))) or ["topic"]
+    keywords = rng.sample(words, k=min(3, len(words)))
+    stem = f"{rng.choice(STEM_OPENERS)} {', '.join(keywords)}?"
+
+    if qtype == "open":
+        return {"type": "open", "stem": stem, "expected_answer": sentence,
+                "guidance": "Look for the sentence in the text that answers this."}
+    if qtype == "matching":
+        pairs = [[w, f"definition of {w}"] for w in keywords] or [["term", "definition"]]
+        return {"type": "matching", "instructions": stem, "pairs": pairs, "distractors": ["an unrelated idea"]}
+
+    distractors = [s for s in sentences if s != sentence][:3]
+    distractors += ["None of the ideas in the text.", "The text does not discuss this.",
+                    "Only the opposite is true."][: 3 - len(distractors)]
+    choices = distractors[:]
+    correct_index = rng.randrange(len(choices) + 1)
+    choices.insert(correct_index, sentence)
+    return {"type": "mcq", "stem": stem, "choices": choices, "correct_index": correct_index,
+            "explanation": f"The text states: {sentence}"}
+
+
+def _question_generator(system: str, user: str, rng: random.Random) -> str:
+    return json.dumps({"questions": [_question(user, rng)]}, ensure_ascii=False)
+
+
+def _verdict(rng: random.Random) -> Tuple[bool, float]:
+    matched = rng.random() >= settings.FAKE_LLM_REJECT_RATE
+    return matched, (0.9 if matched else 0.3)
+
+
+def _bloom(system: str, user: str, rng: random.Random) -> str:
+    matched, score = _verdict(rng)
+    return json.dumps({"status": "ok", "detected_level": "understand", "match_score": score,
+                       "matches_target": matched, "justification": "fake verdict"})
+
+
+def _difficulty(system: str, user: str, rng: random.Random) -> str:
+    matched, score = _verdict(rng)
+    return json.dumps({"status": "ok", "detected_difficulty": "medium", "match_score": score,
+                       "matches_target": matched, "justification": "fake verdict"})
+
+
+def _grounding(system: str, user: str, rng: random.Random) -> str:
+    matched, score = _verdict(rng)
+    chunk = _between(user, "Source Chunk:", "Analyze carefully")
+    spans = [" ".join(chunk.split()[:8])] if matched and chunk else []
+    return json.dumps({"status": "ok", "grounding_score": score, "evidence_spans": spans,
+                       "justification": "fake verdict"}, ensure_ascii=False)
+
+
+def _text_editor(system: str, user: str, rng: random.Random) -> str:
+    _, _, rest = user.partition("Text to Edit")
+    text = rest.partition("\n")[2].split("The output should be formatted", 1)[0].strip()
+    return json.dumps({"status": "ok", "edited_text": text, "justification": "No changes needed"},
+                      ensure_ascii=False)
+
+
+def _course_scoping(system: str, user: str, rng: random.Random) -> str:
+    topic = _field(user, "Topic", "the topic")
+    n = int(_field(user, "Number of Lessons", "3") or 3)
+    return json.dumps({"lessons": [
+        {"title": f"{topic}: part {i}", "summary": f"Lesson {i} of the unit on {topic}."} for i in range(1, n + 1)
+    ]}, ensure_ascii=False)
+
+
+def _lesson_content(system: str, user: str, rng: random.Random) -> str:
+    title = _field(user, "Lesson Title", "Lesson")
+    index = int(_field(user, "Lesson Index", "1") or 1)
+    paragraph = f"This section of '{title}' introduces the main ideas step by step."
+    return json.dumps({
+        "lessonTitle": title,
+        "lessonIndex": index,
+        "introduction": {"title": f"Welcome to {title}", "text": paragraph},
+        "coreParagraphs": [
+            {"title": f"Core idea {i}", "text": paragraph, "tags": [tag]}
+            for i, tag in enumerate(("concept", "theme", "analysis"), start=1)
+        ],
+        "summary": {"title": "Summary", "text": f"We reviewed the key points of {title}."},
+        "discussionQuestions": [f"Why does {title} matter today?", f"How would you explain {title} to a friend?"],
+    }, ensure_ascii=False)
+
+
+def _contextual(system: str, user: str, rng: random.Random) -> str:
+    return json.dumps({
+        "summary": f"Guidance for {_field(user, 'Subject', 'the subject')}, grade {_field(user, 'Grade Level')}.",
+        "themes": [_field(user, "Big Idea", "big idea")],
+        "skills": [_field(user, "Target Skills", "analysis")],
+        "misconceptions": ["Confusing correlation with causation."],
+        "pedagogicalNotes": "Start from a concrete example.",
+    }, ensure_ascii=False)
+
+
+def _json_repair(system: str, user: str, rng: random.Random) -> str:
+    return json.dumps({"items": []})
+
+
+def _chat_summary(system: str, user: str, rng: random.Random) -> str:
+    return "The user and the assistant discussed the course material."
+
+
+def _default(system: str, user: str, rng: random.Random) -> str:
+    return f"(fake response) {user[:200]}"
+
+
+RESPONDERS: List[Tuple[str, Callable[[str, str, random.Random], str]]] = [
+    ("expert educational content creator", _question_generator),
+    ("Bloom's Taxonomy reasoning assistant", _bloom),
+    ("Question Difficulty Verifier Agent", _difficulty),
+    ("grounding verification assistant", _grounding),
+    ("-language editor for educational LMS", _text_editor),
+    ("curriculum architect", _course_scoping),
+    ("expert lesson content writer", _lesson_content),
+    ("curriculum continuity expert", _contextual),
+    ("JSON repair assistant", _json_repair),
+    ("running summary of a conversation", _chat_summary),
+]
+
+
+def canned_response(system: str, user: str, rng: random.Random) -> str:
+    for marker, responder in RESPONDERS:
+        if marker in system:
+            return responder(system, user, rng)
+    return _default(system, user, rng)
+
+
+def canned_wikipedia_summary(topic: str) -> str:
+    return (
+        f"{topic} is a topic studied in schools. Historians and scientists describe {topic} through "
+        f"its causes, its main events and its consequences. Students who learn about {topic} compare "
+        f"sources and explain how ideas changed over time."
+    )
+
+
+# ---- Chat model ----
+# Process-wide call counters (read by benchmarks/bench_pipeline.py for LLM calls per accepted question)
+fake_llm_stats: Dict[str, int] = {"calls": 0, "errors": 0, "tokens_in": 0, "tokens_out": 0}
+
+
+class FakeChatModel(BaseChatModel):
+    model_name: str = "fake"
+    temperature: float = 0.0
+    latency: str = "0"
+    error_rate: float = 0.0
+    seed: int = 0
+    chars_per_token: float = 4.0
+
+    _seen: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @classmethod
+    def from_settings(cls, model: str, temperature: float = 0.0) -> "FakeChatModel":
+        return cls(
+            model_name=model,
+            temperature=temperature,
+            latency=settings.FAKE_LLM_LATENCY,
+            error_rate=settings.FAKE_LLM_ERROR_RATE,
+            seed=settings.FAKE_LLM_SEED,
+            chars_per_token=settings.FAKE_LLM_CHARS_PER_TOKEN,
+        )
+
+    def plan_response(self, messages: List[BaseMessage]) -> Tuple[AIMessage, float, bool]:
+        """Response, latency (s) and whether to fail – all fixed by the prompt and its repeat count."""
+        system = "\n".join(str(m.content) for m in messages if m.type == "system")
+        user = "\n".join(str(m.content) for m in messages if m.type != "system")
+        digest = hashlib.sha256(_VARIATION_RE.sub("", system + "\x00" + user).encode("utf-8")).hexdigest()[:16]
+        n = self._seen.get(digest, 0)
+        self._seen[digest] = n + 1
+        rng = random.Random(f"{self.seed}:{digest}:{n}")
+
+        delay = parse_latency(self.latency)(rng)
+        fail = rng.random() < self.error_rate
+        content = canned_response(system, user, rng)
+        tokens_in = max(1, round((len(system) + len(user)) / self.chars_per_token))
+        tokens_out = max(1, round(len(content) / self.chars_per_token))
+        fake_llm_stats["calls"] += 1
+        fake_llm_stats["errors"] += fail
+        fake_llm_stats["tokens_in"] += tokens_in
+        fake_llm_stats["tokens_out"] += tokens_out
+        message = AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": tokens_in, "output_tokens": tokens_out,
+                            "total_tokens": tokens_in + tokens_out},
+            response_metadata={"model_name": self.model_name, "finish_reason": "stop"},
+        )
+        return message, delay, fail
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message, delay, fail = self.plan_response(messages)
+        time.sleep(delay)
+        if fail:
+            raise FakeLLMError("Simulated LLM failure (FAKE_LLM_ERROR_RATE)")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message, delay, fail = self.plan_response(messages)
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeLLMError("Simulated LLM failure (FAKE_LLM_ERROR_RATE)")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+__all__ = [
+    "FakeChatModel", "FakeLLMError", "canned_response", "canned_wikipedia_summary", "fake_llm_stats", "parse_latency",
+]
@@ -0,0 +1,29 @@
+# app/services/fake_service.py
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.services.base import BaseLLMService
+from app.services.fake_llm import FakeChatModel
+
+_ROLES = {"system": SystemMessage, "assistant": AIMessage}
+
+
+class FakeService(BaseLLMService):
+    """Provider-service wrapper around FakeChatModel (LLM_PROVIDER=fake)."""
+
+    def __init__(self):
+        self.model = FakeChatModel.from_settings("fake")
+        self.model_name = "fake"
+
+    async def chat(self, messages: list[dict]) -> str:
+        response = await self.model.ainvoke([_ROLES.get(m["role"], HumanMessage)(content=m["content"]) for m in messages])
+        self.last_usage = dict(response.usage_metadata or {})
+        return response.content
+
+    async def ainvoke(self, prompt: str) -> str:
+        return await self.chat([
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt},
+        ])
+
+    async def run(self, prompt: str) -> str:
+        return await self.ainvoke(prompt)
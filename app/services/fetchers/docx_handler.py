@@ -1,13 +1,10 @@
 import os
 import re
 import json
-import ftfy
 from datetime import datetime
 from typing import Optional
-from docx import Document
-from docx.table import Table
-from docx.oxml.ns import qn
-from docx.shared import Inches
+
+# python-docx / ftfy are imported where used so importing this module stays cheap
 
 class DocxExtractor:
     def __init__(self, path: str):
@@ -16,6 +13,8 @@ class DocxExtractor:
         self.basename = os.path.splitext(self.filename)[0]
         self.text = ""
         self.metadata = {}
+        from docx import Document
+
         self.document = Document(path)
 
     def is_hebrew(self, text: str, threshold: float = 0.2) -> bool:
@@ -26,6 +25,8 @@ class DocxExtractor:
         if not text:
             return ""
         if "�" in text or "\u202e" in text or sum(1 for c in text if ord(c) > 127) / len(text) > 0.3:
+            import ftfy
+
             return ftfy.fix_text(text).strip()
         return text.strip()
 
@@ -3,26 +3,28 @@ import os
 import json
 from datetime import datetime
 from typing import Optional
-from PyPDF2 import PdfReader
-from pdfminer.high_level import extract_text as pdfminer_extract
-from pdf2image import convert_from_path
-from pytesseract import image_to_string
-from langdetect import detect
-import pdfplumber
-import fitz  # PyMuPDF
-import ftfy
 import re
 import csv
 import logging
-from pytesseract import image_to_string, pytesseract
-from langdetect.lang_detect_exception import LangDetectException
-from pdfminer.pdfparser import PDFSyntaxError
 
-pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+# Extraction backends (PyPDF2, pdfminer, pdfplumber, PyMuPDF, pdf2image, pytesseract,
+# langdetect, ftfy) are imported inside the functions that use them: importing this
+# module must not pay for them on every worker boot.
+
+TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 POPPLER_BIN_PATH = os.path.join("../tools", "poppler", "poppler-23.11.0", "Library", "bin")
 
+
+def _ocr_backend():
+    """(convert_from_path, image_to_string), importing pdf2image/pytesseract on first OCR."""
+    from pdf2image import convert_from_path
+    from pytesseract import image_to_string, pytesseract
+
+    pytesseract.tesseract_cmd = TESSERACT_CMD
+    return convert_from_path, image_to_string
+
 def is_hebrew(text: str, threshold: float = 0.2) -> bool:
     hebrew_chars = re.findall(r'[֐-׿]', text)
     return (len(hebrew_chars) / len(text)) >= threshold if text else False
@@ -35,6 +37,9 @@ def reverse_hebrew_lines(text: str) -> str:
     return "\n".join(reverse_if_hebrew(line) for line in text.splitlines())
 
 def detect_language_safe(text: str) -> str:
+    from langdetect import detect
+    from langdetect.lang_detect_exception import LangDetectException
+
     try:
         clean_text = re.sub(r"[^א-תa-zA-Z ]+", "", text)
         return detect(clean_text)
@@ -45,16 +50,20 @@ def fix_encoding_if_needed(text: str) -> str:
     if not text:
         return ""
     if any(c in text for c in ["\u202e", "�"]):
+        import ftfy
+
         return ftfy.fix_text(text)
     return text
 
 
 def extract_text_with_ocr(path: str, lang: str = "heb+eng") -> str:
+    convert_from_path, image_to_string = _ocr_backend()
     pages = convert_from_path(path, dpi=300, poppler_path=POPPLER_BIN_PATH)
     return "\n\n".join(image_to_string(p, lang=lang) for p in pages)
 
 # Extract text via OCR from image-based PDFs
 def extract_text_ocr(path: str, lang: str = "eng") -> str:
+    convert_from_path, image_to_string = _ocr_backend()
     pages = convert_from_path(path, dpi=300, poppler_path=POPPLER_BIN_PATH)
     return "\n\n".join(image_to_string(p, lang=lang) for p in pages)
 
@@ -68,6 +77,10 @@ def extract_tables_from_pdf(path: str) -> list:
     Returns:
         list: A list of extracted tables (list of rows per table).
     """
+    import ftfy
+    import pdfplumber
+    from pdfminer.pdfparser import PDFSyntaxError
+
     all_extracted_tables = []
 
     extraction_strategies = [
@@ -152,6 +165,8 @@ def extract_images_from_pdf(path: str, output_dir: str) -> list:
     saved_images = []
 
     try:
+        import fitz  # PyMuPDF
+
         doc = fitz.open(path)
         os.makedirs(output_dir, exist_ok=True)
 
@@ -185,6 +200,7 @@ def extract_images_from_pdf(path: str, output_dir: str) -> list:
 
 
 def full_ocr_with_debug(path: str, lang: str = "heb+eng") -> str:
+    convert_from_path, image_to_string = _ocr_backend()
     pages = convert_from_path(path, dpi=300, poppler_path=POPPLER_BIN_PATH)
     all_text = []
 
@@ -225,6 +241,8 @@ def smart_extract_pdf(path: str) -> str:
 
     try:
         logging.info(f"[SmartExtract] Trying pdfminer on '{os.path.basename(path)}'")
+        from pdfminer.high_level import extract_text as pdfminer_extract
+
         text = pdfminer_extract(path)
         if len(text.strip()) > 50:
             extracted_text = text
@@ -237,6 +255,8 @@ def smart_extract_pdf(path: str) -> str:
     if not extracted_text or len(extracted_text.strip()) < 50:
         try:
             logging.info("[SmartExtract] Trying PyPDF2...")
+            from PyPDF2 import PdfReader
+
             reader = PdfReader(path)
             text = "\n".join(page.extract_text() or "" for page in reader.pages)
             if len(text.strip()) > 50:
@@ -269,6 +289,7 @@ def smart_extract_pdf(path: str) -> str:
 
 def debug_ocr_page(path: str, page_num: int = 0, lang: str = "heb+eng"):
     print(f"[DEBUG] Extracting OCR from page {page_num+1}...")
+    convert_from_path, image_to_string = _ocr_backend()
     pages = convert_from_path(path, dpi=500, poppler_path=POPPLER_BIN_PATH)
 
     if page_num >= len(pages):
@@ -283,6 +304,8 @@ def debug_ocr_page(path: str, page_num: int = 0, lang: str = "heb+eng"):
     text = image_to_string(image, lang=lang)
 
     try:
+        from langdetect import detect
+
         detected_lang = detect(text)
     except Exception:
         detected_lang = "unknown"
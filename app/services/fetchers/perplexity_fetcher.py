@@ -3,6 +3,8 @@
 import datetime
 from typing import Optional
 
+from app.core.config import settings
+from app.core.tracing import span
 from app.services.fetchers.wikipedia_fetcher import fetch_wikipedia_summary
 from app.services.factory import get_llm_service
 
@@ -33,8 +35,10 @@ async def fetch_perplexity_summary(topic: str, subject: str = "General", lang: s
     prompt = build_perplexity_prompt(topic, subject, lang, wiki_summary)
 
     # Get LLM (simulating perplexity behavior)
-    llm = get_llm_service(provider="openai")
-    result = await llm.ainvoke(prompt)
+    llm = get_llm_service(provider="fake" if settings.LLM_PROVIDER == "fake" else "openai")
+    async with span("llm_call", kind="llm", agent="perplexity", model=llm.model_name) as s:
+        result = await llm.ainvoke(prompt)
+        s.add_tokens(llm.last_usage.get("input_tokens", 0), llm.last_usage.get("output_tokens", 0))
 
     return {
         "sourceType": "Perplexity_Search",
@@ -2,6 +2,8 @@
 import requests
 import logging
 from typing import Optional
+
+from app.core.config import settings
 # Setup module-level logger
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,11 @@ def fetch_wikipedia_summary(topic: str, lang: str = "he") -> Optional[str]:
     
     Returns:
         Optional[str]: A short summary of the topic, or None if retrieval fails."""
+    if settings.WIKIPEDIA_OFFLINE:
+        from app.services.fake_llm import canned_wikipedia_summary
+
+        return canned_wikipedia_summary(topic)
+
     title = resolve_wikipedia_title(topic, lang)
     if not title:
         return None
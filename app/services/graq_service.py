@@ -7,7 +7,7 @@ class GraqService(BaseLLMService):
     async def chat(self, messages: list[dict]) -> str:
         async with httpx.AsyncClient() as client:
             response = await client.post(
-                "https://api.graq.cloud/chat",
+                f"{settings.LLM_BASE_URL}/chat/completions" if settings.LLM_BASE_URL else "https://api.graq.cloud/chat",
                 headers={
                     "Authorization": f"Bearer {settings.GRAQ_API_KEY}"
                 },
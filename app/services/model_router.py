@@ -0,0 +1,220 @@
+# app/services/model_router.py
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, TypedDict
+
+from langchain_core.messages import BaseMessage
+
+from app.core.config import settings
+from app.core.normalizers.llm_output_salvage import extract_json
+from app.core.tracing import span
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class RoutePolicy(TypedDict):
+    cheap_model: Optional[str]        # None → always use the strong model
+    strong_model: str
+    score_key: str                    # field holding the model's self-reported score
+    uncertain_band: Tuple[float, float]  # [low, high) → escalate to the strong model
+    temperature: float
+
+
+# Bands sit around each verifier's decision threshold (match ≥ 0.75, grounded ≥ 0.7)
+DEFAULT_POLICIES: Dict[str, Dict[str, Any]] = {
+    "bloom_verifier": {"score_key": "match_score", "uncertain_band": (0.6, 0.85), "temperature": 0.3},
+    "difficulty_verifier": {"score_key": "match_score", "uncertain_band": (0.6, 0.85), "temperature": 0.3},
+    "grounding_verifier": {"score_key": "grounding_score", "uncertain_band": (0.55, 0.85), "temperature": 0.3},
+    # Normalization / repair tasks: cheap model only, deterministic
+    "json_repair": {"temperature": 0.0},
+    "chat_summary": {"temperature": 0.2},
+}
+
+_chat_models: Dict[Tuple[str, str, str, float], "ChatOpenAI"] = {}
+
+# Outcome counters per agent: cheap_accepted / escalated_uncertain / escalated_parse /
+# escalated_error / strong_only / failed, plus per-model call counts and latency totals.
+router_stats: Dict[str, Dict[str, float]] = {}
+
+
+def get_chat_model(model: str, temperature: float = 0.3) -> "ChatOpenAI":
+    """
+    Shared ChatOpenAI client per (model, temperature), created on first use.
+    langchain_openai is imported here so importing an agent never builds a client.
+    With LLM_PROVIDER=fake every agent gets the offline FakeChatModel instead;
+    with LLM_BASE_URL set, the client talks to that OpenAI-compatible endpoint.
+    """
+    provider = settings.LLM_PROVIDER.lower()
+    key = (provider, settings.LLM_BASE_URL, model, temperature)
+    if key not in _chat_models:
+        if provider == "fake":
+            from app.services.fake_llm import FakeChatModel
+
+            _chat_models[key] = FakeChatModel.from_settings(model, temperature)
+        elif settings.LLM_BASE_URL:
+            from langchain_openai import ChatOpenAI
+
+            _chat_models[key] = ChatOpenAI(model=model, temperature=temperature, base_url=settings.LLM_BASE_URL,
+                                           api_key=settings.OPENAI_API_KEY or "standin")
+        else:
+            from langchain_openai import ChatOpenAI
+
+            _chat_models[key] = ChatOpenAI(model=model, temperature=temperature)
+    return _chat_models[key]
+
+
+@lru_cache(maxsize=8)
+def _policy_overrides(raw: str) -> Dict[str, Dict[str, Any]]:
+    """MODEL_ROUTER_POLICIES parsed once per distinct value (get_policy runs on every routed call)."""
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except ValueError:
+        overrides = None
+    if not isinstance(overrides, dict) or not all(isinstance(v, dict) for v in overrides.values()):
+        logger.warning("Ignoring malformed MODEL_ROUTER_POLICIES")
+        return {}
+    return overrides
+
+
+def get_policy(agent: str) -> RoutePolicy:
+    policy: Dict[str, Any] = {
+        "cheap_model": settings.MODEL_ROUTER_CHEAP_MODEL if settings.MODEL_ROUTER_ENABLED else None,
+        "strong_model": settings.MODEL_ROUTER_STRONG_MODEL,
+        "score_key": "match_score",
+        "uncertain_band": (0.5, 0.85),
+        "temperature": 0.3,
+    }
+    policy.update(DEFAULT_POLICIES.get(agent, {}))
+    policy.update(_policy_overrides(settings.MODEL_ROUTER_POLICIES).get(agent, {}))
+    if not settings.MODEL_ROUTER_ENABLED:
+        policy["cheap_model"] = None
+    policy["uncertain_band"] = tuple(policy["uncertain_band"])
+    return policy  # type: ignore[return-value]
+
+
+class RoutedModel:
+    """Chat model handle that counts and times each call in router_stats (not the handle fetch)."""
+
+    def __init__(self, agent: str, model: str, temperature: float):
+        self.agent = agent
+        self.model_name = model
+        self.temperature = temperature
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        started = time.perf_counter()
+        try:
+            return await get_chat_model(self.model_name, self.temperature).ainvoke(messages, **kwargs)
+        finally:
+            _record(self.agent, "", self.model_name, time.perf_counter() - started)
+
+
+def model_for(agent: str) -> RoutedModel:
+    """Single-shot model for an agent's policy (cheap model when routing is enabled)."""
+    policy = get_policy(agent)
+    return RoutedModel(agent, policy["cheap_model"] or policy["strong_model"], policy["temperature"])
+
+
+def _record(agent: str, outcome: str, model: Optional[str] = None, elapsed: float = 0.0) -> None:
+    stats = router_stats.setdefault(agent, {})
+    if outcome:
+        stats[outcome] = stats.get(outcome, 0) + 1
+    if model:
+        stats[f"calls:{model}"] = stats.get(f"calls:{model}", 0) + 1
+        stats[f"seconds:{model}"] = stats.get(f"seconds:{model}", 0.0) + elapsed
+
+
+def get_router_stats() -> Dict[str, Dict[str, float]]:
+    return {agent: dict(stats) for agent, stats in router_stats.items()}
+
+
+def _parse(response_str: str) -> Dict[str, Any]:
+    parsed = extract_json(response_str)
+    if not isinstance(parsed, dict) or parsed.get("status") != "ok":
+        raise ValueError("LLM returned non-ok status.")
+    return parsed
+
+
+def _is_uncertain(parsed: Dict[str, Any], policy: RoutePolicy) -> bool:
+    try:
+        score = float(parsed.get(policy["score_key"]))
+    except (TypeError, ValueError):
+        return True  # no usable self-reported score
+    low, high = policy["uncertain_band"]
+    return low <= score < high
+
+
+async def _invoke(agent: str, model: str, temperature: float, messages: List[BaseMessage]) -> str:
+    started = time.perf_counter()
+    try:
+        async with span("llm_call", kind="llm", agent=agent, model=model) as s:
+            response = await get_chat_model(model, temperature).ainvoke(messages)
+            s.record_usage(response)
+    finally:
+        _record(agent, "", model, time.perf_counter() - started)
+    return response.content
+
+
+async def route_json(agent: str, messages: List[BaseMessage]) -> Dict[str, Any]:
+    """
+    Run a JSON-returning verifier prompt through the agent's routing policy.
+
+    The cheap model answers first; its verdict is kept unless the self-reported score falls in
+    the policy's uncertain band, the output does not parse, or the call fails – then the strong
+    model answers. Returns the parsed JSON (with 'routed_model') or the agents' usual error dict.
+    """
+    async with span(agent, kind="agent", agent=agent) as s:
+        result = await _route_json(agent, messages)
+        s.model = result.get("routed_model") or ""
+        s.set(result=result.get("status"))
+        return result
+
+
+async def _route_json(agent: str, messages: List[BaseMessage]) -> Dict[str, Any]:
+    policy = get_policy(agent)
+
+    if policy["cheap_model"]:
+        try:
+            parsed = _parse(await _invoke(agent, policy["cheap_model"], policy["temperature"], messages))
+            if not _is_uncertain(parsed, policy):
+                _record(agent, "cheap_accepted")
+                parsed["routed_model"] = policy["cheap_model"]
+                return parsed
+            _record(agent, "escalated_uncertain")
+        except ValueError:
+            _record(agent, "escalated_parse")
+        except Exception:
+            logger.warning("Cheap model call failed for %s, escalating.", agent, exc_info=True)
+            _record(agent, "escalated_error")
+    else:
+        _record(agent, "strong_only")
+
+    try:
+        response_str = await _invoke(agent, policy["strong_model"], policy["temperature"], messages)
+    except Exception as e:
+        logger.exception("LLM call failed in %s.", agent)
+        _record(agent, "failed")
+        return {"status": "error", "reason": "llm_call_failed", "exception": str(e)}
+
+    try:
+        parsed = _parse(response_str)
+        parsed["routed_model"] = policy["strong_model"]
+        return parsed
+    except Exception as e:
+        logger.warning("Invalid JSON or malformed response: %s", response_str)
+        _record(agent, "failed")
+        return {
+            "status": "error",
+            "reason": "invalid_json_response",
+            "raw_output": response_str,
+            "exception": str(e)
+        }
+
+
+__all__ = ["route_json", "get_chat_model", "model_for", "RoutedModel", "get_policy", "get_router_stats", "RoutePolicy"]
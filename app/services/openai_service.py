@@ -4,14 +4,21 @@ from app.core.config import settings
 from app.services.base import BaseLLMService
 
 class OpenAIService(BaseLLMService):
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, model: str = "gpt-4.1"):
+        self.model = model
+        self.model_name = model
+        if settings.LLM_BASE_URL:
+            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY or "standin", base_url=settings.LLM_BASE_URL)
+        else:
+            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
     async def chat(self, messages: list[dict]) -> str:
         response = await self.client.chat.completions.create(
-            model="gpt-4.1",
+            model=self.model,
             messages=messages
         )
+        usage = response.usage
+        self.last_usage = {"input_tokens": usage.prompt_tokens, "output_tokens": usage.completion_tokens} if usage else {}
         return response.choices[0].message.content
 
 
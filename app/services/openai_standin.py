@@ -0,0 +1,171 @@
+# app/services/openai_standin.py
+"""
+OpenAI-compatible stand-in server for load tests: POST /v1/chat/completions (+ streaming) and
+GET /v1/models, answered by the fake LLM backend (app/services/fake_llm.py).
+
+Unlike LLM_PROVIDER=fake, requests go through the real clients (ChatOpenAI / AsyncOpenAI,
+their connection pools, timeouts and retries). Point the app at it with LLM_BASE_URL:
+
+    python -m app.services.openai_standin --port 8100 --latency lognormal:800,0.5 --rate-limit-rate 0.05
+    LLM_BASE_URL=http://localhost:8100/v1 uvicorn app.main:app
+
+Responses are schema-valid per agent prompt family (same responders as the fake backend).
+Latency, 429s (with Retry-After) and 5xx are injected at the FAKE_LLM_* rates.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from app.core.config import settings
+from app.services.fake_llm import FakeChatModel
+
+# Characters per streamed content delta
+STREAM_CHUNK_CHARS = 24
+_ROLES = {"system": SystemMessage, "developer": SystemMessage, "assistant": AIMessage}
+
+
+def _to_messages(messages: List[Dict[str, Any]]) -> List[BaseMessage]:
+    converted = []
+    for m in messages:
+        content = m.get("content") or ""
+        if isinstance(content, list):  # content parts
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        converted.append(_ROLES.get(m.get("role"), HumanMessage)(content=content))
+    return converted
+
+
+def _error(status: int, message: str, error_type: str, code: Optional[str] = None, headers=None) -> JSONResponse:
+    return JSONResponse({"error": {"message": message, "type": error_type, "param": None, "code": code}},
+                        status_code=status, headers=headers)
+
+
+def _usage(message: AIMessage) -> Dict[str, int]:
+    usage = message.usage_metadata or {}
+    return {"prompt_tokens": usage.get("input_tokens", 0), "completion_tokens": usage.get("output_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0)}
+
+
+def create_app(
+    latency: Optional[str] = None,
+    rate_limit_rate: Optional[float] = None,
+    server_error_rate: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """Arguments default to the FAKE_LLM_* settings."""
+    rate_limit_rate = settings.FAKE_LLM_RATE_LIMIT_RATE if rate_limit_rate is None else rate_limit_rate
+    server_error_rate = settings.FAKE_LLM_SERVER_ERROR_RATE if server_error_rate is None else server_error_rate
+    seed = settings.FAKE_LLM_SEED if seed is None else seed
+    model = FakeChatModel(latency=latency or settings.FAKE_LLM_LATENCY, seed=seed,
+                          chars_per_token=settings.FAKE_LLM_CHARS_PER_TOKEN)
+    faults = random.Random(seed)
+    stats = {"requests": 0, "rate_limited": 0, "server_errors": 0, "streams": 0}
+
+    app = FastAPI(title="EduFlow OpenAI stand-in")
+
+    @app.get("/v1/models")
+    async def list_models():
+        names = [settings.MODEL_ROUTER_STRONG_MODEL, settings.MODEL_ROUTER_CHEAP_MODEL]
+        return {"object": "list", "data": [{"id": n, "object": "model", "created": 0, "owned_by": "standin"}
+                                           for n in dict.fromkeys(names)]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        stats["requests"] += 1
+        try:
+            body = await request.json()
+            messages = _to_messages(body["messages"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return _error(400, "Request body must be JSON with a 'messages' list", "invalid_request_error")
+
+        # Faults are decided before any work, like a gateway rejecting the request
+        draw = faults.random()
+        if draw < rate_limit_rate:
+            stats["rate_limited"] += 1
+            return _error(429, "Rate limit reached (stand-in)", "requests", "rate_limit_exceeded",
+                          headers={"retry-after": "1"})
+        if draw < rate_limit_rate + server_error_rate:
+            stats["server_errors"] += 1
+            return _error(faults.choice([500, 502, 503]), "The server had an error (stand-in)", "server_error")
+
+        message, delay, _ = model.plan_response(messages)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model_name = body.get("model") or "standin"
+
+        if not body.get("stream"):
+            await asyncio.sleep(delay)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model_name,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": message.content},
+                             "logprobs": None, "finish_reason": "stop"}],
+                "usage": _usage(message),
+            }
+
+        stats["streams"] += 1
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        content = str(message.content)
+        pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)] or [""]
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, usage=None) -> str:
+            payload = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model_name,
+                "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish_reason}],
+            }
+            if usage is not None:
+                payload["choices"], payload["usage"] = [], usage
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def events():
+            # Half the latency before the first token, the rest spread over the deltas
+            await asyncio.sleep(delay / 2)
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in pieces:
+                await asyncio.sleep(delay / 2 / len(pieces))
+                yield chunk({"content": piece})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, usage=_usage(message))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stand-in server backed by the fake LLM")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", help="FAKE_LLM_LATENCY spec, e.g. lognormal:800,0.5")
+    parser.add_argument("--rate-limit-rate", type=float, help="share of requests answered with 429")
+    parser.add_argument("--server-error-rate", type=float, help="share of requests answered with 500/502/503")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    app = create_app(args.latency, args.rate_limit_rate, args.server_error_rate, args.seed)
+    print(f"🧪 OpenAI stand-in on http://{args.host}:{args.port}/v1")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+__all__ = ["create_app"]
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from app.core.config import settings
 
 class PerplexityService(BaseLLMService):
     async def chat(self, messages: list[dict]) -> str:
-        url = "https://api.perplexity.ai/chat/completions"
+        url = f"{settings.LLM_BASE_URL or 'https://api.perplexity.ai'}/chat/completions"
         headers = {
             "Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}",
             "Content-Type": "application/json"
@@ -1,24 +1,180 @@
 # app/services/prompt_manager.py
+import logging
+import os
+import string
+import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
 import yaml
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader, Template, meta
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 PROMPT_DIR = BASE_DIR / "prompts" / "templates"
 
+# Dev only: re-read a prompt file when its mtime changes
+PROMPT_HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "false").lower() == "true"
+PROMPT_BYTECODE_CACHE_DIR = os.getenv(
+    "PROMPT_BYTECODE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "eduflow_prompt_cache")
+)
+
+_USER_SUFFIX = "#user"
+
+
+class PromptTemplate:
+    """
+    One YAML prompt file: raw 'system'/'user' strings plus the compiled user template.
+    Files marked 'template_format: f-string' (LangChain ChatPromptTemplate prompts) are
+    rendered with str.format instead of Jinja.
+    """
+
+    def __init__(self, name: str, data: Dict[str, Any], template: Optional[Template],
+                 variables: FrozenSet[str], mtime: float):
+        self.name = name
+        self.data = data
+        self.system: str = data["system"]
+        self.user: str = data["user"]
+        self.template = template
+        self.variables = variables
+        self.mtime = mtime
+
+    def check_variables(self, provided) -> None:
+        """Fail fast when 'provided' lacks a variable the template uses (pass None for optional ones)."""
+        missing = self.variables - set(provided)
+        if missing:
+            raise ValueError(f"❌ Prompt {self.name} is missing variables: {sorted(missing)}")
+
+    def render(self, context: Dict[str, Any]) -> str:
+        self.check_variables(context.keys())
+        if self.template is None:
+            return self.user.format(**context)
+        return self.template.render(context)
+
+
+class PromptRegistry:
+    """
+    Loads every YAML prompt under PROMPT_DIR once, compiles the 'user' templates in a shared
+    Jinja Environment (with an on-disk bytecode cache) and records each template's variables.
+    """
+
+    def __init__(self, prompt_dir: Path = PROMPT_DIR, hot_reload: bool = PROMPT_HOT_RELOAD,
+                 bytecode_cache_dir: Optional[str] = PROMPT_BYTECODE_CACHE_DIR):
+        self.prompt_dir = Path(prompt_dir)
+        self.hot_reload = hot_reload
+        self._sources: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._prompts: Dict[str, PromptTemplate] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            try:
+                os.makedirs(bytecode_cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+            except OSError:
+                logger.warning("Prompt bytecode cache disabled (cannot create %s)", bytecode_cache_dir)
+        self.env = Environment(
+            loader=FunctionLoader(self._load_source),
+            bytecode_cache=bytecode_cache,
+            auto_reload=hot_reload,
+        )
+
+    # ---- Loading ----
+    def _read(self, name: str) -> Tuple[Dict[str, Any], float]:
+        path = self.prompt_dir / name
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        if not isinstance(data, dict) or "system" not in data or "user" not in data:
+            raise ValueError(f"❌ Prompt file {name} must contain both 'system' and 'user' keys.")
+        return data, path.stat().st_mtime
+
+    def _load_source(self, template_name: str):
+        name = template_name[: -len(_USER_SUFFIX)]
+        data, mtime = self._sources[name]
+        path = self.prompt_dir / name
+        return data["user"], str(path), lambda: not self.hot_reload or _mtime(path) == mtime
+
+    def _compile(self, name: str) -> PromptTemplate:
+        data, mtime = self._read(name)
+        self._sources[name] = (data, mtime)
+        if data.get("template_format", "jinja2") == "f-string":
+            template = None
+            variables = frozenset(
+                field.split(".")[0].split("[")[0]
+                for _, field, _, _ in string.Formatter().parse(data["user"]) if field
+            )
+        else:
+            variables = frozenset(meta.find_undeclared_variables(self.env.parse(data["user"])))
+            template = self.env.get_template(name + _USER_SUFFIX)
+        prompt = PromptTemplate(name, data, template, variables, mtime)
+        self._prompts[name] = prompt
+        return prompt
+
+    def load_all(self) -> Dict[str, PromptTemplate]:
+        """Load and compile every prompt file; syntax errors surface here, not on first use."""
+        with self._lock:
+            for path in sorted(self.prompt_dir.rglob("*.yaml")):
+                name = path.relative_to(self.prompt_dir).as_posix()
+                if name not in self._prompts:
+                    self._compile(name)
+            self._loaded = True
+        return dict(self._prompts)
+
+    # ---- Access ----
+    def get(self, name: str) -> PromptTemplate:
+        if not self._loaded:
+            self.load_all()
+        prompt = self._prompts.get(name)
+        if prompt is None:
+            with self._lock:
+                prompt = self._compile(name)  # file outside the initial scan (or added later)
+        elif self.hot_reload and _mtime(self.prompt_dir / name) != prompt.mtime:
+            with self._lock:
+                logger.info("♻️ Reloading prompt %s", name)
+                prompt = self._compile(name)
+        return prompt
+
+    def render(self, name: str, context: Dict[str, Any]) -> str:
+        return self.get(name).render(context)
+
+    def variables(self, name: str) -> FrozenSet[str]:
+        return self.get(name).variables
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return -1.0
+
+
+registry = PromptRegistry()
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    """Registered prompt (system/user strings + compiled template), loaded on first use."""
+    return registry.get(name)
+
+
+def render_prompt(name: str, context: Dict[str, Any]) -> str:
+    """Render the 'user' template of a registered prompt file (compiled once)."""
+    return registry.render(name, context)
+
+
 def load_prompt(file_path: str) -> dict:
-    full_path = PROMPT_DIR / file_path
-    print(f"📂 Loading prompt from: {full_path}")
+    """Backward-compatible accessor: {'system': ..., 'user': ...} for a prompt file."""
+    return dict(registry.get(file_path).data)
 
-    with open(full_path, "r", encoding="utf-8") as f:
-        prompt = yaml.safe_load(f)
 
-    if "system" not in prompt or "user" not in prompt:
-        raise ValueError("❌ Prompt file must contain both 'system' and 'user' keys.")
+@lru_cache(maxsize=256)
+def _compile_string(template_str: str) -> Template:
+    return registry.env.from_string(template_str)
 
-    return prompt
 
 def render_user_prompt(template_str: str, context: dict) -> str:
     """Render a Jinja user prompt template with the given context."""
-    template = Template(template_str)
-    return template.render(**context)
\ No newline at end of file
+    return _compile_string(template_str).render(**context)
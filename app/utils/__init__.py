@@ -1,9 +1,10 @@
-from .hash import generate_cache_key
+from .hash import generate_cache_key, content_hash
 from .time import current_timestamp
 from .file_helpers import validate_file_type, filter_valid_files
 
 __all__ = [
     "generate_cache_key",
+    "content_hash",
     "current_timestamp",
     "validate_file_type",
     "filter_valid_files",
@@ -1,5 +1,6 @@
 # app/utils/hash.py
 import hashlib
+import json
 
 def generate_cache_key(topic_name: str, subject: str, grade_level: str, big_idea: str) -> str:
     """
@@ -7,3 +8,28 @@ def generate_cache_key(topic_name: str, subject: str, grade_level: str, big_idea
     """
     key_string = f"{topic_name}_{subject}_{grade_level}_{big_idea}"
     return hashlib.sha256(key_string.encode()).hexdigest()
+
+
+# Bookkeeping fields that must not change a document's fingerprint
+VOLATILE_FIELDS = ("_id", "id", "createdAt", "updatedAt", "contentHash")
+# Fetch / write timestamps that also appear inside nested content (e.g. sourceChunks[].retrievedAt)
+NESTED_VOLATILE_FIELDS = ("retrievedAt", "createdAt", "updatedAt")
+
+
+def _strip_volatile(value, nested_exclude):
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v, nested_exclude) for k, v in value.items() if k not in nested_exclude}
+    if isinstance(value, (list, tuple)):
+        return [_strip_volatile(v, nested_exclude) for v in value]
+    return value
+
+
+def content_hash(doc: dict, exclude=VOLATILE_FIELDS, nested_exclude=NESTED_VOLATILE_FIELDS) -> str:
+    """
+    SHA256 fingerprint of a document's canonical JSON (sorted keys, volatile fields removed:
+    'exclude' at the top level, 'nested_exclude' at any depth).
+    Equal content always yields the same hash, regardless of key order or fetch time.
+    """
+    body = {k: _strip_volatile(v, nested_exclude) for k, v in doc.items() if k not in exclude}
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -1,4 +1,6 @@
 # app/utils/idempotency.py
+import hashlib
+import json
 import uuid
 from datetime import datetime
 
@@ -10,3 +12,23 @@ def new_pipeline_run_id(prefix: str = "run") -> str:
     now_str = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     uid = uuid.uuid4().hex[:8]
     return f"{prefix}_{now_str}_{uid}"
+
+
+def deterministic_block_id(block: dict) -> str:
+    """
+    Stable block ID derived from the run, scope, block type and content.
+    Re-running the same upsert (e.g. a retried request) targets the same document.
+    Format: block_<24 hex chars>
+    """
+    key = {
+        "pipeline_run_id": block.get("pipeline_run_id"),
+        "courseOutlineId": block.get("courseOutlineId"),
+        "lessonId": block.get("lessonId"),
+        "pageId": block.get("pageId"),
+        "blockType": block.get("blockType"),
+        "content": block.get("content"),
+    }
+    digest = hashlib.sha256(
+        json.dumps(key, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"block_{digest[:24]}"
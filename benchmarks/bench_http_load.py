@@ -0,0 +1,336 @@
+# benchmarks/bench_http_load.py
+"""
+HTTP load-test harness for the FastAPI endpoints.
+
+Usage:
+    python -m benchmarks.bench_http_load [--base-url http://localhost:8000] [--spawn --workers 1]
+        [--mix stage2=4,free_chat=4,chat_upload=1,full_lesson=1,generate_corpus=1]
+        [--concurrency 1,4,16,64] [--duration 30] [--interval 5] [--out PATH]
+
+Closed-loop clients (one in-flight request each) send a weighted mix of requests to
+/api/v1/generate-corpus, /api/v1/stage2/run, /api/v1/generate-full-lesson, /api/v1/chat/upload
+and /api/v1/free-chat. Each concurrency level runs for --duration seconds. Meanwhile a
+separate connection polls /healthz, whose loopLagMs (and round trip) show event-loop lag over time.
+
+Reports per level and per --interval: throughput, p50/p95/p99 latency, error rate and loop
+lag, plus a per-endpoint summary. The saturation point is the first level whose throughput
+grows by less than 10% over the previous one.
+
+--spawn starts the OpenAI stand-in (app/services/openai_standin.py) and uvicorn with
+--workers, wired with LLM_BASE_URL and DB_NAME=eduflow_bench (MONGO_URI must be reachable).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures/pipeline_corpus.json"
+DEFAULT_MIX = "stage2=4,free_chat=4,chat_upload=1,full_lesson=1,generate_corpus=1"
+# Throughput gain below which the next concurrency level counts as saturated
+SATURATION_GAIN = 0.10
+
+
+# ---- Request builders: endpoint name → (method, path, httpx request kwargs) ----
+def _fixtures() -> Dict[str, Any]:
+    return json.loads(FIXTURES.read_text(encoding="utf-8"))
+
+
+def _upload_file() -> Tuple[str, bytes, str]:
+    """A small PDF (parsed with fitz on the server), or plain text when PyMuPDF is missing."""
+    text = "\n\n".join(c["text"] for c in _fixtures()["chunks"])
+    try:
+        import fitz
+    except ImportError:
+        return "lesson.txt", text.encode("utf-8"), "text/plain"
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=9)
+    return "lesson.pdf", doc.tobytes(), "application/pdf"
+
+
+def build_requests() -> Dict[str, Callable[[random.Random], Tuple[str, str, Dict[str, Any]]]]:
+    fixtures = _fixtures()
+    common = dict(fixtures["stage1"])
+    stage2 = {k: v for k, v in common.items() if k != "learningGate"}
+    stage2.update(learningGate="Meeting", generationScope="Single Lesson")
+    upload = _upload_file()
+
+    def generate_corpus(rng):
+        form = {**{k: v for k, v in common.items() if k != "skills"}, "skills": ",".join(common["skills"]),
+                "generationScope": "Single Lesson"}
+        return "POST", "/api/v1/generate-corpus", {"data": form}
+
+    def stage2_run(rng):
+        return "POST", "/api/v1/stage2/run", {"json": {
+            **stage2, "mode": "generate_questions", "num_questions": rng.choice([3, 5]),
+            "question_types": ["mcq"], "cognitive_target": "comprehension_application",
+            "target_difficulty": "medium", "chunks": rng.sample(fixtures["chunks"], 2),
+            "save_to_blocks": True, "courseOutlineId": f"load_outline_{uuid.uuid4().hex}",
+        }}
+
+    def full_lesson(rng):
+        return "POST", "/api/v1/generate-full-lesson", {"json": {
+            **common, "mode": "stage2", "stage2_mode": "generate_questions", "num_questions": 3,
+            "question_types": ["mcq"], "chunks": rng.sample(fixtures["chunks"], 2), "save_to_blocks": False,
+        }}
+
+    def chat_upload(rng):
+        return "POST", "/api/v1/chat/upload", {"files": {"file": upload}, "data": {"courseId": "load_course"}}
+
+    def free_chat(rng):
+        return "POST", "/api/v1/free-chat", {"json": {
+            "text": rng.choice(["What caused the French Revolution?", "Summarize the Reign of Terror.",
+                                "Who was Robespierre?"]),
+            "sessionId": f"load_{rng.randrange(50)}", "userId": "load_test",
+        }}
+
+    return {"generate_corpus": generate_corpus, "stage2": stage2_run, "full_lesson": full_lesson,
+            "chat_upload": chat_upload, "free_chat": free_chat}
+
+
+def parse_mix(spec: str, known) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in known:
+            raise ValueError(f"unknown endpoint {name!r}; choose from {', '.join(known)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# ---- Stats ----
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+def summarize(samples: List[Dict[str, Any]], seconds: float) -> Dict[str, Any]:
+    latencies = [s["seconds"] for s in samples]
+    errors = sum(1 for s in samples if not s["ok"])
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / seconds, 2) if seconds else None,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        **{f"p{int(p * 100)}_ms": round(_percentile(latencies, p) * 1000, 1) if latencies else None
+           for p in (0.5, 0.95, 0.99)},
+    }
+
+
+def summarize_probes(probes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    rtts = [p["rtt_ms"] for p in probes]
+    lags = [p["lag_ms"] for p in probes if p["lag_ms"] is not None]
+    return {
+        "probes": len(probes),
+        "healthz_p95_ms": round(_percentile(rtts, 0.95), 1) if rtts else None,
+        "healthz_max_ms": round(max(rtts), 1) if rtts else None,
+        "loop_lag_p95_ms": round(_percentile(lags, 0.95), 2) if lags else None,
+        "loop_lag_max_ms": round(max(lags), 2) if lags else None,
+    }
+
+
+# ---- Load ----
+async def _client_loop(client: httpx.AsyncClient, builders, mix, rng: random.Random, end: float, samples: list):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < end:
+        name = rng.choices(names, weights)[0]
+        method, path, kwargs = builders[name](rng)
+        started = time.perf_counter()
+        status, ok = 0, False
+        try:
+            response = await client.request(method, path, **kwargs)
+            status = response.status_code
+            ok = status < 400
+            if ok and name == "full_lesson":  # reports failures in a 200 body
+                ok = response.json().get("success", False)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        samples.append({"endpoint": name, "t": started, "seconds": time.perf_counter() - started,
+                        "ok": ok, "status": status})
+
+
+async def _probe_loop(client: httpx.AsyncClient, interval: float, end: float, probes: list):
+    while time.perf_counter() < end:
+        started = time.perf_counter()
+        lag = None
+        try:
+            response = await client.get("/healthz")
+            lag = response.json().get("loopLagMs")
+        except (httpx.HTTPError, ValueError):
+            pass
+        probes.append({"t": started, "rtt_ms": (time.perf_counter() - started) * 1000, "lag_ms": lag})
+        await asyncio.sleep(interval)
+
+
+async def run_level(base_url: str, concurrency: int, duration: float, interval: float, mix, builders,
+                    timeout: float, probe_interval: float, seed: int) -> Dict[str, Any]:
+    samples: List[Dict[str, Any]] = []
+    probes: List[Dict[str, Any]] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client, \
+            httpx.AsyncClient(base_url=base_url, timeout=timeout) as probe_client:
+        started = time.perf_counter()
+        end = started + duration
+        await asyncio.gather(
+            _probe_loop(probe_client, probe_interval, end, probes),
+            *[_client_loop(client, builders, mix, random.Random(f"{seed}:{i}"), end, samples)
+              for i in range(concurrency)],
+        )
+        elapsed = time.perf_counter() - started
+
+    timeline = []
+    for i in range(max(1, math.ceil(duration / interval))):
+        lo, hi = started + i * interval, started + (i + 1) * interval
+        window = [s for s in samples if lo <= s["t"] < hi]
+        timeline.append({"second": round(i * interval, 1), **summarize(window, interval),
+                         **summarize_probes([p for p in probes if lo <= p["t"] < hi])})
+
+    by_endpoint = defaultdict(list)
+    for s in samples:
+        by_endpoint[s["endpoint"]].append(s)
+    statuses = defaultdict(int)
+    for s in samples:
+        if not s["ok"]:
+            statuses[str(s["status"])] += 1
+
+    return {
+        "concurrency": concurrency,
+        **summarize(samples, elapsed),
+        **summarize_probes(probes),
+        "errors_by_status": dict(statuses),
+        "endpoints": {name: summarize(items, elapsed) for name, items in by_endpoint.items()},
+        "timeline": timeline,
+    }
+
+
+def find_saturation(levels: List[Dict[str, Any]]) -> Optional[int]:
+    for prev, cur in zip(levels, levels[1:]):
+        if prev["throughput_rps"] and (cur["throughput_rps"] or 0) < prev["throughput_rps"] * (1 + SATURATION_GAIN):
+            return prev["concurrency"]
+    return None
+
+
+# ---- Local stack ----
+def _wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+
+
+def spawn_stack(args: argparse.Namespace) -> List[subprocess.Popen]:
+    port = int(args.base_url.rsplit(":", 1)[-1].split("/")[0])
+    env = dict(os.environ)
+    env.update({"LLM_PROVIDER": "openai", "LLM_BASE_URL": f"http://127.0.0.1:{args.standin_port}/v1",
+                "WIKIPEDIA_OFFLINE": "true", "DB_NAME": args.db_name})
+    standin = subprocess.Popen(
+        [sys.executable, "-m", "app.services.openai_standin", "--port", str(args.standin_port),
+         "--latency", args.standin_latency, "--rate-limit-rate", str(args.standin_429),
+         "--server-error-rate", str(args.standin_5xx)],
+        cwd=ROOT, env=env,
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(args.workers),
+         "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    processes = [standin, app]
+    try:
+        _wait_ready(f"http://127.0.0.1:{args.standin_port}/v1/models")
+        _wait_ready(f"{args.base_url}/healthz")
+    except Exception:
+        stop_stack(processes)
+        raise
+    return processes
+
+
+def stop_stack(processes: List[subprocess.Popen]) -> None:
+    for proc in processes:
+        proc.terminate()
+    for proc in processes:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated levels, run in order")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per concurrency level")
+    parser.add_argument("--interval", type=float, default=5.0, help="timeline bucket in seconds")
+    parser.add_argument("--probe-interval", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--spawn", action="store_true", help="start the stand-in LLM and the app locally")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--db-name", default="eduflow_bench")
+    parser.add_argument("--standin-port", type=int, default=8100)
+    parser.add_argument("--standin-latency", default="lognormal:800,0.5")
+    parser.add_argument("--standin-429", type=float, default=0.0)
+    parser.add_argument("--standin-5xx", type=float, default=0.0)
+    args = parser.parse_args()
+
+    builders = build_requests()
+    try:
+        mix = parse_mix(args.mix, builders)
+    except ValueError as e:
+        parser.error(str(e))
+    levels_spec = [int(c) for c in args.concurrency.split(",")]
+
+    processes = spawn_stack(args) if args.spawn else []
+    levels = []
+    try:
+        for concurrency in levels_spec:
+            level = asyncio.run(run_level(args.base_url, concurrency, args.duration, args.interval, mix, builders,
+                                          args.timeout, args.probe_interval, args.seed))
+            levels.append(level)
+            print(f"c={concurrency:<4} {level['throughput_rps']:>8} req/s  p50 {level['p50_ms']} ms  "
+                  f"p95 {level['p95_ms']} ms  p99 {level['p99_ms']} ms  errors {level['error_rate']:.1%}  "
+                  f"loop lag p95 {level['loop_lag_p95_ms']} ms (healthz p95 {level['healthz_p95_ms']} ms)")
+    finally:
+        stop_stack(processes)
+
+    saturation = find_saturation(levels)
+    workers = f" with {args.workers} worker(s)" if args.spawn else ""
+    print(f"\nSaturation{workers}: {f'~{saturation} concurrent requests' if saturation else 'not reached'}")
+
+    report = {
+        "suite": "http_load",
+        "createdAt": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "config": {"base_url": args.base_url, "mix": mix, "duration": args.duration, "interval": args.interval,
+                   "spawned": args.spawn, "workers": args.workers if args.spawn else None,
+                   "standin_latency": args.standin_latency if args.spawn else None},
+        "saturation_concurrency": saturation,
+        "levels": levels,
+    }
+    out = args.out or Path(__file__).resolve().parent / f"results/http-load-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
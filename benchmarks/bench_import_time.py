@@ -0,0 +1,93 @@
+# benchmarks/bench_import_time.py
+"""
+Startup import-time benchmark with a per-module timeline (python -X importtime).
+
+Usage:
+    python -m benchmarks.bench_import_time [--module app.main] [--top 25] [--json out.json]
+
+Each run imports the module in a fresh interpreter, so numbers match a worker cold start.
+Reports wall time, the slowest modules by cumulative import time, and which of the heavy
+extraction / LLM libraries ended up imported eagerly.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HEAVY_MODULES = [
+    "langchain_openai", "openai", "PyPDF2", "pdfminer", "pdfplumber", "fitz",
+    "pdf2image", "pytesseract", "langdetect", "docx", "ftfy",
+]
+
+_PROBE = (
+    "import sys, json, importlib; importlib.import_module({module!r}); "
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+)
+
+
+def run_import(module: str, env: Dict[str, str]) -> Dict:
+    """Import 'module' in a fresh interpreter; return wall time, timeline and eager heavy modules."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, env=env,
+    )
+    wall = time.perf_counter() - started
+
+    timeline: List[Dict] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timeline.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+
+    eager = []
+    if proc.returncode == 0 and proc.stdout.strip():
+        eager = json.loads(proc.stdout.strip().splitlines()[-1])
+    error = None
+    if proc.returncode != 0:
+        error = [ln for ln in proc.stderr.splitlines() if not ln.startswith("import time:")][-1:]
+    return {"module": module, "wall_s": wall, "ok": proc.returncode == 0, "error": error,
+            "eager_heavy_modules": eager, "timeline": timeline}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", action="append", help="module to import (repeatable); default app.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", help="write the full timeline(s) to this file")
+    parser.add_argument("--no-api-key", action="store_true",
+                        help="unset OPENAI_API_KEY to check imports do not need credentials")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.no_api_key:
+        env.pop("OPENAI_API_KEY", None)
+
+    results = []
+    for module in args.module or ["app.main"]:
+        res = run_import(module, env)
+        results.append(res)
+        status = "ok" if res["ok"] else f"FAILED {res['error']}"
+        print(f"\n== {module}: {res['wall_s'] * 1000:.0f} ms wall ({status})")
+        print(f"   eager heavy modules: {', '.join(res['eager_heavy_modules']) or 'none'}")
+        top_level = [t for t in res["timeline"] if t["depth"] == 0]
+        for t in sorted(top_level, key=lambda t: t["cumulative_ms"], reverse=True)[: args.top]:
+            print(f"   {t['cumulative_ms']:9.1f} ms  {t['module']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nTimeline written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_near_duplicate.py
+"""
+Compare the legacy O(n²) exact-stem scan with the MinHash/LSH near-duplicate index.
+
+Usage:
+    python -m benchmarks.bench_near_duplicate [--n 2000] [--threshold 0.7]
+
+Reports total insert+query time for both approaches and how many reworded
+duplicates each one catches (the legacy scan only catches exact matches).
+"""
+import argparse
+import random
+import time
+
+from app.core.normalizers.question_normalizer import is_dup_by_stem
+from app.core.normalizers.near_duplicate import NearDuplicateIndex
+
+HEBREW_LETTERS = "אבגדהוזחטיכלמנסעפצקרשת"
+QUESTION_OPENERS = ["מה", "מי", "כיצד", "מדוע", "מתי", "הסבר", "השווה בין"]
+
+
+def _make_vocabulary(size: int, rng: random.Random):
+    return ["".join(rng.choice(HEBREW_LETTERS) for _ in range(rng.randint(3, 7))) for _ in range(size)]
+
+
+def _make_stems(n: int, rng: random.Random):
+    vocab = _make_vocabulary(3000, rng)
+    return [
+        f"{rng.choice(QUESTION_OPENERS)} {' '.join(rng.sample(vocab, k=rng.randint(6, 10)))}?"
+        for _ in range(n)
+    ]
+
+
+def _reword(stem: str, rng: random.Random) -> str:
+    """Surface rewording: swap the opener, drop one word, or add niqqud/punctuation."""
+    words = stem.rstrip("?").split()
+    op = rng.randrange(3)
+    if op == 0:
+        words[0] = rng.choice([w for w in QUESTION_OPENERS if w != words[0]])
+    elif op == 1 and len(words) > 4:
+        del words[rng.randrange(1, len(words))]
+    else:
+        words[1] = words[1][0] + "\u05B8" + words[1][1:] + ","
+    return " ".join(words) + "?"
+
+
+def run(n: int, threshold: float, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    stems = _make_stems(n, rng)
+    probes = [_reword(s, rng) for s in rng.sample(stems, k=max(1, n // 10))]
+
+    # Legacy: pairwise exact scan against everything collected so far
+    t0 = time.perf_counter()
+    collected = []
+    for s in stems:
+        q = {"stem": s}
+        if not any(is_dup_by_stem(q, c) for c in collected):
+            collected.append(q)
+    legacy_hits = sum(1 for p in probes if any(is_dup_by_stem({"stem": p}, c) for c in collected))
+    legacy_s = time.perf_counter() - t0
+
+    # MinHash/LSH index
+    t0 = time.perf_counter()
+    idx = NearDuplicateIndex(threshold=threshold)
+    for i, s in enumerate(stems):
+        if idx.find_duplicate(s) is None:
+            idx.add(i, s)
+    lsh_hits = sum(1 for p in probes if idx.find_duplicate(p) is not None)
+    lsh_s = time.perf_counter() - t0
+
+    return {
+        "n": n,
+        "probes": len(probes),
+        "legacy": {"seconds": round(legacy_s, 4), "reworded_caught": legacy_hits},
+        "minhash_lsh": {"seconds": round(lsh_s, 4), "reworded_caught": lsh_hits,
+                        "per_op_ms": round(1000 * lsh_s / (n + len(probes)), 4)},
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--threshold", type=float, default=0.7)
+    args = ap.parse_args()
+
+    for size in sorted({max(100, args.n // 10), args.n}):
+        res = run(size, args.threshold)
+        print(f"📊 n={res['n']:>6} | legacy {res['legacy']['seconds']:>8.4f}s "
+              f"(caught {res['legacy']['reworded_caught']}/{res['probes']}) | "
+              f"minhash {res['minhash_lsh']['seconds']:>8.4f}s "
+              f"(caught {res['minhash_lsh']['reworded_caught']}/{res['probes']}, "
+              f"{res['minhash_lsh']['per_op_ms']} ms/op)")
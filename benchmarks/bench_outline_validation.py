@@ -0,0 +1,104 @@
+# benchmarks/bench_outline_validation.py
+"""
+Round-trips and latency of validate_outline_dependencies on a synthetic outline.
+
+Usage:
+    python -m benchmarks.bench_outline_validation [--lessons 30] [--blocks 2000]
+
+Needs a reachable MongoDB (settings.MONGO_URI). A pymongo CommandListener counts the find
+commands sent by the old per-reference validator (find_one per corpus / block) and by the
+batched one ($in per collection); half of the referenced blocks exist, so both paths do real work.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from pymongo import monitoring
+
+from app.core.config import get_db
+from app.crud.crud_outlines import validate_outline_dependencies
+
+
+class FindCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name == "find":
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = FindCounter()
+monitoring.register(counter)  # applies to clients created from here on (get_db() makes new ones)
+
+
+async def per_reference_validate(outline_doc: dict):
+    """The previous implementation, kept here as the baseline."""
+    db = get_db()
+    missing_corpus, missing_blocks = [], []
+    for lesson in outline_doc.get("lessons", []):
+        corpus_id = lesson.get("corpusId")
+        if not await db["content_corpus"].find_one({"_id": corpus_id}):
+            missing_corpus.append(corpus_id)
+        for section in lesson.get("sections", []):
+            for page in section.get("pages", []):
+                for block_id in page.get("blocks", []):
+                    if not await db["blocks"].find_one({"_id": block_id}):
+                        missing_blocks.append(block_id)
+    return {"missingCorpus": missing_corpus, "missingBlocks": missing_blocks}
+
+
+def build_outline(tag: str, lessons: int, blocks: int) -> dict:
+    per_lesson = max(1, blocks // lessons)
+    return {
+        "_id": f"outline_{tag}",
+        "lessons": [
+            {
+                "corpusId": f"corpus_{tag}_{i}",
+                "sections": [{"pages": [{"blocks": [f"block_{tag}_{i}_{j}" for j in range(per_lesson)]}]}],
+            }
+            for i in range(lessons)
+        ],
+    }
+
+
+async def measure(fn, outline):
+    counter.count = 0
+    started = time.perf_counter()
+    report = await fn(outline)
+    return report, counter.count, time.perf_counter() - started
+
+
+async def main(lessons: int, blocks: int):
+    tag = uuid4().hex[:8]
+    outline = build_outline(tag, lessons, blocks)
+    all_blocks = [b for l in outline["lessons"] for s in l["sections"] for p in s["pages"] for b in p["blocks"]]
+    present = [{"_id": b, "blockType": "text", "content": "x"} for b in all_blocks[::2]]
+
+    db = get_db()
+    await db["blocks"].insert_many(present)
+    try:
+        old, old_trips, old_t = await measure(per_reference_validate, outline)
+        new, new_trips, new_t = await measure(validate_outline_dependencies, outline)
+    finally:
+        await db["blocks"].delete_many({"_id": {"$in": [d["_id"] for d in present]}})
+
+    assert old == new, "batched validator must return the same report"
+    print(f"Outline: {lessons} lessons, {len(all_blocks)} block refs ({len(present)} present)")
+    print(f"  per-reference: {old_trips:5d} find commands  {old_t * 1000:8.1f} ms")
+    print(f"  batched $in:   {new_trips:5d} find commands  {new_t * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lessons", type=int, default=30)
+    parser.add_argument("--blocks", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.lessons, args.blocks))
@@ -0,0 +1,406 @@
+# benchmarks/bench_pipeline.py
+"""
+End-to-end pipeline benchmark suite on the fake LLM backend (LLM_PROVIDER=fake).
+
+Usage:
+    python -m benchmarks.bench_pipeline [--cases stage2_5q,bulk_upsert_1k] [--repeat 5] [--warmup 1]
+        [--mongo local|memory] [--latency 0] [--out PATH] [--baseline PATH] [--save-baseline]
+        [--tolerance 0.25]
+
+Cases: Stage 1 (single lesson, 10-lesson full course), Stage 2 question generation (5 and 20
+MCQs with the Bloom, difficulty and grounding verifiers), PDF / DOCX extraction on generated
+fixture documents, and bulk_upsert_blocks at 1k / 10k blocks.
+
+Each case runs in a fresh interpreter, so peak RSS is per case. Reports p50/p95 latency,
+throughput (runs, accepted questions, pages or blocks per second), peak RSS and LLM calls per
+accepted question. Results are written as JSON; against a saved baseline, metrics that got
+worse by more than --tolerance are flagged and the exit code is 1.
+
+Mongo: "local" uses MONGO_URI (database DB_NAME, default eduflow_bench); "memory" needs
+mongomock-motor. Cases that need the database are reported as skipped when it is unreachable.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures/pipeline_corpus.json"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines/pipeline.json"
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# metric → True when higher is better
+COMPARED_METRICS = {
+    "p50_s": False,
+    "p95_s": False,
+    "throughput": True,
+    "peak_rss_mb": False,
+    "llm_calls_per_accepted": False,
+}
+
+
+# ---- Cases ----
+class Case:
+    """prepare(i) and cleanup(payload) are untimed; run(payload) is timed and returns {units, accepted}."""
+
+    def __init__(self, run: Callable, unit: str, needs_db: bool = False,
+                 prepare: Optional[Callable] = None, cleanup: Optional[Callable] = None):
+        self.run = run
+        self.unit = unit
+        self.needs_db = needs_db
+        self.prepare = prepare
+        self.cleanup = cleanup
+
+
+def _fixtures() -> Dict[str, Any]:
+    return json.loads(FIXTURES.read_text(encoding="utf-8"))
+
+
+def _stage1_case(scope: str, lessons: Optional[int]) -> Case:
+    def prepare(i: int):
+        from app.schemas.input_model import Stage1Input
+        from app.utils import generate_cache_key
+
+        inputs = Stage1Input(**_fixtures()["stage1"], generationScope=scope, numLessons=lessons)
+        return inputs, generate_cache_key(inputs.topicName, inputs.subject, inputs.gradeLevel, inputs.bigIdea)
+
+    async def run(payload):
+        from app.core.pipeline.stage_1_corpus_initial import run_stage_1
+
+        await run_stage_1(payload[0])
+        return {"units": 1, "accepted": 0}
+
+    async def cleanup(payload):
+        from app.core import config
+
+        # Every iteration inserts a fresh corpus instead of hitting the unchanged-content shortcut
+        await config.get_db()["content_corpus"].delete_many({"cacheKey": payload[1]})
+
+    return Case(run, "runs", needs_db=True, prepare=prepare, cleanup=cleanup)
+
+
+def _stage2_case(num_questions: int) -> Case:
+    def prepare(i: int):
+        from app.schemas.stage2 import Stage2Request
+
+        fixtures = _fixtures()
+        common = {k: v for k, v in fixtures["stage1"].items() if k != "learningGate"}
+        return Stage2Request(
+            **common, learningGate="Meeting", generationScope="Single Lesson",
+            mode="generate_questions", num_questions=num_questions, question_types=["mcq"],
+            cognitive_target="comprehension_application", target_difficulty="medium",
+            chunks=fixtures["chunks"],
+            # Fresh outline per iteration: the question bank of earlier iterations must not reject repeats
+            save_to_blocks=True, courseOutlineId=f"bench_outline_{uuid.uuid4().hex}",
+        )
+
+    async def run(req):
+        from app.core.pipeline.stage2_pipeline import run_stage2
+
+        result = await run_stage2(req)
+        return {"units": len(result.generated), "accepted": len(result.generated)}
+
+    async def cleanup(req):
+        from app.core import config
+
+        await config.get_db()["blocks"].delete_many({"courseOutlineId": req.courseOutlineId})
+
+    return Case(run, "questions", needs_db=True, prepare=prepare, cleanup=cleanup)
+
+
+def _make_pdf(path: str, pages: int) -> None:
+    import fitz
+
+    paragraphs = [c["text"] for c in _fixtures()["chunks"]]
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), "\n\n".join(paragraphs[p % 3:] + paragraphs[:p % 3]),
+                            fontsize=10)
+    doc.save(path)
+
+
+def _make_docx(path: str, paragraphs: int) -> None:
+    from docx import Document
+
+    texts = [c["text"] for c in _fixtures()["chunks"]]
+    doc = Document()
+    for i in range(paragraphs):
+        if i % 10 == 0:
+            doc.add_heading(f"Section {i // 10 + 1}", level=2)
+        doc.add_paragraph(texts[i % len(texts)])
+    doc.save(path)
+
+
+def _extraction_case(kind: str, size: int) -> Case:
+    workdir = tempfile.mkdtemp(prefix="bench_extract_")
+    path = os.path.join(workdir, f"fixture.{kind}")
+
+    def prepare(i: int):
+        if not os.path.exists(path):
+            (_make_pdf if kind == "pdf" else _make_docx)(path, size)
+        return path
+
+    async def run(path):
+        if kind == "pdf":
+            from app.services.fetchers.pdf_handler import smart_extract_pdf
+
+            text = await asyncio.to_thread(smart_extract_pdf, path)
+        else:
+            from app.services.fetchers.docx_handler import DocxExtractor
+
+            text = await asyncio.to_thread(lambda: DocxExtractor(path).extract_text())
+        if not text:
+            raise RuntimeError(f"{kind} extraction returned no text")
+        return {"units": size, "accepted": 0}
+
+    return Case(run, "pages" if kind == "pdf" else "paragraphs", prepare=prepare)
+
+
+def _bulk_upsert_case(n: int) -> Case:
+    def prepare(i: int):
+        run_id = f"bench_{uuid.uuid4().hex}"
+        return run_id, [{
+            "blockType": "question",
+            "content": {"question": {"type": "open", "stem": f"Benchmark question {j}?"}},
+            "courseOutlineId": "bench_outline",
+            "pageId": f"bench_page_{j % 50}",
+            "pipeline_run_id": run_id,
+        } for j in range(n)]
+
+    async def run(payload):
+        from app.crud.crud_block import bulk_upsert_blocks
+
+        refs = await bulk_upsert_blocks(payload[1])
+        return {"units": len(refs), "accepted": 0}
+
+    async def cleanup(payload):
+        from app.core import config
+
+        await config.get_db()["blocks"].delete_many({"pipeline_run_id": payload[0]})
+
+    return Case(run, "blocks", needs_db=True, prepare=prepare, cleanup=cleanup)
+
+
+CASES: Dict[str, Callable[[], Case]] = {
+    "stage1_single_lesson": lambda: _stage1_case("Single Lesson", None),
+    "stage1_full_course_10": lambda: _stage1_case("Full Course", 10),
+    "stage2_5q": lambda: _stage2_case(5),
+    "stage2_20q": lambda: _stage2_case(20),
+    "extract_pdf_20p": lambda: _extraction_case("pdf", 20),
+    "extract_docx_200p": lambda: _extraction_case("docx", 200),
+    "bulk_upsert_1k": lambda: _bulk_upsert_case(1_000),
+    "bulk_upsert_10k": lambda: _bulk_upsert_case(10_000),
+}
+
+
+# ---- Worker (one case, fresh interpreter) ----
+def _use_memory_mongo() -> None:
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("--mongo memory needs mongomock-motor (pip install mongomock-motor)")
+    from app.core import config
+    import app.core.pipeline.stage2_pipeline  # noqa: F401  (import every get_db user before patching)
+    import app.core.pipeline.stage_1_corpus_initial  # noqa: F401
+    import app.crud.crud_pipeline_runs  # noqa: F401
+
+    db = AsyncMongoMockClient()[config.settings.DB_NAME]
+    original = config.get_db
+    for module in list(sys.modules.values()):
+        if getattr(module, "get_db", None) is original:
+            module.get_db = lambda: db
+
+
+async def _connect(mongo: str) -> Optional[str]:
+    """Point the app at the benchmark database; returns why DB cases must be skipped, if so."""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.core.config import init_db, settings
+
+    if mongo == "memory":
+        _use_memory_mongo()
+    else:
+        try:
+            await AsyncIOMotorClient(settings.MONGO_URI, serverSelectionTimeoutMS=2000).admin.command("ping")
+        except Exception as e:
+            return f"MongoDB unreachable at {settings.MONGO_URI} ({e.__class__.__name__})"
+    await init_db()
+    return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+async def run_case(name: str, repeat: int, warmup: int, mongo: str) -> Dict[str, Any]:
+    from app.services.fake_llm import fake_llm_stats
+
+    case = CASES[name]()
+    if case.needs_db:
+        reason = await _connect(mongo)
+        if reason:
+            return {"status": "skipped", "reason": reason}
+
+    samples: List[float] = []
+    units = accepted = calls = 0
+    for i in range(warmup + repeat):
+        payload = case.prepare(i) if case.prepare else None
+        calls_before = fake_llm_stats["calls"]
+        started = time.perf_counter()
+        out = await case.run(payload)
+        elapsed = time.perf_counter() - started
+        if case.cleanup:
+            await case.cleanup(payload)
+        if i < warmup:
+            continue
+        samples.append(elapsed)
+        units += out["units"]
+        accepted += out["accepted"]
+        calls += fake_llm_stats["calls"] - calls_before
+
+    return {
+        "status": "ok",
+        "repeat": repeat,
+        "unit": case.unit,
+        "p50_s": round(_percentile(samples, 0.50), 4),
+        "p95_s": round(_percentile(samples, 0.95), 4),
+        "mean_s": round(sum(samples) / len(samples), 4),
+        "throughput": round(units / sum(samples), 2) if sum(samples) else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "llm_calls_per_run": round(calls / repeat, 2),
+        "accepted_per_run": round(accepted / repeat, 2),
+        "llm_calls_per_accepted": round(calls / accepted, 2) if accepted else None,
+    }
+
+
+# ---- Driver ----
+def spawn_case(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "fake",
+        "WIKIPEDIA_OFFLINE": "true",
+        "FAKE_LLM_LATENCY": args.latency,
+        "FAKE_LLM_SEED": str(args.seed),
+        "DB_NAME": args.db_name,
+        "LOG_SINK_ENABLED": "false",
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "result.json")
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_pipeline", "--worker", name, "--worker-out", out,
+             "--repeat", str(args.repeat), "--warmup", str(args.warmup), "--mongo", args.mongo],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0 or not os.path.exists(out):
+            return {"status": "failed", "error": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def find_regressions(cases: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[Dict]:
+    """Metrics that moved in the bad direction by more than 'tolerance' (relative) vs. the baseline."""
+    regressions = []
+    for name, result in cases.items():
+        base = baseline.get(name) or {}
+        if result.get("status") != "ok" or base.get("status") != "ok":
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append({"case": name, "metric": metric, "baseline": old, "current": new,
+                                    "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", help=f"comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--mongo", choices=["local", "memory"], default="local")
+    parser.add_argument("--db-name", default="eduflow_bench")
+    parser.add_argument("--latency", default="0", help="FAKE_LLM_LATENCY spec, e.g. lognormal:800,0.5")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = asyncio.run(run_case(args.worker, args.repeat, args.warmup, args.mongo))
+        with open(args.worker_out, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    cases = {}
+    for name in names:
+        cases[name] = r = spawn_case(name, args)
+        if r["status"] == "ok":
+            per_accepted = r["llm_calls_per_accepted"]
+            print(f"{name:<22} p50 {r['p50_s'] * 1000:9.1f} ms  p95 {r['p95_s'] * 1000:9.1f} ms  "
+                  f"{r['throughput']:>9} {r['unit']}/s  rss {r['peak_rss_mb']} MB  "
+                  f"llm/accepted {per_accepted if per_accepted is not None else '-'}")
+        else:
+            print(f"{name:<22} {r['status']}: {r.get('reason') or r.get('error')}")
+
+    report = {
+        "suite": "pipeline",
+        "createdAt": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "env": {"python": platform.python_version(), "platform": platform.platform(), "mongo": args.mongo,
+                "latency": args.latency, "seed": args.seed, "repeat": args.repeat, "warmup": args.warmup},
+        "cases": cases,
+    }
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["baseline"] = {"path": str(args.baseline), "createdAt": baseline.get("createdAt")}
+        report["regressions"] = find_regressions(cases, baseline.get("cases", {}), args.tolerance)
+        for reg in report["regressions"]:
+            print(f"⚠️ regression {reg['case']}.{reg['metric']}: {reg['baseline']} → {reg['current']} "
+                  f"({reg['change']:+.0%})")
+
+    out = args.out or DEFAULT_RESULTS_DIR / f"pipeline-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {out}")
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
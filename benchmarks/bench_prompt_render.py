@@ -0,0 +1,59 @@
+# benchmarks/bench_prompt_render.py
+"""
+Per-call cost of rendering a user prompt: legacy jinja2.Template(str) per call vs. the
+compiled PromptRegistry template.
+
+Usage:
+    python -m benchmarks.bench_prompt_render [--n 2000]
+"""
+import argparse
+import time
+
+from jinja2 import Template
+
+from app.services.prompt_manager import load_prompt, registry, render_prompt
+
+PROMPT = "data_agents/question_generator_prompt.yaml"
+CONTEXT = {
+    "topicName": "המהפכה הצרפתית",
+    "subject": "היסטוריה",
+    "gradeLevel": "9",
+    "bigIdea": "שינוי חברתי",
+    "learningGate": "הבנה",
+    "skills": ["ניתוח מקורות"],
+    "context": "",
+    "freePrompt": "",
+    "courseLanguage": "he",
+    "question_type": "mcq",
+    "bloom_level": "knowledge",
+    "difficulty": "easy",
+    "chunks": [{"chunk_id": "c1", "text": "המהפכה הצרפתית פרצה בשנת 1789."}],
+    "covered_stems": ["מתי פרצה המהפכה?"] * 10,
+}
+
+
+def _time(fn, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=2000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    registry.load_all()
+    print(f"registry load_all: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    user_tpl = load_prompt(PROMPT)["user"]
+    legacy = _time(lambda: Template(user_tpl).render(**CONTEXT), args.n)
+    compiled = _time(lambda: render_prompt(PROMPT, CONTEXT), args.n)
+    print(f"legacy Template(str).render: {legacy:8.1f} µs/call")
+    print(f"registry render_prompt:      {compiled:8.1f} µs/call  ({legacy / compiled:.0f}× faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_verifier_cascade.py
+"""
+Measure the Bloom/difficulty verification cascade on the labeled fixture set.
+
+Usage:
+    python -m benchmarks.bench_verifier_cascade [--fixtures PATH] [--repeat 200]
+
+Reports, per verifier, how many verdicts the heuristic settles on its own (= LLM calls
+avoided), the accuracy of those local verdicts against the gold labels, and the
+heuristic cost per question. Items below the confidence threshold go to the LLM, so the
+cascade keeps the LLM's accuracy as long as the local verdicts stay correct.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.verifiers.bloom_heuristics import classify_bloom
+from app.core.verifiers.difficulty_heuristics import classify_difficulty
+from app.core.verifiers.grounding_precheck import ChunkIndex
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent / "tests/core/verifiers/fixtures/verifier_labels.json"
+
+
+def evaluate(fixtures: dict):
+    chunk_indexes = {k: ChunkIndex(v) for k, v in fixtures["chunks"].items()}
+    stats = {
+        "bloom": {"local": 0, "correct": 0},
+        "difficulty": {"local": 0, "correct": 0},
+    }
+    for item in fixtures["items"]:
+        bloom = classify_bloom(item["stem"], item["bloom"])
+        if bloom["confidence"] >= settings.BLOOM_HEURISTIC_MIN_CONFIDENCE:
+            stats["bloom"]["local"] += 1
+            stats["bloom"]["correct"] += bool(bloom["matches_target"])
+
+        diff = classify_difficulty(
+            item["stem"], item["difficulty"], answer=item["answer"], chunk_index=chunk_indexes[item["chunk"]]
+        )
+        if diff["confidence"] >= settings.DIFFICULTY_HEURISTIC_MIN_CONFIDENCE:
+            stats["difficulty"]["local"] += 1
+            stats["difficulty"]["correct"] += bool(diff["matches_target"])
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    fixtures = json.loads(args.fixtures.read_text(encoding="utf-8"))
+    n = len(fixtures["items"])
+    stats = evaluate(fixtures)
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        evaluate(fixtures)
+    per_item_ms = (time.perf_counter() - t0) / (args.repeat * n) * 1000
+
+    print(f"items: {n}  (thresholds: bloom={settings.BLOOM_HEURISTIC_MIN_CONFIDENCE}, "
+          f"difficulty={settings.DIFFICULTY_HEURISTIC_MIN_CONFIDENCE})")
+    for name, s in stats.items():
+        acc = s["correct"] / s["local"] if s["local"] else 1.0
+        print(f"{name:<11} LLM calls avoided: {s['local']:>3}/{n} ({s['local'] / n:.0%})  "
+              f"local accuracy: {acc:.0%}")
+    total = stats["bloom"]["local"] + stats["difficulty"]["local"]
+    print(f"total       LLM calls avoided: {total}/{2 * n} ({total / (2 * n):.0%})  "
+          f"heuristic cost: {per_item_ms:.3f} ms/question (both verifiers)")
+
+
+if __name__ == "__main__":
+    main()
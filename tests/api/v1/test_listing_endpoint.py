@@ -0,0 +1,45 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from bson import ObjectId
+
+from app.api.v1.endpoints import listing
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(listing.router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def test_blocks_ndjson_streams_one_document_per_line(monkeypatch):
+    docs = [{"_id": ObjectId(), "blockType": "question"}, {"_id": "block_2", "blockType": "text"}]
+    captured = {}
+
+    async def fake_iter(query=None, projection=None):
+        captured["query"] = query
+        for doc in docs:
+            yield doc
+
+    monkeypatch.setattr(listing.crud_block, "iter_blocks", fake_iter)
+    response = _client().get("/api/v1/blocks", params={"pageId": "p1", "format": "ndjson"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["_id"] for line in lines] == [str(docs[0]["_id"]), "block_2"]
+    assert captured["query"] == {"pageId": "p1"}
+
+
+def test_logs_page_and_bad_cursor(monkeypatch):
+    async def fake_page(level=None, source=None, limit=100, cursor=None, projection=None):
+        if cursor == "bad":
+            raise ValueError("Invalid pagination cursor")
+        return {"items": [{"_id": "log_1", "level": level}], "next_cursor": "abc"}
+
+    monkeypatch.setattr(listing.crud_general_logs, "get_logs_page", fake_page)
+    client = _client()
+    assert client.get("/api/v1/logs", params={"level": "ERROR"}).json() == {
+        "items": [{"_id": "log_1", "level": "ERROR"}], "next_cursor": "abc",
+    }
+    assert client.get("/api/v1/logs", params={"cursor": "bad"}).status_code == 400
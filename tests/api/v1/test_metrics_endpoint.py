@@ -0,0 +1,40 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import metrics
+from app.core.tracing import run_context, span
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(metrics.traces_router, prefix="/api/v1")
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+def test_metrics_endpoint_exposes_spans_and_existing_stats():
+    import asyncio
+
+    async def traced():
+        with run_context("run_metrics_endpoint"):
+            async with span("stage2", kind="pipeline"):
+                pass
+
+    asyncio.run(traced())
+    client = _client()
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'eduflow_span_duration_seconds_count{span="stage2",kind="pipeline"' in response.text
+    assert "# TYPE eduflow_verifier_cascade_total counter" in response.text
+
+    trace = client.get("/api/v1/traces/run_metrics_endpoint").json()
+    assert trace["spans"][0]["span"] == "stage2"
+    assert client.get("/api/v1/traces/unknown").status_code == 404
+
+
+def test_healthz_reports_loop_lag():
+    body = _client().get("/healthz").json()
+    assert body["status"] == "ok"
+    assert body["loopLagMs"] >= 0
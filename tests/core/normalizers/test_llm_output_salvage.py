@@ -0,0 +1,65 @@
+# tests/core/normalizers/test_llm_output_salvage.py
+import json
+from typing import Annotated, List, Literal, Union
+
+import pytest
+from pydantic import BaseModel, Field, TypeAdapter
+
+from app.core.normalizers.llm_output_salvage import extract_json, repair_items, validate_items
+
+
+class _Open(BaseModel):
+    type: Literal["open"]
+    stem: str
+    expected_answer: str
+
+
+class _Matching(BaseModel):
+    type: Literal["matching"]
+    instructions: str
+    pairs: List[List[str]]
+    distractors: List[str]
+
+
+adapter = TypeAdapter(Annotated[Union[_Open, _Matching], Field(discriminator="type")])
+
+
+def test_extract_json_from_fences_and_prose():
+    assert extract_json('{"a": 1}') == {"a": 1}
+    assert extract_json('Here you go:\n```json\n{"questions": []}\n```\nThanks!') == {"questions": []}
+    assert extract_json('Result: [1, 2] and more text') == [1, 2]
+    with pytest.raises(ValueError):
+        extract_json("no json here")
+
+
+def test_validate_items_keeps_valid_and_reports_invalid():
+    items = [
+        {"type": "open", "stem": "מתי פרצה המהפכה?", "expected_answer": "1789"},
+        {"type": "matching", "instructions": "התאם", "pairs": [["a", "b"]]},  # missing distractors
+    ]
+    valid, invalid = validate_items(items, adapter)
+    assert [v.type for v in valid] == ["open"]
+    assert invalid[0]["index"] == 1 and "distractors" in invalid[0]["error"]
+
+
+class _FakeLLM:
+    def __init__(self, content):
+        self.content, self.messages = content, None
+
+    async def ainvoke(self, messages):
+        self.messages = messages
+        return type("Reply", (), {"content": self.content})()
+
+
+@pytest.mark.asyncio
+async def test_repair_items_sends_only_invalid_items():
+    broken = {"type": "matching", "instructions": "התאם", "pairs": [["a", "b"]]}
+    fixed = dict(broken, distractors=["c"])
+    llm = _FakeLLM("```json\n" + json.dumps({"items": [fixed]}, ensure_ascii=False) + "\n```")
+
+    repaired = await repair_items([{"index": 1, "item": broken, "error": "distractors: Field required"}], {}, llm)
+    assert repaired == [fixed]
+    assert "distractors: Field required" in llm.messages[1].content
+
+    assert await repair_items([], {}, llm) == []
+    assert await repair_items([{"index": 0, "item": {}, "error": "x"}], {}, _FakeLLM("garbage")) == []
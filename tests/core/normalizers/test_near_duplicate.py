@@ -0,0 +1,57 @@
+# tests/core/normalizers/test_near_duplicate.py
+
+import pytest
+from app.core.normalizers.near_duplicate import NearDuplicateIndex, normalize_text, shingles, jaccard
+
+
+def test_normalize_text_strips_niqqud_and_punctuation():
+    assert normalize_text("מָה הָיְתָה הַסִּבָּה?") == "מה היתה הסבה"
+    assert normalize_text("  What, WAS   the reason?! ") == "what was the reason"
+    assert normalize_text("צה\"ל – ארגון") == "צה ל ארגון"
+
+
+def test_shingles_short_text_is_single_shingle():
+    assert shingles("מה?") == frozenset(["מה"])
+    assert shingles("") == frozenset()
+
+
+def test_jaccard_identical_and_disjoint():
+    a = shingles("המהפכה הצרפתית")
+    assert jaccard(a, a) == 1.0
+    assert jaccard(a, shingles("xyz qwe")) == 0.0
+
+
+def test_index_detects_exact_duplicate_with_niqqud():
+    idx = NearDuplicateIndex(threshold=0.8)
+    idx.add("q1", "מה היתה הסבה המרכזית למהפכה הצרפתית?")
+    assert idx.find_duplicate("מָה הָיְתָה הַסִּבָּה הַמֶּרְכָּזִית לַמַּהְפֵּכָה הַצָּרְפָתִית") == "q1"
+
+
+def test_index_detects_reworded_duplicate():
+    idx = NearDuplicateIndex(threshold=0.6)
+    idx.add("q1", "מה הייתה הסיבה המרכזית לפרוץ המהפכה הצרפתית?")
+    matches = idx.query("מהי הסיבה המרכזית לפרוץ המהפכה הצרפתית?")
+    assert matches and matches[0][0] == "q1"
+    assert matches[0][1] >= 0.6
+
+
+def test_index_ignores_unrelated_stem():
+    idx = NearDuplicateIndex(threshold=0.7)
+    idx.add("q1", "מה הייתה הסיבה המרכזית לפרוץ המהפכה הצרפתית?")
+    assert idx.find_duplicate("מי היה ראש הממשלה הראשון של מדינת ישראל?") is None
+
+
+def test_index_add_is_idempotent_per_key():
+    idx = NearDuplicateIndex()
+    idx.add(0, "What year did the Bastille fall?")
+    idx.add(0, "What year did the Bastille fall?")
+    idx.add(1, "")
+    assert len(idx) == 1
+    assert 0 in idx and 1 not in idx
+
+
+def test_index_rejects_invalid_configuration():
+    with pytest.raises(ValueError, match="threshold"):
+        NearDuplicateIndex(threshold=0.0)
+    with pytest.raises(ValueError, match="divisible"):
+        NearDuplicateIndex(num_perm=10, bands=3)
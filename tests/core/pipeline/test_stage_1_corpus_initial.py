@@ -131,3 +131,42 @@ async def test_stage1_philosophy_free_prompt(test_db):
     title_text = " ".join(lesson_titles).lower()
     assert isinstance(saved_doc.content.scopedLessons, list)
     assert len(saved_doc.content.scopedLessons) >= 2
+
+
+@pytest.mark.asyncio
+async def test_stage1_rerun_with_same_input_skips_write(test_db, monkeypatch):
+    from app.core.config import settings
+
+    # Deterministic offline content; only the fetch timestamps differ between the two runs
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    await init_beanie(database=test_db, document_models=[ContentCorpus])
+    inputs = Stage1Input(
+        topicName="The Water Cycle",
+        subject="Science",
+        gradeLevel="9",
+        bigIdea="Systems in Nature",
+        generationScope="Single Lesson",
+        learningGate="Discovery Gate",
+        skills=["Observation"]
+    )
+    writes = []
+    replace, insert = ContentCorpus.replace, ContentCorpus.insert
+
+    async def counting_replace(self, *args, **kwargs):
+        writes.append("replace")
+        return await replace(self, *args, **kwargs)
+
+    async def counting_insert(self, *args, **kwargs):
+        writes.append("insert")
+        return await insert(self, *args, **kwargs)
+
+    monkeypatch.setattr(ContentCorpus, "replace", counting_replace)
+    monkeypatch.setattr(ContentCorpus, "insert", counting_insert)
+
+    first_id = await run_stage_1(inputs)
+    first = await ContentCorpus.get(PydanticObjectId(first_id))
+    second_id = await run_stage_1(inputs)
+
+    assert second_id == first_id
+    assert writes == ["insert"]
+    assert (await ContentCorpus.get(PydanticObjectId(first_id))).contentHash == first.contentHash
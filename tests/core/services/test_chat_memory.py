@@ -0,0 +1,123 @@
+# tests/core/services/test_chat_memory.py
+import pytest
+
+from app.core.config import settings
+from app.core.services import chat_memory
+
+
+class _Store:
+    """In-memory stand-in for the bucketed chat_history CRUD functions."""
+
+    def __init__(self):
+        self.messages, self.header = [], {}
+
+    async def get_chat_session(self, session_id):
+        return dict(self.header, messageCount=len(self.messages))
+
+    async def get_recent_messages(self, session_id, n):
+        return self.messages[-n:]
+
+    async def get_messages_range(self, session_id, start, end):
+        return self.messages[start:end]
+
+    async def save_session_summary(self, session_id, summary, count):
+        self.header.update(summary=summary, summarizedCount=count)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    s = _Store()
+    for name in ("get_chat_session", "get_recent_messages", "get_messages_range", "save_session_summary"):
+        monkeypatch.setattr(chat_memory, name, getattr(s, name))
+    monkeypatch.setattr(settings, "CHAT_MEMORY_TOKEN_BUDGET", 400)
+    monkeypatch.setattr(settings, "CHAT_MEMORY_SUMMARY_TOKENS", 60)
+    return s
+
+
+@pytest.mark.asyncio
+async def test_context_stays_within_budget_and_summary_folds_incrementally(store, monkeypatch):
+    folded_batches = []
+
+    async def fake_summarize(summary, messages):
+        folded_batches.append(len(messages))
+        return f"summary of {len(messages) + (int(summary.split()[-1]) if summary else 0)}"
+
+    monkeypatch.setattr(chat_memory, "summarize", fake_summarize)
+
+    for turn in range(40):
+        context = await chat_memory.build_context("s1", "You are a tutor.", f"question {turn} " + "word " * 20)
+        assert sum(chat_memory.message_tokens(m) for m in context) <= settings.CHAT_MEMORY_TOKEN_BUDGET
+        assert context[0]["role"] == "system" and context[-1]["content"].startswith(f"question {turn}")
+        store.messages += [{"sender": "user", "text": f"question {turn} " + "word " * 20},
+                           {"sender": "llm", "text": f"answer {turn} " + "word " * 20}]
+
+    # Everything before the window is summarized exactly once, a couple of messages per turn
+    window = [m for m in context if m["role"] != "system"][:-1]
+    assert store.header["summarizedCount"] == len(store.messages) - 2 - len(window)
+    assert store.header["summary"] == f"summary of {store.header['summarizedCount']}"
+    assert max(folded_batches) <= 4
+    assert context[1]["content"].startswith("Summary of the earlier conversation")
+
+
+@pytest.mark.asyncio
+async def test_summary_failure_keeps_previous_summary(store, monkeypatch):
+    store.messages = [{"role": "user", "content": "x " * 200}] * 6
+    store.header = {"summary": "old", "summarizedCount": 0}
+
+    async def failing(summary, messages):
+        raise RuntimeError("model down")
+
+    monkeypatch.setattr(chat_memory, "summarize", failing)
+    context = await chat_memory.build_context("s1", "sys", "hi")
+    assert context[1]["content"].endswith("old")
+    assert store.header["summarizedCount"] == 0
+
+
+@pytest.mark.asyncio
+async def test_legacy_session_sees_turns_recorded_in_buckets(store, monkeypatch):
+    folded = []
+
+    async def fake_summarize(summary, messages):
+        folded.extend(m["content"] for m in messages)
+        return "summary"
+
+    monkeypatch.setattr(chat_memory, "summarize", fake_summarize)
+    legacy = [{"sender": "user" if i % 2 == 0 else "llm", "text": f"old {i} " + "word " * 60} for i in range(6)]
+    store.header = {"messages": legacy}
+    store.messages = [{"sender": "user", "text": "new question"}, {"sender": "llm", "text": "new answer"}]
+
+    context = await chat_memory.build_context("session_u1", "sys", "follow-up")
+    contents = [m["content"] for m in context]
+    assert contents[-3:] == ["new question", "new answer", "follow-up"]
+    # Everything before the window, legacy first, is folded once and counted over both stores
+    window = len(context) - 3
+    assert store.header["summarizedCount"] == len(legacy) + 2 - window
+    assert folded == [m["text"] for m in legacy][:store.header["summarizedCount"]]
+
+
+@pytest.mark.asyncio
+async def test_long_backlog_is_folded_oldest_first_without_gaps(store, monkeypatch):
+    folded = []
+
+    async def fake_summarize(summary, messages):
+        folded.extend(m["content"] for m in messages)
+        return f"summary of {len(folded)}"
+
+    monkeypatch.setattr(chat_memory, "summarize", fake_summarize)
+    monkeypatch.setattr(settings, "CHAT_MEMORY_MAX_FOLD", 25)
+    store.messages = [{"sender": "user", "text": f"m{i} " + "word " * 10} for i in range(200)]
+
+    for _ in range(10):
+        context = await chat_memory.build_context("s1", "sys", "next")
+    window = [m for m in context if m["role"] != "system"][:-1]
+    window_start = len(store.messages) - len(window)
+
+    # Caught up over several turns, every message before the window summarized exactly once, in order
+    assert store.header["summarizedCount"] == window_start
+    assert folded == [m["text"] for m in store.messages[:window_start]]
+
+
+def test_fit_window_and_truncate():
+    msgs = [{"role": "user", "content": "a " * 50}, {"role": "assistant", "content": "b"}, {"role": "user", "content": "c"}]
+    assert chat_memory.fit_window(msgs, 20) == msgs[1:]
+    assert chat_memory.count_tokens(chat_memory.truncate_tokens("שלום " * 200, 30)) <= 30
@@ -0,0 +1,49 @@
+#tests/core/services/test_question_bank.py
+import pytest
+import app.core.services.question_bank as qb
+
+
+def test_question_bank_finds_known_stem():
+    bank = qb.QuestionBank(("outline_1", None, None), ["מה הייתה הסיבה המרכזית לפרוץ המהפכה הצרפתית?"])
+    assert bank.find_known("מהי הסיבה המרכזית לפרוץ המהפכה הצרפתית?") is not None
+    assert bank.find_known("מי כתב את מגילת העצמאות?") is None
+
+
+def test_covered_stems_most_recent_first():
+    bank = qb.QuestionBank(("outline_1", None, None), ["a one", "b two", "c three"])
+    assert bank.covered_stems(max_items=2) == ["c three", "b two"]
+    assert bank.covered_stems(max_items=0) == []
+
+
+def test_compact_stems_dedups_truncates_and_caps():
+    long_stem = "מה " * 60
+    out = qb.compact_stems(["  x   y ", "x y", long_stem, "z"], max_items=2, max_chars=20)
+    assert out[0] == "x y"
+    assert len(out) == 2
+    assert len(out[1]) <= 20 and out[1].endswith("…")
+
+
+@pytest.mark.asyncio
+async def test_get_question_bank_is_lazy_and_cached(monkeypatch):
+    calls = []
+
+    async def fake_find_question_stems(outline_id=None, lesson_id=None, page_id=None):
+        calls.append((outline_id, lesson_id, page_id))
+        return ["What year did the Bastille fall?"]
+
+    qb.invalidate_question_banks()
+    monkeypatch.setattr(qb, "find_question_stems", fake_find_question_stems)
+
+    assert await qb.get_question_bank() is None
+    assert calls == []
+
+    bank = await qb.get_question_bank("outline_1", None, "page_1")
+    again = await qb.get_question_bank("outline_1", None, "page_1")
+    assert bank is again
+    assert calls == [("outline_1", None, "page_1")]
+
+    qb.remember_saved_stems(["Who stormed the Bastille in 1789?"], "outline_1", "lesson_1", "page_1")
+    qb.remember_saved_stems(["Unrelated page question?"], "outline_1", "lesson_1", "page_2")
+    assert bank.find_known("Who stormed the Bastille in 1789?") is not None
+    assert bank.find_known("Unrelated page question?") is None
+    qb.invalidate_question_banks()
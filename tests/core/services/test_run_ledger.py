@@ -0,0 +1,118 @@
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.core.services.run_ledger import build_run_document, price_for
+from app.core.tracing import (
+    TRACE_MAX_SPANS_PER_RUN, count_outcome, get_run_outcomes, get_run_summary, get_trace, run_context, span,
+)
+
+PRICES = {"gpt-4.1": {"in": 2.0, "out": 8.0}, "gpt-4.1-mini": {"in": 0.4, "out": 1.6}}
+
+
+def test_price_for_prefers_longest_prefix():
+    assert price_for("gpt-4.1-mini-2025-04-14", PRICES) == PRICES["gpt-4.1-mini"]
+    assert price_for("gpt-4.1", PRICES) == PRICES["gpt-4.1"]
+    assert price_for("claude-x", PRICES) is None
+
+
+@pytest.mark.asyncio
+async def test_ledger_folds_spans_and_outcomes_into_one_document():
+    run_id = "run_ledger_test"
+    with run_context(run_id):
+        async with span("stage2", kind="pipeline") as root:
+            async with span("generate_batch", kind="agent", agent="question_generator"):
+                async with span("llm_call", kind="llm", agent="question_generator", model="gpt-4.1") as s:
+                    s.record_usage(AIMessage(content="", usage_metadata={
+                        "input_tokens": 1000, "output_tokens": 500, "total_tokens": 1500}))
+            async with span("llm_call", kind="llm", agent="grounding_verifier", model="local-model") as s:
+                s.add_tokens(10, 2)
+            count_outcome("stage2", "accepted")
+            count_outcome("stage2", "rejected", "duplicate")
+            count_outcome("stage2", "rejected", "duplicate")
+            count_outcome("grounding_precheck", "reject")
+            root.retry()
+
+    doc = build_run_document(run_id, "stage2", get_run_summary(run_id), get_run_outcomes(run_id),
+                             {"topicName": "Photosynthesis", "attempts": 2}, prices=PRICES)
+
+    assert doc["_id"] == run_id and doc["status"] == "ok"
+    assert doc["topicName"] == "Photosynthesis"
+    assert doc["finishedAt"] >= doc["startedAt"]
+    assert doc["steps"]["generate_batch"]["count"] == 1
+    assert "llm_call" not in doc["steps"]
+    assert doc["llm"]["question_generator"]["costUsd"] == pytest.approx(0.006)
+    assert doc["llm"]["question_generator"]["models"] == ["gpt-4.1"]
+    assert doc["totals"] == {"llmCalls": 2, "tokensIn": 1010, "tokensOut": 502, "costUsd": pytest.approx(0.006)}
+    assert doc["unpricedModels"] == ["local-model"]
+    assert doc["attempts"] == 2 and doc["retries"] == 1
+    assert doc["acceptance"] == {
+        "accepted": 1,
+        "rejected": {"duplicate": 2},
+        "groundingPrecheck": {"reject": 1},
+    }
+    assert "truncatedSpans" not in doc
+
+
+@pytest.mark.asyncio
+async def test_ledger_stays_exact_past_the_trace_buffer():
+    run_id = "run_ledger_many_spans"
+    calls = TRACE_MAX_SPANS_PER_RUN + 200
+    with run_context(run_id):
+        async with span("stage2", kind="pipeline"):
+            for _ in range(calls):
+                async with span("llm_call", kind="llm", agent="question_generator", model="gpt-4.1") as s:
+                    s.add_tokens(10, 5)
+
+    assert len(get_trace(run_id)) == TRACE_MAX_SPANS_PER_RUN
+    doc = build_run_document(run_id, "stage2", get_run_summary(run_id), get_run_outcomes(run_id), prices=PRICES)
+
+    assert doc["status"] == "ok" and doc["durationSeconds"] > 0
+    assert doc["steps"] == {}
+    assert doc["totals"] == {
+        "llmCalls": calls, "tokensIn": 10 * calls, "tokensOut": 5 * calls,
+        "costUsd": pytest.approx(calls * (10 * 2.0 + 5 * 8.0) / 1_000_000),
+    }
+    assert doc["truncatedSpans"] == calls + 1 - TRACE_MAX_SPANS_PER_RUN
+
+
+@pytest.mark.asyncio
+async def test_stage1_run_records_llm_usage_per_agent(monkeypatch):
+    from app.core.config import settings
+    from app.core.pipeline import stage_1_corpus_initial as stage1
+    from app.schemas.input_model import Stage1Input
+
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    ledgers = []
+
+    async def capture_run(run_id, stage, meta=None):
+        ledgers.append(build_run_document(run_id, stage, get_run_summary(run_id), get_run_outcomes(run_id), meta, prices=PRICES))
+
+    class _Corpus:  # in-memory save; the run ledger is what is under test
+        cacheKey = None
+
+        def __init__(self, **doc):
+            self.id = "corpus_1"
+
+        @staticmethod
+        async def find_one(*args, **kwargs):
+            return None
+
+        async def insert(self):
+            pass
+
+    monkeypatch.setattr(stage1, "record_run", capture_run)
+    monkeypatch.setattr(stage1, "ContentCorpus", _Corpus)
+
+    await stage1.run_stage_1(Stage1Input(
+        topicName="The Water Cycle", subject="Science", gradeLevel="9", bigIdea="Systems in Nature",
+        generationScope="Full Course", numLessons=2, context="Focus on evaporation.",
+        learningGate="Discovery Gate", skills=["Observation"],
+    ))
+
+    [doc] = ledgers
+    assert doc["stage"] == "stage1"
+    assert {"course_scoping", "contextual", "lesson_content", "perplexity"} <= doc["llm"].keys()
+    assert doc["llm"]["lesson_content"]["calls"] == 2
+    assert all(agent["tokensIn"] > 0 and agent["tokensOut"] > 0 for agent in doc["llm"].values())
+    assert doc["totals"]["llmCalls"] == sum(agent["calls"] for agent in doc["llm"].values())
+    assert doc["totals"]["costUsd"] > 0
@@ -0,0 +1,33 @@
+# tests/core/test_indexes.py
+from pymongo import IndexModel
+
+from app.core.indexes import INDEX_REGISTRY, diff_indexes
+
+
+def test_registry_names_are_unique_per_collection():
+    for collection, models in INDEX_REGISTRY.items():
+        names = [m.document["name"] for m in models]
+        assert len(names) == len(set(names)), collection
+
+
+def test_diff_indexes_reports_missing_changed_and_unknown():
+    expected = [
+        IndexModel([("pageId", 1)], name="pageId_1"),
+        IndexModel([("cacheKey", 1)], name="cacheKey_1", unique=True, sparse=True),
+        IndexModel([("userId", 1)], name="userId_1"),
+    ]
+    existing = {
+        "_id_": {"key": [("_id", 1)], "v": 2},
+        "pageId_1": {"key": [("pageId", 1)], "v": 2},
+        "cacheKey_1": {"key": [("cacheKey", 1)], "v": 2, "unique": True},  # not sparse
+        "legacy_1": {"key": [("legacy", 1)], "v": 2},
+    }
+    assert diff_indexes(expected, existing) == {
+        "missing": ["userId_1"], "changed": ["cacheKey_1"], "unknown": ["legacy_1"],
+    }
+
+
+def test_diff_indexes_clean_when_in_sync():
+    models = INDEX_REGISTRY["feedback_reports"]
+    existing = {m.document["name"]: dict(m.document) for m in models}
+    assert diff_indexes(models, existing) == {"missing": [], "changed": [], "unknown": []}
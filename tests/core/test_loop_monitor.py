@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.loop_monitor import LOOP_BLOCKS, LoopMonitor, label_current_task
+from app.core.tracing import run_context
+
+
+def _blocking_parse(seconds: float):
+    time.sleep(seconds)  # stands in for fitz / requests / a big print on the loop thread
+
+
+async def _wait_for_beats(monitor: LoopMonitor, n: int):
+    start = monitor.stats["beats"]
+    while monitor.stats["beats"] < start + n:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_reports_blocking_callback_with_stack_route_and_run_id(tmp_path):
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05, profile_dir=str(tmp_path), profile_cooldown=0)
+    before = LOOP_BLOCKS.value(route="/api/v1/stage2/run")
+    monitor.start()
+    try:
+        await _wait_for_beats(monitor, 2)
+        label_current_task(route="/api/v1/stage2/run")
+        with run_context("run_loop_monitor"):
+            _blocking_parse(0.3)
+        await _wait_for_beats(monitor, 2)
+    finally:
+        monitor.stop()
+
+    [block] = monitor.recent_blocks()
+    assert block["route"] == "/api/v1/stage2/run"
+    assert block["pipeline_run_id"] == "run_loop_monitor"
+    assert block["seconds"] >= 0.2
+    assert "_blocking_parse" in block["stack"]
+    assert LOOP_BLOCKS.value(route="/api/v1/stage2/run") == before + 1
+
+    [profile] = tmp_path.glob("block-*-api_v1_stage2_run.folded")
+    assert "_blocking_parse" in profile.read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_quiet_loop_reports_nothing():
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.1, profile_dir="")
+    monitor.start()
+    try:
+        await _wait_for_beats(monitor, 5)
+    finally:
+        monitor.stop()
+    assert monitor.recent_blocks() == []
+    assert monitor.stats["max_lag_seconds"] < 0.1
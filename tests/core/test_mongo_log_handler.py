@@ -0,0 +1,69 @@
+# tests/core/test_mongo_log_handler.py
+import asyncio
+import logging
+
+import pytest
+
+from app.core.mongo_log_handler import DROP_NEWEST, MongoLogHandler
+
+
+class _Writer:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, docs):
+        self.batches.append(docs)
+
+
+def _logger(handler, name):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_batch_size_and_on_shutdown():
+    writer = _Writer()
+    handler = MongoLogHandler(writer=writer, batch_size=3, flush_interval=60)
+    logger = _logger(handler, "app.test.sink.size")
+    handler.start()
+
+    for i in range(3):
+        logger.debug("❌ Rejected: %s", f"stem {i}", extra={"details": {"stem": f"stem {i}"}})
+    await asyncio.sleep(0.05)
+    logger.debug("below batch size, stays queued")
+    assert [len(b) for b in writer.batches] == [3]
+    doc = writer.batches[0][0]
+    assert doc["level"] == "DEBUG" and doc["source"] == "app.test.sink.size"
+    assert doc["message"] == "❌ Rejected: stem 0" and doc["details"] == {"stem": "stem 0"}
+
+    await handler.aclose()
+    assert [len(b) for b in writer.batches] == [3, 1]
+    assert handler.stats["written"] == 4
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval():
+    writer = _Writer()
+    handler = MongoLogHandler(writer=writer, batch_size=100, flush_interval=0.05)
+    logger = _logger(handler, "app.test.sink.time")
+    handler.start()
+    logger.info("one")
+    await asyncio.sleep(0.15)
+    assert sum(len(b) for b in writer.batches) == 1
+    await handler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drop_policies():
+    oldest = MongoLogHandler(writer=_Writer(), batch_size=100, max_queue=2)
+    newest = MongoLogHandler(writer=_Writer(), batch_size=100, max_queue=2, drop_policy=DROP_NEWEST)
+    for handler, name in ((oldest, "app.test.sink.old"), (newest, "app.test.sink.new")):
+        logger = _logger(handler, name)
+        for i in range(5):
+            logger.info("m%d", i)
+    assert [d["message"] for d in oldest.queue] == ["m3", "m4"]
+    assert [d["message"] for d in newest.queue] == ["m0", "m1"]
+    assert oldest.stats["dropped"] == newest.stats["dropped"] == 3
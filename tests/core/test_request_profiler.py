@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import metrics
+from app.core import request_profiler
+from app.core.config import settings
+from app.core.request_profiler import ProfilingMiddleware
+from app.core.tracing import run_context
+
+TOKEN = "s3cret-profile-token"
+_page_cache = []
+
+
+def _parse_pages(seconds: float):
+    time.sleep(seconds)  # CPU-bound stand-in on the loop thread
+    pages = [bytearray(64 * 1024) for _ in range(20)]
+    _page_cache.append(pages)  # retained across the request, so it shows in the snapshot diff
+    return pages
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_MS", 2.0)
+    monkeypatch.setattr(request_profiler, "_profiles", request_profiler.OrderedDict())
+
+    app = FastAPI()
+    app.include_router(metrics.traces_router, prefix="/api/v1")
+
+    @app.post("/api/v1/stage2/run")
+    async def run_stage2():
+        with run_context("run_profiled"):
+            await asyncio.sleep(0.05)
+            pages = _parse_pages(0.1)
+        return {"pages": len(pages)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+
+def test_untriggered_and_bad_token_requests_are_not_profiled(client):
+    assert "x-profile-id" not in client.get("/ping").headers
+    assert "x-profile-id" not in client.get("/ping", headers={"X-Profile-Token": "wrong"}).headers
+    assert "x-profile-id" not in client.get("/ping?profile=wrong").headers
+    assert request_profiler.list_profiles() == []
+
+
+def test_non_ascii_tokens_are_rejected_not_errors(client):
+    assert client.get("/ping?profile=%C3%A9").status_code == 200
+    assert client.get("/ping", headers={"X-Profile-Token": "caf\xe9".encode("latin-1")}).status_code == 200
+    assert client.get("/api/v1/debug/profiles?profile=%C3%A9").status_code == 404
+    assert client.get("/api/v1/debug/profiles", headers={"X-Profile-Token": b"caf\xe9"}).status_code == 404
+    assert request_profiler.list_profiles() == []
+
+
+def test_profile_is_stored_under_pipeline_run_id(client):
+    response = client.post("/api/v1/stage2/run", headers={"X-Profile-Token": TOKEN})
+    assert response.headers["x-profile-id"] == "run_profiled"
+
+    headers = {"X-Profile-Token": TOKEN}
+    profile = client.get("/api/v1/debug/profiles/run_profiled", headers=headers).json()
+    assert profile["path"] == "/api/v1/stage2/run" and profile["status"] == 200
+    assert profile["samples"]["running"] > 0 and profile["samples"]["awaiting"] > 0
+    [top] = [a for a in profile["allocations"]["top"] if "test_request_profiler.py" in a["where"]]
+    assert top["sizeDiffKiB"] >= 20 * 64 and profile["allocations"]["peakKiB"] >= 20 * 64
+
+    folded = client.get("/api/v1/debug/profiles/run_profiled/folded", headers=headers).text
+    assert "_parse_pages" in folded and "[await]" in folded
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+
+    # Reading profiles is not profiled itself
+    assert [p["id"] for p in client.get("/api/v1/debug/profiles", headers=headers).json()["profiles"]] == ["run_profiled"]
+
+
+def test_request_without_run_gets_generated_id_via_query_flag(client):
+    profile_id = client.get(f"/ping?profile={TOKEN}").headers["x-profile-id"]
+    assert profile_id.startswith("req_")
+    assert client.get(f"/api/v1/debug/profiles/{profile_id}").status_code == 404  # no token
+    assert client.get(f"/api/v1/debug/profiles/{profile_id}?profile={TOKEN}").json()["pipeline_run_id"] is None
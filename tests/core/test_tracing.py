@@ -0,0 +1,62 @@
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.core.metrics import MetricsRegistry
+from app.core.tracing import LLM_TOKENS, OUTCOMES, SPAN_SECONDS, count_outcome, get_trace, run_context, span
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("step",), buckets=(0.1, 1.0))
+    calls = registry.counter("demo_total", "Demo calls.", ("step",))
+    latency.observe(0.05, step="a")
+    latency.observe(0.5, step="a")
+    calls.inc(step='say "hi"')
+    registry.register_collector(lambda: [("demo_queue", "gauge", "Queue.", [({}, 3)])])
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{step="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{step="a",le="1"} 2' in text
+    assert 'demo_seconds_bucket{step="a",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{step="a"} 2' in text
+    assert 'demo_total{step="say \\"hi\\""} 1' in text
+    assert "demo_queue 3" in text
+
+
+@pytest.mark.asyncio
+async def test_spans_record_latency_tokens_and_run_trace():
+    before = SPAN_SECONDS.count(span="llm_call", kind="llm", agent="t_agent", model="m1", status="ok")
+    tokens_before = LLM_TOKENS.value(agent="t_agent", model="m1", direction="out")
+
+    with run_context("run_trace_test"):
+        async with span("step_a", kind="step") as outer:
+            async with span("llm_call", kind="llm", agent="t_agent", model="m1") as s:
+                s.record_usage(AIMessage(
+                    content="ok",
+                    usage_metadata={"input_tokens": 12, "output_tokens": 5, "total_tokens": 17},
+                ))
+            outer.retry()
+
+    assert SPAN_SECONDS.count(span="llm_call", kind="llm", agent="t_agent", model="m1", status="ok") == before + 1
+    assert LLM_TOKENS.value(agent="t_agent", model="m1", direction="out") == tokens_before + 5
+
+    spans = get_trace("run_trace_test")
+    assert [s["span"] for s in spans] == ["llm_call", "step_a"]
+    assert spans[0]["parent"] == "step_a"
+    assert spans[0]["tokensIn"] == 12
+    assert spans[1]["attrs"]["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_span_marks_errors_and_outcomes_are_counted():
+    with pytest.raises(RuntimeError):
+        async with span("failing_step", kind="step"):
+            raise RuntimeError("boom")
+
+    assert SPAN_SECONDS.count(span="failing_step", kind="step", agent="", model="", status="error") >= 1
+    assert get_trace("never_started") == []
+
+    count_outcome("stage2", "rejected", "duplicate")
+    assert OUTCOMES.value(stage="stage2", outcome="rejected", reason="duplicate") >= 1
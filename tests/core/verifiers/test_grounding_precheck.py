@@ -0,0 +1,79 @@
+# tests/core/verifiers/test_grounding_precheck.py
+
+from app.core.verifiers.grounding_precheck import (
+    ChunkIndex,
+    precheck_grounding,
+    reconcile_llm_grounding,
+    tokenize,
+)
+
+CHUNK_HE = (
+    "המהפכה הצרפתית פרצה בשנת 1789. האספה המכוננת ביטלה את הפריבילגיות של האצולה, "
+    "והמעמד השלישי נשא את רוב נטל המסים בעוד הכמורה והאצולה היו פטורות ממנו."
+)
+CHUNK_EN = (
+    "The French Revolution was caused by deep economic inequality. The Third Estate carried "
+    "most of the tax burden while the clergy and nobility were largely exempt."
+)
+
+
+def test_tokenize_normalizes_punctuation():
+    assert tokenize("Third-Estate!") == ["third", "estate"]
+
+
+def test_hebrew_prefixes_match_across_forms():
+    idx = ChunkIndex("והמהפכה הצרפתית פרצה")
+    assert idx.overlap(tokenize("המהפכה")) == 1.0
+    assert idx.overlap(tokenize("מהפכה")) == 1.0
+
+
+def test_longest_match_finds_contiguous_span():
+    idx = ChunkIndex(CHUNK_EN)
+    length, end = idx.longest_match(tokenize("the Third Estate carried most of the tax burden"))
+    assert length == 9
+    assert idx.span_text(length, end) == "the third estate carried most of the tax burden"
+
+
+def test_precheck_rejects_unrelated_explanation():
+    idx = ChunkIndex(CHUNK_EN)
+    res = precheck_grounding(idx, "Napoleon Bonaparte", "He commanded armies in Egypt and Russia.")
+    assert res["decision"] == "reject"
+
+
+def test_precheck_accepts_verbatim_supported_claim():
+    idx = ChunkIndex(CHUNK_HE)
+    res = precheck_grounding(
+        idx,
+        "המעמד השלישי",
+        "המעמד השלישי נשא את רוב נטל המסים בעוד הכמורה והאצולה היו פטורות ממנו.",
+    )
+    assert res["decision"] == "accept"
+    assert res["evidence_spans"]
+
+
+def test_precheck_borderline_is_uncertain():
+    idx = ChunkIndex(CHUNK_EN)
+    res = precheck_grounding(idx, "Inequality", "Economic inequality angered peasants across the countryside.")
+    assert res["decision"] == "uncertain"
+
+
+def test_empty_chunk_rejects_everything():
+    idx = ChunkIndex("")
+    assert precheck_grounding(idx, "1789", "The revolution began in 1789.")["decision"] == "reject"
+
+
+def test_reconcile_filters_fabricated_spans_and_derives_grounded():
+    idx = ChunkIndex(CHUNK_EN)
+    out = reconcile_llm_grounding(
+        {"status": "ok", "grounding_score": 0.9, "evidence_spans": ["clergy and nobility were largely exempt", "Napoleon won"]},
+        idx,
+    )
+    assert out["grounded"] is True
+    assert out["evidence_spans"] == ["clergy and nobility were largely exempt"]
+    assert out["unverified_spans"] == ["Napoleon won"]
+
+    out = reconcile_llm_grounding({"status": "ok", "grounding_score": 0.95, "evidence_spans": ["Napoleon won"]}, idx)
+    assert out["grounded"] is False
+
+    err = {"status": "error", "reason": "llm_call_failed"}
+    assert reconcile_llm_grounding(err, idx) is err
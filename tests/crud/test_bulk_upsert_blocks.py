@@ -0,0 +1,59 @@
+import pytest
+from uuid import uuid4
+import app.crud.crud_block as blocks
+
+
+def _question_block(run_id: str, stem: str) -> dict:
+    return {
+        "blockType": "question",
+        "content": {"question": {"type": "open", "stem": stem}},
+        "courseOutlineId": "outline_bulk",
+        "pageId": "page_bulk",
+        "pipeline_run_id": run_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_returns_refs_in_input_order():
+    run_id = f"run_{uuid4().hex}"
+    docs = [_question_block(run_id, f"stem {i}") for i in range(5)]
+
+    refs = await blocks.bulk_upsert_blocks(docs, chunk_size=2)
+    assert [r["_id"] for r in refs] == [d["_id"] for d in docs]
+    assert all(r["blockType"] == "question" for r in refs)
+
+    # Same input again → same IDs, no duplicates, no writes
+    again = await blocks.bulk_upsert_blocks_report(
+        [_question_block(run_id, f"stem {i}") for i in range(5)], ordered=False
+    )
+    assert [r["_id"] for r in again["refs"]] == [r["_id"] for r in refs]
+    assert (again["inserted"], again["changed"], again["unchanged"]) == (0, 0, 5)
+
+    # Metadata change on an existing block → one changed write
+    edited = dict(_question_block(run_id, "stem 0"), _id=refs[0]["_id"], sectionId="section_2")
+    report = await blocks.bulk_upsert_blocks_report([edited])
+    assert (report["inserted"], report["changed"], report["unchanged"]) == (0, 1, 0)
+    stored = await blocks.find_blocks_by_page("page_bulk")
+    assert len([d for d in stored if d.get("pipeline_run_id") == run_id]) == 5
+
+    for ref in refs:
+        await blocks.delete_block_by_id(ref["_id"])
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_empty_list():
+    assert await blocks.bulk_upsert_blocks([]) == []
+
+
+@pytest.mark.asyncio
+async def test_out_of_band_edit_is_overwritten_by_next_pipeline_upsert():
+    run_id = f"run_{uuid4().hex}"
+    [ref] = await blocks.bulk_upsert_blocks([_question_block(run_id, "stem")])
+
+    await blocks.update_block_text(ref["_id"], "hand-edited")
+    report = await blocks.bulk_upsert_blocks_report([_question_block(run_id, "stem")])
+    assert (report["inserted"], report["changed"], report["unchanged"]) == (0, 1, 0)
+    stored = await blocks.get_block_by_id(ref["_id"])
+    assert "text" not in stored["content"] and stored["contentHash"]
+
+    await blocks.delete_block_by_id(ref["_id"])
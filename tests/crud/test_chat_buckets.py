@@ -0,0 +1,56 @@
+import pytest
+from uuid import uuid4
+from app.core.config import get_db, settings
+import app.crud.crud_chat_history as chat_history
+
+
+@pytest.mark.asyncio
+async def test_append_messages_fills_fixed_size_buckets(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_BUCKET_SIZE", 4)
+    user_id = f"user_{uuid4()}"
+    session_id = f"session_{user_id}"
+
+    for i in range(5):
+        await chat_history.save_chat_message(user_id, f"q{i}", f"a{i}")
+
+    db = get_db()
+    counts = [b["messageCount"] async for b in db["chat_message_buckets"].find({"sessionId": session_id}).sort("_id", 1)]
+    assert counts == [4, 4, 2]
+
+    recent = await chat_history.get_recent_messages(session_id, 3)
+    assert [m["text"] for m in recent] == ["a3", "q4", "a4"]
+    everything = [m["text"] async for m in chat_history.iter_session_messages(session_id)]
+    assert everything == [t for i in range(5) for t in (f"q{i}", f"a{i}")]
+
+    header = await chat_history.get_chat_session(session_id)
+    assert header["userId"] == user_id and header["messageCount"] == 10
+
+    await chat_history.delete_chat_session(session_id)
+    assert await db["chat_message_buckets"].count_documents({"sessionId": session_id}) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_open_a_single_bucket(monkeypatch):
+    import asyncio
+    from app.core.indexes import ensure_indexes
+
+    monkeypatch.setattr(settings, "CHAT_BUCKET_SIZE", 4)
+    await ensure_indexes(get_db())  # the unique (sessionId, seq) index arbitrates bucket creation
+    user_id = f"user_{uuid4()}"
+    session_id = f"session_{user_id}"
+
+    # Every batch lands while no bucket (or only full ones) is open
+    await asyncio.gather(*(
+        chat_history.append_messages(session_id, user_id, [{"sender": "user", "text": f"m{i}"}])
+        for i in range(12)
+    ))
+
+    db = get_db()
+    buckets = [b async for b in db["chat_message_buckets"].find({"sessionId": session_id}).sort("seq", 1)]
+    assert [b["seq"] for b in buckets] == list(range(len(buckets)))
+    assert sum(b["messageCount"] < settings.CHAT_BUCKET_SIZE for b in buckets) <= 1
+    texts = [m["text"] async for m in chat_history.iter_session_messages(session_id)]
+    assert sorted(texts) == sorted(f"m{i}" for i in range(12))
+    assert (await chat_history.get_chat_session(session_id))["messageCount"] == 12
+
+    await chat_history.delete_chat_session(session_id)
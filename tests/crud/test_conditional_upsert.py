@@ -0,0 +1,33 @@
+from app.crud.conditional_upsert import fingerprint_update, upsert_stats
+from app.utils.hash import content_hash
+
+
+def test_content_hash_ignores_key_order_and_bookkeeping_fields():
+    a = {"_id": "x", "title": "מהפכה", "lessons": [{"n": 1}], "createdAt": "2025-01-01"}
+    b = {"lessons": [{"n": 1}], "title": "מהפכה", "updatedAt": "2025-02-02", "_id": "y"}
+    assert content_hash(a) == content_hash(b)
+    assert content_hash(a) != content_hash(dict(a, title="other"))
+
+
+def test_fingerprint_update_keeps_root_when_hash_matches():
+    doc = {"_id": "outline_1", "title": "t", "createdAt": "2025-01-01"}
+    [stage] = fingerprint_update(doc, now="2025-03-03")
+    changed, target, unchanged = stage["$replaceWith"]["$cond"]
+    assert changed == {"$ne": ["$contentHash", content_hash(doc)]}
+    assert unchanged == "$$ROOT"
+    new = target["$mergeObjects"][-1]["$literal"]
+    assert new["_id"] == "outline_1" and new["updatedAt"] == "2025-03-03" and "createdAt" not in new
+
+    merged = fingerprint_update(doc, merge=True)[0]["$replaceWith"]["$cond"][1]["$mergeObjects"]
+    assert merged[0] == "$$ROOT"
+
+
+def test_upsert_stats():
+    assert upsert_stats(10, inserted=2, changed=3, failed=1) == {"inserted": 2, "changed": 3, "unchanged": 4}
+
+
+def test_content_hash_ignores_nested_fetch_timestamps():
+    a = {"content": {"sourceChunks": [{"text": "x", "retrievedAt": "2025-01-01T00:00:00Z"}]}}
+    b = {"content": {"sourceChunks": [{"text": "x", "retrievedAt": "2025-06-01T12:00:00Z"}]}}
+    assert content_hash(a) == content_hash(b)
+    assert content_hash(a) != content_hash({"content": {"sourceChunks": [{"text": "y"}]}})
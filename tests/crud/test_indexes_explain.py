@@ -0,0 +1,53 @@
+# tests/crud/test_indexes_explain.py
+# Every CRUD read path must be served by an index from app/core/indexes.py (no COLLSCAN).
+import pytest
+
+from app.core.config import get_db
+from app.core.indexes import ensure_indexes
+
+CRUD_QUERIES = [
+    ("blocks", {"pageId": "page_1"}),
+    ("blocks", {"courseOutlineId": "outline_1"}),
+    ("blocks", {"courseOutlineId": "outline_1", "blockType": {"$in": ["question", "Open_Ended_Question"]}}),
+    ("blocks", {"blockType": "question", "courseOutlineId": "outline_1", "lessonId": "lesson_1"}),
+    ("blocks", {"blockType": "question", "pageId": "page_1"}),
+    ("blocks", {"pipeline_run_id": "run_1"}),
+    ("blocks", {"createdAt": {"$gte": "2025-01-01T00:00:00"}}),
+    ("general_logs", {"level": "ERROR"}),
+    ("general_logs", {"source": "fetcher"}),
+    ("general_logs", {"details.corpusId": "corpus_1"}),
+    ("chat_history", {"userId": "user_1"}),
+    ("content_corpus", {"subject": "history", "gradeLevel": "8"}),
+    ("content_corpus", {"createdAt": {"$gte": "2025-01-01T00:00:00"}}),
+    ("outlines", {"lessons.corpusId": "corpus_1"}),
+    ("outlines", {"subject": "history"}),
+    ("outlines", {"createdAt": {"$gte": "2025-01-01T00:00:00"}}),
+    ("feedback_reports", {"outlineId": "outline_1"}),
+    ("feedback_reports", {"blockId": "block_1"}),
+    ("feedback_reports", {"overallStatus": "Needs_Revision"}),
+    ("feedback_reports", {"overallStatus": "Needs_Revision", "outlineId": "outline_1"}),
+    ("deployment_logs", {"outlineId": "outline_1"}),
+    ("deployment_logs", {"status": "Failure", "errorLog": {"$ne": None}}),
+]
+
+
+def _stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("collection,query", CRUD_QUERIES)
+async def test_crud_query_uses_index(collection, query):
+    db = get_db()
+    await ensure_indexes(db)
+    explain = await db[collection].find(query).explain()
+    stages = set(_stages(explain["queryPlanner"]["winningPlan"]))
+    assert "COLLSCAN" not in stages, f"{collection} {query} -> {stages}"
+    assert "IXSCAN" in stages
@@ -0,0 +1,33 @@
+import pytest
+import app.crud.crud_outlines as outlines
+
+
+class _FakeCollection:
+    def __init__(self, ids):
+        self.ids, self.queries = set(ids), []
+
+    def find(self, query, projection=None):
+        self.queries.append((query, projection))
+        wanted = query["_id"]["$in"]
+
+        async def docs():
+            for i in wanted:
+                if i in self.ids:
+                    yield {"_id": i}
+        return docs()
+
+
+@pytest.mark.asyncio
+async def test_validate_outline_dependencies_single_query_per_collection(monkeypatch):
+    db = {"content_corpus": _FakeCollection({"c1"}), "blocks": _FakeCollection({"b1", "b3"})}
+    monkeypatch.setattr(outlines, "get_db", lambda: db)
+    outline = {"lessons": [
+        {"corpusId": "c1", "sections": [{"pages": [{"blocks": ["b1", "b2"]}]}]},
+        {"corpusId": "c2", "sections": [{"pages": [{"blocks": ["b3"]}, {"blocks": ["b4", "b2"]}]}]},
+    ]}
+
+    report = await outlines.validate_outline_dependencies(outline)
+
+    assert report == {"missingCorpus": ["c2"], "missingBlocks": ["b2", "b4", "b2"]}
+    assert len(db["content_corpus"].queries) == 1 and len(db["blocks"].queries) == 1
+    assert db["blocks"].queries[0][1] == {"_id": 1}
@@ -0,0 +1,73 @@
+import pytest
+from uuid import uuid4
+from bson import ObjectId
+
+import app.crud.crud_block as blocks
+from app.core.config import get_db
+from app.crud.pagination import ASCENDING, DESCENDING, _after, decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_round_trip_keeps_bson_types():
+    oid = ObjectId()
+    token = encode_cursor({"_id": oid, "timestamp": "2025-01-01T00:00:00"}, "timestamp")
+    assert decode_cursor(token) == {"v": "2025-01-01T00:00:00", "id": oid}
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_block_once():
+    page_id = f"page_{uuid4()}"
+    ids = [f"block_{uuid4()}" for _ in range(7)]
+    for block_id in ids:
+        await blocks.upsert_block({"_id": block_id, "pageId": page_id, "blockType": "text", "content": "x"})
+
+    seen, cursor = [], None
+    while True:
+        page = await blocks.get_blocks_page(limit=3, cursor=cursor, query={"pageId": page_id},
+                                            projection={"blockType": 1})
+        seen += [doc["_id"] for doc in page["items"]]
+        assert all("content" not in doc for doc in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == sorted(ids)
+
+    streamed = [doc["_id"] async for doc in blocks.iter_blocks({"pageId": page_id})]
+    assert sorted(streamed) == sorted(ids)
+    for block_id in ids:
+        await blocks.delete_block_by_id(block_id)
+
+
+def test_cursor_filter_crosses_bson_type_boundaries():
+    # Ascending: ObjectIds sort after every string _id, descending: strings after every ObjectId
+    assert _after({"id": "block_ab"}, "_id", ASCENDING) == {"$or": [
+        {"_id": {"$gt": "block_ab"}},
+        {"_id": {"$type": ["object", "array", "binData", "objectId", "bool", "date", "timestamp", "regex"]}},
+    ]}
+    oid = ObjectId()
+    assert _after({"id": oid}, "_id", DESCENDING) == {"$or": [
+        {"_id": {"$lt": oid}}, {"_id": None},
+        {"_id": {"$type": ["number", "string", "object", "array", "binData"]}},
+    ]}
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_mixed_id_types():
+    page_id = f"page_{uuid4()}"
+    ids = [ObjectId() for _ in range(3)] + [f"block_{uuid4().hex}" for _ in range(3)]
+    for block_id in ids:
+        await blocks.upsert_block({"_id": block_id, "pageId": page_id, "blockType": "text"})
+
+    for direction in (ASCENDING, DESCENDING):
+        seen, cursor = [], None
+        while True:
+            page = await paginate(get_db()["blocks"], {"pageId": page_id}, direction=direction,
+                                  limit=2, cursor=cursor)
+            seen += [doc["_id"] for doc in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert sorted(map(str, seen)) == sorted(map(str, ids)) and len(seen) == len(ids)
+    for block_id in ids:
+        await blocks.delete_block_by_id(block_id)
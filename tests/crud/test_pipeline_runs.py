@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pytest
+
+from app.crud.crud_pipeline_runs import cost_pipeline, latency_percentiles_pipeline
+
+
+def test_latency_pipeline_groups_by_mapped_field_with_time_window():
+    now = datetime(2025, 1, 8)
+    pipeline = latency_percentiles_pipeline("question_type", stage="stage2", since_hours=24, now=now)
+
+    assert pipeline[0]["$match"] == {"stage": "stage2", "finishedAt": {"$gte": datetime(2025, 1, 7)}}
+    group = pipeline[1]["$group"]
+    assert group["_id"] == "$questionType"
+    assert group["percentiles"]["$percentile"]["input"] == "$durationSeconds"
+
+
+def test_step_latency_reads_the_step_total():
+    pipeline = latency_percentiles_pipeline("grade", step="generate_batch")
+
+    assert pipeline[0]["$match"] == {"steps.generate_batch": {"$exists": True}}
+    assert pipeline[1]["$group"]["avgSeconds"] == {"$avg": "$steps.generate_batch.seconds"}
+
+
+def test_cost_pipeline_rejects_unknown_group():
+    assert cost_pipeline("topic")[1]["$group"]["_id"] == "$topicName"
+    with pytest.raises(ValueError):
+        cost_pipeline("colour")
@@ -0,0 +1,35 @@
+import pytest
+from uuid import uuid4
+from app.core.config import get_db
+import app.crud.crud_block as blocks
+import app.crud.crud_outlines as outlines
+import app.crud.crud_question_counts as counts
+
+
+@pytest.mark.asyncio
+async def test_corpus_outline_block_relations_and_counts():
+    tag = uuid4().hex[:8]
+    corpus_id, outline_id = f"corpus_{tag}", f"outline_{tag}"
+    db = get_db()
+    await db["content_corpus"].insert_one({"_id": corpus_id, "topicName": "t"})
+    await outlines.upsert_outline({"_id": outline_id, "title": "o", "lessons": [{"corpusId": corpus_id}]})
+    block_ids = [f"block_{tag}_{i}" for i in range(3)]
+    for block_id, block_type in zip(block_ids, ["question", "Open_Ended_Question", "text"]):
+        await blocks.upsert_block({"_id": block_id, "courseOutlineId": outline_id, "blockType": block_type})
+
+    try:
+        corpus = await outlines.get_corpus_for_outline(outline_id)
+        assert corpus["_id"] == corpus_id
+        assert await outlines.get_corpus_for_outline(f"missing_{tag}") is None
+
+        questions = await blocks.get_question_blocks_by_corpus(corpus_id)
+        assert sorted(b["_id"] for b in questions) == block_ids[:2]
+
+        await counts.refresh_question_counts()
+        assert await counts.get_question_count_for_outline(outline_id) == 2
+        assert await counts.get_question_count_for_corpus(corpus_id) == {"questionCount": 2, "outlineCount": 1}
+    finally:
+        for block_id in block_ids:
+            await blocks.delete_block_by_id(block_id)
+        await outlines.delete_outline_by_id(outline_id)
+        await db["content_corpus"].delete_one({"_id": corpus_id})
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.core.config import settings
+from app.schemas.stage2 import Stage2Request
+from app.services.fake_llm import FakeChatModel, FakeLLMError, parse_latency
+
+CHUNK = (
+    "The French Revolution began in 1789 with the storming of the Bastille. "
+    "It ended the absolute monarchy of Louis XVI in France. "
+    "Economic crisis and heavy taxes on peasants pushed people to revolt. "
+    "The revolution spread ideas of liberty and equality across Europe."
+)
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "PIPELINE_RUNS_ENABLED", False)
+    monkeypatch.setattr(settings, "FAKE_LLM_REJECT_RATE", 0.0)
+
+
+def test_latency_specs():
+    rng = random.Random(1)
+    assert parse_latency("250")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:100,400")(rng) <= 0.4
+    assert parse_latency("normal:300,80")(rng) >= 0
+    assert parse_latency("lognormal:300,0.5")(rng) > 0
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1,2")
+
+
+@pytest.mark.asyncio
+async def test_same_prompt_sequence_gives_same_outputs_and_usage():
+    messages = [SystemMessage(content="You are a grounding verification assistant."),
+                HumanMessage(content=f"Source Chunk:\n{CHUNK}\nAnalyze carefully")]
+
+    model, replay = FakeChatModel(seed=7), FakeChatModel(seed=7)
+    responses = [await model.ainvoke(messages) for _ in range(3)]
+
+    assert [r.content for r in responses] == [(await replay.ainvoke(messages)).content for _ in range(3)]
+    assert responses[0].usage_metadata["input_tokens"] > 0
+    assert '"status": "ok"' in responses[0].content
+
+
+@pytest.mark.asyncio
+async def test_error_rate_raises():
+    with pytest.raises(FakeLLMError):
+        await FakeChatModel(error_rate=1.0).ainvoke([HumanMessage(content="hi")])
+
+
+@pytest.mark.asyncio
+async def test_stage2_runs_offline_with_fake_provider(fake_provider):
+    from app.core.pipeline.stage2_pipeline import run_stage2
+
+    common = dict(topicName="The French Revolution", subject="History", gradeLevel="9", bigIdea="Change",
+                  generationScope="Single Topic", skills=["analysis"], learningGate="Meeting", courseLanguage="en")
+    result = await run_stage2(Stage2Request(
+        **common, mode="generate_questions", num_questions=3, question_types=["mcq"],
+        cognitive_target="comprehension_application", target_difficulty="medium", save_to_blocks=False,
+        chunks=[{"chunk_id": "c1", "text": CHUNK}],
+    ))
+    assert len(result.generated) == 3
+    for gq in result.generated:
+        q = gq.question
+        assert q["choices"][q["correct_index"]] in CHUNK
+
+    edited = await run_stage2(Stage2Request(**common, mode="edit_text", text="Some text.", save_to_blocks=False))
+    assert edited.edited_text == "Some text."
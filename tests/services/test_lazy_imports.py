@@ -0,0 +1,24 @@
+# tests/services/test_lazy_imports.py
+import json
+import os
+import subprocess
+import sys
+
+HEAVY = ["langchain_openai", "PyPDF2", "pdfminer", "pdfplumber", "fitz", "pdf2image", "pytesseract", "langdetect"]
+
+
+def _eager_modules(module: str):
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)  # importing must not need credentials
+    probe = f"import sys, json, {module}; print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_fetchers_defer_extraction_libraries():
+    assert _eager_modules("app.services.fetchers.file_processor") == []
+
+
+def test_agents_and_pipeline_import_without_llm_client():
+    assert _eager_modules("app.core.pipeline.stage2_pipeline") == []
@@ -0,0 +1,123 @@
+# tests/services/test_model_router.py
+import json
+
+import pytest
+
+import app.services.model_router as router
+
+
+class _Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeModel:
+    def __init__(self, name, replies, calls):
+        self.name, self.replies, self.calls = name, replies, calls
+
+    async def ainvoke(self, messages):
+        self.calls.append(self.name)
+        reply = self.replies[self.name]
+        if isinstance(reply, Exception):
+            raise reply
+        return _Reply(reply)
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    calls, replies = [], {}
+    monkeypatch.setattr(router, "get_chat_model", lambda model, temperature=0.3: _FakeModel(model, replies, calls))
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_ENABLED", True)
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_CHEAP_MODEL", "cheap")
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_STRONG_MODEL", "strong")
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_POLICIES", "")
+    router.router_stats.clear()
+    return replies, calls
+
+
+def _verdict(score):
+    return json.dumps({"status": "ok", "matches_target": score >= 0.75, "match_score": score})
+
+
+@pytest.mark.asyncio
+async def test_confident_cheap_verdict_is_kept(fake_models):
+    replies, calls = fake_models
+    replies["cheap"] = _verdict(0.95)
+    out = await router.route_json("bloom_verifier", [])
+    assert out["routed_model"] == "cheap" and out["matches_target"] is True
+    assert calls == ["cheap"]
+    assert router.get_router_stats()["bloom_verifier"]["cheap_accepted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_uncertain_or_unparseable_cheap_verdict_escalates(fake_models):
+    replies, calls = fake_models
+    replies["strong"] = _verdict(0.2)
+
+    replies["cheap"] = _verdict(0.7)
+    out = await router.route_json("bloom_verifier", [])
+    assert out["routed_model"] == "strong" and out["matches_target"] is False
+
+    replies["cheap"] = "Sure! Here is the JSON: {"
+    await router.route_json("bloom_verifier", [])
+
+    replies["cheap"] = RuntimeError("rate limited")
+    await router.route_json("bloom_verifier", [])
+
+    assert calls == ["cheap", "strong"] * 3
+    stats = router.get_router_stats()["bloom_verifier"]
+    assert stats["escalated_uncertain"] == stats["escalated_parse"] == stats["escalated_error"] == 1
+
+
+@pytest.mark.asyncio
+async def test_policy_overrides_and_disabled_router(fake_models, monkeypatch):
+    replies, calls = fake_models
+    replies["strong"] = json.dumps({"status": "ok", "grounding_score": 0.9})
+
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_POLICIES", json.dumps({"grounding_verifier": {"cheap_model": None}}))
+    assert (await router.route_json("grounding_verifier", []))["routed_model"] == "strong"
+
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_POLICIES", "")
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_ENABLED", False)
+    assert router.get_policy("bloom_verifier")["cheap_model"] is None
+    assert calls == ["strong"]
+
+
+@pytest.mark.asyncio
+async def test_model_for_counts_and_times_calls_not_fetches(fake_models):
+    replies, calls = fake_models
+    replies["cheap"] = "summary"
+
+    llm = router.model_for("chat_summary")
+    assert llm.model_name == "cheap"
+    assert "chat_summary" not in router.get_router_stats()
+
+    assert (await llm.ainvoke([])).content == "summary"
+    replies["cheap"] = RuntimeError("rate limited")
+    with pytest.raises(RuntimeError):
+        await llm.ainvoke([])
+    stats = router.get_router_stats()["chat_summary"]
+    assert stats["calls:cheap"] == 2 and stats["seconds:cheap"] >= 0.0
+    router.model_for("json_repair")
+    assert "json_repair" not in router.get_router_stats()
+
+
+def test_policy_overrides_are_parsed_once(monkeypatch):
+    raw = json.dumps({"bloom_verifier": {"temperature": 0.1}})
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_POLICIES", raw)
+    router._policy_overrides.cache_clear()
+    for _ in range(50):
+        assert router.get_policy("bloom_verifier")["temperature"] == 0.1
+    assert router._policy_overrides.cache_info().misses == 1
+
+    monkeypatch.setattr(router.settings, "MODEL_ROUTER_POLICIES", "[1, 2]")
+    assert router.get_policy("bloom_verifier")["temperature"] == 0.3
+
+
+@pytest.mark.asyncio
+async def test_strong_failure_returns_agent_error_shape(fake_models):
+    replies, _ = fake_models
+    replies["cheap"] = "not json"
+    replies["strong"] = "still not json"
+    out = await router.route_json("difficulty_verifier", [])
+    assert out["status"] == "error" and out["reason"] == "invalid_json_response"
@@ -0,0 +1,70 @@
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.services import model_router
+from app.services.openai_standin import create_app
+
+GROUNDING = [
+    {"role": "system", "content": "You are a grounding verification assistant."},
+    {"role": "user", "content": "Source Chunk:\nThe French Revolution began in 1789 with the storming of the Bastille.\n"},
+]
+
+
+def test_completion_is_schema_valid_with_usage():
+    client = TestClient(create_app(latency="0", rate_limit_rate=0, server_error_rate=0))
+    body = client.post("/v1/chat/completions", json={"model": "gpt-4.1-mini", "messages": GROUNDING}).json()
+
+    assert body["object"] == "chat.completion" and body["model"] == "gpt-4.1-mini"
+    verdict = json.loads(body["choices"][0]["message"]["content"])
+    assert verdict["status"] == "ok" and 0 <= verdict["grounding_score"] <= 1
+    assert body["usage"]["prompt_tokens"] > 0
+
+
+def test_stream_reassembles_to_the_same_content():
+    plain = TestClient(create_app(latency="0", rate_limit_rate=0, server_error_rate=0))
+    streamed = TestClient(create_app(latency="0", rate_limit_rate=0, server_error_rate=0))
+    expected = plain.post("/v1/chat/completions", json={"messages": GROUNDING}).json()["choices"][0]["message"]
+
+    response = streamed.post("/v1/chat/completions", json={
+        "messages": GROUNDING, "stream": True, "stream_options": {"include_usage": True},
+    })
+    events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(e) for e in events[:-1]]
+    content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"])
+    assert content == expected["content"]
+    assert chunks[-1]["usage"]["completion_tokens"] > 0
+
+
+def test_injects_rate_limits_and_server_errors():
+    limited = TestClient(create_app(latency="0", rate_limit_rate=1.0, server_error_rate=0))
+    response = limited.post("/v1/chat/completions", json={"messages": GROUNDING})
+    assert response.status_code == 429 and response.headers["retry-after"] == "1"
+    assert response.json()["error"]["code"] == "rate_limit_exceeded"
+
+    failing = TestClient(create_app(latency="0", rate_limit_rate=0, server_error_rate=1.0))
+    assert failing.post("/v1/chat/completions", json={"messages": GROUNDING}).status_code in (500, 502, 503)
+    assert failing.get("/stats").json()["server_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_real_openai_client_round_trip():
+    transport = httpx.ASGITransport(app=create_app(latency="0", rate_limit_rate=0, server_error_rate=0))
+    client = AsyncOpenAI(api_key="standin", base_url="http://standin/v1", max_retries=0,
+                         http_client=httpx.AsyncClient(transport=transport))
+
+    completion = await client.chat.completions.create(model="gpt-4.1", messages=GROUNDING)
+    assert json.loads(completion.choices[0].message.content)["status"] == "ok"
+
+
+def test_llm_base_url_points_chat_models_at_the_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "LLM_BASE_URL", "http://localhost:8100/v1")
+
+    model = model_router.get_chat_model("gpt-4.1-mini", 0.0)
+    assert model.openai_api_base == "http://localhost:8100/v1"
@@ -0,0 +1,46 @@
+# tests/services/test_prompt_manager.py
+import os
+
+import pytest
+
+from jinja2 import Template
+
+from app.services import prompt_manager
+from app.services.prompt_manager import PromptRegistry, load_prompt, render_prompt, render_user_prompt
+
+
+def test_all_prompts_compile_with_declared_variables():
+    prompts = prompt_manager.registry.load_all()
+    assert "data_agents/question_generator_prompt.yaml" in prompts
+    assert {"question", "bloom_level"} <= prompts["data_agents/cognitive_level_verifier_prompt.yaml"].variables
+
+
+def test_registry_render_matches_legacy_template():
+    name = "data_agents/grounding_verifier_prompt.yaml"
+    context = {"question": "מתי?", "answer": "1789", "explanation": "כתוב בטקסט", "chunk": "המהפכה פרצה ב-1789"}
+    legacy = Template(load_prompt(name)["user"]).render(**context)
+    assert render_prompt(name, context) == legacy
+    assert render_user_prompt(load_prompt(name)["user"], context) == legacy
+
+
+def test_hot_reload_picks_up_changed_file(tmp_path):
+    path = tmp_path / "p.yaml"
+    path.write_text("system: s\nuser: 'Hello {{ name }}'\n", encoding="utf-8")
+    reg = PromptRegistry(prompt_dir=tmp_path, hot_reload=True, bytecode_cache_dir=None)
+    assert reg.render("p.yaml", {"name": "A"}) == "Hello A"
+    assert reg.variables("p.yaml") == {"name"}
+
+    path.write_text("system: s\nuser: 'Bye {{ who }}'\n", encoding="utf-8")
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 5))
+    assert reg.render("p.yaml", {"who": "B"}) == "Bye B"
+    assert reg.variables("p.yaml") == {"who"}
+
+
+def test_missing_variables_fail_fast(tmp_path):
+    (tmp_path / "p.yaml").write_text(
+        "system: s\nuser: '{{ name }}{% if extra %} / {{ extra }}{% endif %}'\n", encoding="utf-8"
+    )
+    reg = PromptRegistry(prompt_dir=tmp_path, bytecode_cache_dir=None)
+    assert reg.render("p.yaml", {"name": "A", "extra": None}) == "A"
+    with pytest.raises(ValueError, match=r"missing variables: \['extra'\]"):
+        reg.render("p.yaml", {"name": "A"})